@@ -1,65 +1,160 @@
 import os
 import re
-import pandas as pd
+import argparse
 import time
+import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from automatizacao_notas import JS_CONFIRMACAO_SALVAR, configurar_modo_navegador, aplicar_perfil_leve
+from instrumentacao import Instrumentacao, medir_fase
+from planilhas import FORMATOS, aguardar_planilha_salva, extensao_formato, gravar_planilha, ler_planilha
+
+# Binário usado quando nenhum outro é informado (mantido se existir na máquina)
+BINARIO_PADRAO = "/usr/bin/chromium-browser"
+
+# Lê em uma única chamada o nome da avaliação e todas as linhas da tabela
+# conteudoTexto: matrícula, aluno e o valor e o name dos inputs de nota e observação.
+# Devolve null se a tabela não existir.
+JS_EXTRAIR_TABELA = """
+    var avaliacao = null;
+    var celulas = document.getElementsByTagName('td');
+    for (var i = 0; i < celulas.length && avaliacao === null; i++) {
+        var proprio = '';
+        for (var n = celulas[i].firstChild; n; n = n.nextSibling) {
+            if (n.nodeType === 3) { proprio += n.nodeValue; }
+        }
+        if (proprio.indexOf('Avaliação:') !== -1) {
+            var irmao = celulas[i].nextElementSibling;
+            while (irmao && irmao.tagName !== 'TD') { irmao = irmao.nextElementSibling; }
+            if (irmao) { avaliacao = (irmao.innerText || irmao.textContent || '').trim(); }
+        }
+    }
+    var tabela = document.getElementsByClassName('conteudoTexto')[0];
+    if (!tabela) { return null; }
+    var texto = function(celula) { return (celula.innerText || celula.textContent || '').trim(); };
+    var linhas = tabela.getElementsByTagName('tr');
+    var alunos = [];
+    for (var l = 1; l < linhas.length; l++) {
+        var colunas = linhas[l].getElementsByTagName('td');
+        if (colunas.length < 7) { continue; }
+        var nota = colunas[5].querySelector('input');
+        var obs = colunas[6].querySelector('input');
+        if (!nota || !obs) { continue; }
+        alunos.push([texto(colunas[1]), texto(colunas[2]), nota.value, obs.value,
+                     nota.getAttribute('name'), obs.getAttribute('name')]);
+    }
+    return {avaliacao: avaliacao, alunos: alunos};
+"""
+
+COLUNAS_EXTRACAO = ["Matrícula", "Aluno", "Nota", "Observação", "ID_Nota_Interno", "ID_Obs_Interno"]
+
+# Aplica vários valores de uma vez. Recebe pares [name, valor] e devolve um mapa
+# name -> 'ok', 'inexistente' ou 'bloqueado'. O valor é definido como na digitação
+# (eventos input, keyup e change) para que as rotinas do site reajam.
+JS_APLICAR_CAMPOS = """
+    var pares = arguments[0];
+    var resultado = {};
+    var definirValor = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    for (var i = 0; i < pares.length; i++) {
+        var nome = pares[i][0];
+        var campo = document.getElementsByName(nome)[0];
+        if (!campo) { resultado[nome] = 'inexistente'; continue; }
+        if (campo.disabled || campo.readOnly) { resultado[nome] = 'bloqueado'; continue; }
+        try {
+            definirValor.call(campo, pares[i][1]);
+            campo.dispatchEvent(new Event('input', {bubbles: true}));
+            campo.dispatchEvent(new KeyboardEvent('keyup', {bubbles: true}));
+            campo.dispatchEvent(new Event('change', {bubbles: true}));
+            resultado[nome] = 'ok';
+        } catch (e) {
+            resultado[nome] = 'erro: ' + e.message;
+        }
+    }
+    return resultado;
+"""
+
+TAMANHO_LOTE_IMPORTACAO = 200
+
+# Aciona o botão Salvar da tela de lançamento (input/botão com o texto "Salvar"),
+# marcando antes as mensagens já exibidas. Devolve false se não houver botão.
+JS_SALVAR_LANCAMENTO = """
+    var alertas = document.querySelectorAll('.alert-success, .alert-danger, .alert-error');
+    for (var i = 0; i < alertas.length; i++) { alertas[i].setAttribute('data-automacao-vista', '1'); }
+    var botoes = document.querySelectorAll('input[type=submit], input[type=button], button');
+    for (var j = 0; j < botoes.length; j++) {
+        var texto = (botoes[j].value || botoes[j].innerText || '').trim().toLowerCase();
+        if (texto === 'salvar' && !botoes[j].disabled) { botoes[j].click(); return true; }
+    }
+    return false;
+"""
+
+
+def formatar_notas(notas):
+    """
+    Formata a coluna de notas de uma vez: vírgula como separador decimal e
+    valores entre 0 e 10. Células vazias viram "" (apagam a nota no site)
+    Args:
+        notas (Series): Coluna 'Nota' da planilha
+    Returns:
+        tuple: (lista de notas formatadas, lista de bool indicando notas válidas)
+    """
+    vazias = notas.isna() | notas.astype(str).str.strip().eq("")
+    valores = pd.to_numeric(notas.astype(str).str.strip().str.replace(",", ".", regex=False), errors="coerce")
+    validas = vazias | valores.between(0, 10)
+    formatadas = valores.astype(float).astype(str).str.replace(".", ",", regex=False).where(~vazias, "")
+    return formatadas.tolist(), validas.tolist()
 
 class ExtratorQAcademico:
-    def __init__(self):
+    def __init__(self, headless=None, binario=None, tamanho_janela=None, perfil_leve=None, instrumentacao=None,
+                 formato_planilha="xlsx"):
+        self.instrumentacao = instrumentacao or Instrumentacao()
+        self.formato_planilha = formato_planilha
+        self.linhas_importadas = set()  # (campo, nota, observação) já enviados da planilha atual
+        self.salvamento_automatico = False  # Clica em Salvar após a importação e aguarda a confirmação
+        self.salvamentos = []  # Resultado do salvamento de cada planilha importada
+        self.salvar_com_erros = False  # Salva automaticamente mesmo com linhas não enviadas
         chrome_options = Options()
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.binary_location = "/usr/bin/chromium-browser"
+        if binario is None and not os.environ.get("NAVEGADOR_BINARIO") and os.path.exists(BINARIO_PADRAO):
+            binario = BINARIO_PADRAO
+        modo = configurar_modo_navegador(chrome_options, headless, binario, tamanho_janela, perfil_leve)
         print("[SISTEMA] Abrindo navegador Chrome...")
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.maximize_window()
+        with self.instrumentacao.fase("inicio_navegador"):
+            self.driver = webdriver.Chrome(options=chrome_options)
+            if not modo['tamanho_janela']:
+                self.driver.maximize_window()
+            if modo['perfil_leve']:
+                aplicar_perfil_leve(self.driver)
 
+    @medir_fase("extracao")
     def extrair_com_observacao(self):
         try:
             print("\n[INFO] Lendo dados da tela atual...")
-            
-            # Identifica a avaliação para nomear o arquivo
-            try:
-                nome_eval = self.driver.find_element(By.XPATH, "//td[contains(text(), 'Avaliação:')]/following-sibling::td").text.strip()
-            except:
-                nome_eval = "Avaliacao_QAcademico"
 
             wait = WebDriverWait(self.driver, 10)
             tabela = wait.until(EC.presence_of_element_located((By.CLASS_NAME, "conteudoTexto")))
-            
-            linhas = tabela.find_elements(By.TAG_NAME, "tr")[1:] 
-            lista_dados = []
-            
-            for linha in linhas:
-                colunas = linha.find_elements(By.TAG_NAME, "td")
-                if len(colunas) >= 7:
-                    matricula = colunas[1].text.strip()
-                    nome_aluno = colunas[2].text.strip()
-                    
-                    input_nota = colunas[5].find_element(By.TAG_NAME, "input")
-                    id_nota = input_nota.get_attribute("name")
-                    valor_nota = input_nota.get_attribute("value")
-                    
-                    input_obs = colunas[6].find_element(By.TAG_NAME, "input")
-                    id_obs = input_obs.get_attribute("name")
-                    valor_obs = input_obs.get_attribute("value")
-                    
-                    lista_dados.append({
-                        "Matrícula": matricula,
-                        "Aluno": nome_aluno,
-                        "Nota": valor_nota,
-                        "Observação": valor_obs,
-                        "ID_Nota_Interno": id_nota,
-                        "ID_Obs_Interno": id_obs
-                    })
-
-            df = pd.DataFrame(lista_dados)
-            nome_arquivo = f"Extração_{re.sub(r'[^A-Za-z0-9]+', '_', nome_eval)}.xlsx"
-            df.to_excel(nome_arquivo, index=False)
+
+            # Avaliação e tabela inteira em uma chamada; elemento a elemento se o script falhar
+            try:
+                dados = self.driver.execute_script(JS_EXTRAIR_TABELA)
+                if not dados:
+                    raise ValueError("tabela não encontrada pelo script")
+                nome_eval, linhas = dados.get('avaliacao'), dados.get('alunos') or []
+            except Exception as e:
+                print(f"[AVISO] Leitura em lote falhou ({e}); lendo elemento a elemento...")
+                nome_eval, linhas = self._extrair_por_elemento(tabela)
+
+            # Identifica a avaliação para nomear o arquivo
+            nome_eval = nome_eval or "Avaliacao_QAcademico"
+            df = pd.DataFrame(linhas, columns=COLUNAS_EXTRACAO)
+            nome_arquivo = f"Extração_{re.sub(r'[^A-Za-z0-9]+', '_', nome_eval)}{extensao_formato(self.formato_planilha)}"
+            with self.instrumentacao.fase("excel_gravacao"):
+                gravar_planilha(df, nome_arquivo)
             
             print(f"[OK] Extração concluída! {len(df)} alunos processados.")
             return nome_arquivo
@@ -67,44 +162,229 @@ class ExtratorQAcademico:
             print(f"[ERRO NA EXTRAÇÃO] Não foi possível ler a tabela: {e}")
             return None
 
-    def importar_notas_do_excel(self, caminho_arquivo):
+    def _extrair_por_elemento(self, tabela):
+        """Leitura original, com uma consulta ao navegador por célula (usada como alternativa)"""
+        try:
+            nome_eval = self.driver.find_element(By.XPATH, "//td[contains(text(), 'Avaliação:')]/following-sibling::td").text.strip()
+        except:
+            nome_eval = None
+
+        lista_dados = []
+        for linha in tabela.find_elements(By.TAG_NAME, "tr")[1:]:
+            colunas = linha.find_elements(By.TAG_NAME, "td")
+            if len(colunas) >= 7:
+                input_nota = colunas[5].find_element(By.TAG_NAME, "input")
+                input_obs = colunas[6].find_element(By.TAG_NAME, "input")
+                lista_dados.append([
+                    colunas[1].text.strip(),
+                    colunas[2].text.strip(),
+                    input_nota.get_attribute("value"),
+                    input_obs.get_attribute("value"),
+                    input_nota.get_attribute("name"),
+                    input_obs.get_attribute("name"),
+                ])
+        return nome_eval, lista_dados
+
+    @medir_fase("importacao")
+    def importar_notas_do_excel(self, caminho_arquivo, apenas_alteradas=False):
         try:
             print(f"[INFO] Importando notas de: {caminho_arquivo}")
-            df = pd.read_excel(caminho_arquivo)
+            with self.instrumentacao.fase("excel_leitura"):
+                df = ler_planilha(caminho_arquivo, cabecalho=True)
+
+            # Regra: Separador de vírgula e máximo 10 (todas as linhas de uma vez)
+            notas, validas = formatar_notas(df['Nota'])
+            observacoes = df['Observação'].astype(object).where(df['Observação'].notna(), None)
+
+            # Assinatura de cada linha para enviar só o que mudou desde a última importação
+            chaves = list(zip(df['ID_Nota_Interno'].astype(str),
+                              df['Nota'].astype(str).where(df['Nota'].notna(), ""),
+                              observacoes.astype(str).where(observacoes.notna(), "")))
+            if not apenas_alteradas:
+                self.linhas_importadas = set()
+            enviar = [chave not in self.linhas_importadas for chave in chaves]
+            if apenas_alteradas:
+                print(f"[INFO] {sum(enviar)} linhas alteradas desde o último envio.")
+
+            situacao = ["inalterada" if not alterada else "" for alterada in enviar]
+            mensagens = [""] * len(df)
+            pares = []
+            for posicao, (id_nota, id_obs) in enumerate(zip(df['ID_Nota_Interno'], df['ID_Obs_Interno'])):
+                if not enviar[posicao]:
+                    continue
+                if not validas[posicao]:
+                    situacao[posicao] = "nota inválida"
+                    mensagens[posicao] = f"'{df['Nota'].iloc[posicao]}' não é um número entre 0 e 10"
+                    continue
+                pares.append([str(id_nota), notas[posicao]])
+                if observacoes.iloc[posicao] is not None:
+                    pares.append([str(id_obs), str(observacoes.iloc[posicao])])
+
+            # Envia os pares nome -> valor em poucas chamadas JavaScript
+            resultados = self._aplicar_campos(pares)
+
             sucessos = 0
-            
-            for _, row in df.iterrows():
-                try:
-                    # Regra: Separador de vírgula e máximo 10
-                    if pd.isna(row['Nota']):
-                        nota_formatada = ""
-                    else:
-                        valor = float(str(row['Nota']).replace(',', '.'))
-                        nota_formatada = str(valor).replace('.', ',')
-                    
-                    # Preenche no site
-                    self.driver.find_element(By.NAME, row['ID_Nota_Interno']).clear()
-                    self.driver.find_element(By.NAME, row['ID_Nota_Interno']).send_keys(nota_formatada)
-
-                    if not pd.isna(row['Observação']):
-                        self.driver.find_element(By.NAME, row['ID_Obs_Interno']).clear()
-                        self.driver.find_element(By.NAME, row['ID_Obs_Interno']).send_keys(str(row['Observação']))
-                    
+            for posicao, (id_nota, id_obs) in enumerate(zip(df['ID_Nota_Interno'], df['ID_Obs_Interno'])):
+                if situacao[posicao]:
+                    continue
+                campos = [("nota", id_nota)]
+                if observacoes.iloc[posicao] is not None:
+                    campos.append(("observação", id_obs))
+                falhas = [f"{rotulo}: {resultados.get(str(nome), 'sem resposta')}"
+                          for rotulo, nome in campos if resultados.get(str(nome)) != "ok"]
+                if falhas:
+                    situacao[posicao] = "erro"
+                    mensagens[posicao] = "; ".join(falhas)
+                else:
+                    situacao[posicao] = "enviada"
                     sucessos += 1
-                except Exception:
-                    continue # Se falhar um aluno, tenta o próximo
+                    self.linhas_importadas.add(chaves[posicao])
+
+            status = pd.DataFrame({
+                "Matrícula": df['Matrícula'],
+                "Aluno": df['Aluno'],
+                "Nota": df['Nota'],
+                "Nota Enviada": [nota if estado == "enviada" else None for nota, estado in zip(notas, situacao)],
+                "Situação": situacao,
+                "Mensagem": mensagens,
+            })
+            self.ultimo_status = status
+            arquivo_status = self._gravar_status_importacao(status, caminho_arquivo)
 
+            problemas = status[~status["Situação"].isin(["enviada", "inalterada"])]
             print(f"[OK] {sucessos} notas inseridas com sucesso.")
+            if len(problemas):
+                print(f"[AVISO] {len(problemas)} linhas não foram enviadas:")
+                for _, linha in problemas.head(10).iterrows():
+                    print(f"   • {linha['Aluno']}: {linha['Situação']} ({linha['Mensagem']})")
+            if arquivo_status:
+                print(f"[INFO] Situação de cada linha gravada em: {arquivo_status}")
+            if self.salvamento_automatico:
+                bloqueio = None
+                if len(problemas) and not self.salvar_com_erros:
+                    bloqueio = f"{len(problemas)} linhas não enviadas"
+                self.salvar_no_site(caminho_arquivo, bloqueio=bloqueio)
             return True
         except Exception as e:
             print(f"[ERRO NA IMPORTAÇÃO] Falha ao ler arquivo ou preencher site: {e}")
             return False
 
+    @medir_fase("salvamento")
+    def salvar_no_site(self, caminho_arquivo, timeout=30, bloqueio=None):
+        """
+        Clica em Salvar e aguarda a mensagem de confirmação ou de erro do site
+        Args:
+            bloqueio (str): Motivo para não salvar; o registro é gravado sem clicar em Salvar
+        Returns:
+            dict: {'planilha', 'sucesso', 'mensagem', 'horario'} (também guardado em self.salvamentos)
+        """
+        registro = {'planilha': caminho_arquivo, 'sucesso': False, 'mensagem': None,
+                    'horario': time.strftime('%Y-%m-%d %H:%M:%S')}
+        if bloqueio:
+            registro['mensagem'] = f"não salvo: {bloqueio}"
+            print(f"[AVISO] Salvamento automático não realizado: {bloqueio}. Revise e clique em 'SALVAR' manualmente.")
+            self.salvamentos.append(registro)
+            return registro
+        try:
+            if not self.driver.execute_script(JS_SALVAR_LANCAMENTO):
+                registro['mensagem'] = "botão Salvar não encontrado"
+            else:
+                confirmacao = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                    lambda driver: driver.execute_script(JS_CONFIRMACAO_SALVAR)
+                )
+                registro['sucesso'], registro['mensagem'] = bool(confirmacao[0]), confirmacao[1]
+        except TimeoutException:
+            registro['mensagem'] = "site não confirmou o salvamento"
+        except Exception as e:
+            registro['mensagem'] = f"erro ao salvar: {e}"
+
+        if registro['sucesso']:
+            print(f"[OK] Notas salvas no site: {registro['mensagem']}")
+        else:
+            print(f"[ERRO] Salvamento não confirmado: {registro['mensagem']}. Clique em 'SALVAR' manualmente.")
+        self.salvamentos.append(registro)
+        return registro
+
+    def _aplicar_campos(self, pares):
+        """
+        Aplica os valores no site em lotes de TAMANHO_LOTE_IMPORTACAO campos
+        Args:
+            pares (list): Pares [name do input, valor]
+        Returns:
+            dict: name -> 'ok', 'inexistente', 'bloqueado' ou mensagem de erro
+        """
+        resultados = {}
+        for inicio in range(0, len(pares), TAMANHO_LOTE_IMPORTACAO):
+            lote = pares[inicio:inicio + TAMANHO_LOTE_IMPORTACAO]
+            try:
+                with self.instrumentacao.medir_campos("nota_lote", len(lote)):
+                    resultados.update(self.driver.execute_script(JS_APLICAR_CAMPOS, lote) or {})
+            except Exception as e:
+                # Lote recusado pelo navegador: campo a campo, como antes
+                print(f"[AVISO] Falha no envio em lote ({e}); enviando campo a campo...")
+                for nome, valor in lote:
+                    try:
+                        campo = self.driver.find_element(By.NAME, nome)
+                        campo.clear()
+                        campo.send_keys(valor)
+                        resultados[nome] = "ok"
+                    except Exception as erro:
+                        resultados[nome] = f"erro: {erro.__class__.__name__}"
+        return resultados
+
+    def _gravar_status_importacao(self, status, caminho_arquivo):
+        """Grava a tabela de situação ao lado da planilha (<nome>_Status<extensão>)"""
+        raiz, extensao = os.path.splitext(caminho_arquivo)
+        arquivo_status = f"{raiz}_Status{extensao}"
+        try:
+            gravar_planilha(status, arquivo_status, nome_aba="Status")
+            return arquivo_status
+        except Exception as e:
+            print(f"[AVISO] Não foi possível gravar a situação da importação: {e}")
+            return None
+
+    def observar_planilha(self, caminho_arquivo, continuo=False):
+        """
+        Importa a planilha assim que ela for salva e fechada. No modo contínuo,
+        continua observando e envia as linhas alteradas a cada novo salvamento
+        (Ctrl+C encerra a observação)
+        """
+        print("[INFO] Modo observação: as notas são enviadas quando a planilha for salva e o Excel fechado.")
+        try:
+            assinatura = aguardar_planilha_salva(caminho_arquivo)
+            self.importar_notas_do_excel(caminho_arquivo)
+            while continuo:
+                print("\n[INFO] Observando novos salvamentos (Ctrl+C encerra)...")
+                assinatura = aguardar_planilha_salva(caminho_arquivo, assinatura, exigir_fechada=False)
+                self.importar_notas_do_excel(caminho_arquivo, apenas_alteradas=True)
+        except KeyboardInterrupt:
+            print("\n[INFO] Observação encerrada.")
+
 # ============================================================
 # LOOP DE FUNCIONAMENTO
 # ============================================================
 if __name__ == "__main__":
-    bot = ExtratorQAcademico()
+    parser = argparse.ArgumentParser(description="Extração e importação de notas - Q-Acadêmico")
+    parser.add_argument("--headless", action="store_true", default=None, help="abre o navegador sem janela")
+    parser.add_argument("--navegador", metavar="CAMINHO", help="executável do Chrome/Chromium")
+    parser.add_argument("--janela", metavar="LARGURA,ALTURA", help="tamanho da janela, ex.: 1366,768")
+    parser.add_argument("--perfil-leve", action="store_true", default=None, help="não carrega imagens, fontes e animações")
+    parser.add_argument("--formato", choices=FORMATOS, default="xlsx", help="formato da planilha gerada: xlsx, csv ou parquet")
+    parser.add_argument("--trace", metavar="ARQUIVO", help="mede o tempo de cada fase e campo e grava o trace em .json ou .csv")
+    parser.add_argument("--observar", dest="observar", action="store_const", const="unico",
+                        help="envia as notas assim que a planilha for salva e fechada, sem apertar ENTER")
+    parser.add_argument("--observar-continuo", dest="observar", action="store_const", const="continuo",
+                        help="como --observar e, depois, envia as linhas alteradas a cada novo salvamento até Ctrl+C")
+    parser.add_argument("--salvar", action="store_true",
+                        help="clica em Salvar após importar as notas e aguarda a confirmação do site")
+    parser.add_argument("--salvar-com-erros", action="store_true",
+                        help="com --salvar, salva também quando há linhas não enviadas")
+    args = parser.parse_args()
+
+    instrumentacao = Instrumentacao(args.trace or os.environ.get("GALILEU_TRACE") or None)
+    bot = ExtratorQAcademico(args.headless, args.navegador, args.janela, args.perfil_leve, instrumentacao, args.formato)
+    bot.salvamento_automatico = args.salvar
+    bot.salvar_com_erros = args.salvar_com_erros
     
     try:
         # Abre o site uma única vez
@@ -124,11 +404,15 @@ if __name__ == "__main__":
                 if arquivo:
                     print(f"\n[EDITAR] Abra o arquivo '{arquivo}'")
                     print("Preencha as notas, SALVE e FECHE o Excel.")
-                    input("Após fechar o Excel, aperte ENTER para enviar as notas ao site...")
 
                     # --- PASSO 2: IMPORTAR ---
-                    if os.path.exists(arquivo):
-                        bot.importar_notas_do_excel(arquivo)
+                    if args.observar:
+                        bot.observar_planilha(arquivo, continuo=args.observar == "continuo")
+                    else:
+                        input("Após fechar o Excel, aperte ENTER para enviar as notas ao site...")
+                        if os.path.exists(arquivo):
+                            bot.importar_notas_do_excel(arquivo)
+                    if not bot.salvamento_automatico:
                         print("\n[AVISO] Notas inseridas! Lembre-se de clicar em 'SALVAR' no site.")
                 
             except Exception as e:
@@ -140,6 +424,8 @@ if __name__ == "__main__":
             if resposta != 's':
                 break
 
+        for registro in bot.salvamentos:
+            print(f"[{'OK' if registro['sucesso'] else 'FALHA'}] Salvamento de {registro['planilha']}: {registro['mensagem']}")
         print("\n[FINALIZADO] Automação concluída com sucesso.")
 
     except KeyboardInterrupt:
@@ -147,6 +433,7 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n[ERRO CRÍTICO] Ocorreu uma falha grave: {e}")
     finally:
+        instrumentacao.finalizar()
         # Mantém o navegador aberto se o usuário quiser conferir
         finalizar = input("\nDeseja fechar o navegador agora? (s/n): ").strip().lower()
         if finalizar == 's':
@@ -11,13 +11,18 @@ Autor: Gabriel Delgado
 Data: 2025
 """
 
+import argparse
+import copy
+import json
 import os
+import queue
 import re
 import sys
+import tempfile
+import threading
 import time
 import warnings
 import pandas as pd
-import numpy as np
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -32,28 +37,621 @@ from selenium.common.exceptions import (
 from openpyxl import Workbook
 from pathlib import Path
 
+try:
+    import yaml  # Opcional: arquivos de lote em YAML
+except ImportError:
+    yaml = None
+
+from diario import DiarioPreenchimento
+from instrumentacao import Instrumentacao, medir_campo, medir_fase
+from planilhas import (FORMATOS, PastaConsolidada, aguardar_planilha_salva, extensao_formato,
+                       formato_planilha, gravar_pasta_consolidada, gravar_planilha, ler_planilha, nome_aba)
+
+try:
+    from galileu_http import ClienteGalileuHTTP  # Opcional: backend sem navegador (requests)
+except ImportError:
+    ClienteGalileuHTTP = None
+
 # Suprimir warnings desnecessários
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'  # Suprimir logs do TensorFlow
 
 
+# Endereço do sistema (pode ser trocado pela variável de ambiente GALILEU_URL)
+URL_GALILEU = "https://ec2galileu.com.br"
+
+# Catálogo de cursos e turmas guardado em disco e sua validade
+ARQUIVO_CATALOGO = "catalogo_galileu.json"
+VALIDADE_CATALOGO_HORAS = 24
+
+
+def _env_ativo(nome):
+    """Indica se uma variável de ambiente booleana está ligada (1, true, sim...)"""
+    return os.environ.get(nome, "").strip().lower() in ("1", "true", "sim", "s", "yes", "y")
+
+
+def configurar_modo_navegador(chrome_options, headless=None, binario=None, tamanho_janela=None, perfil_leve=None):
+    """
+    Aplica às opções do Chrome o modo headless, o binário, o tamanho da janela e o
+    perfil leve. Parâmetros None são lidos das variáveis de ambiente
+    NAVEGADOR_HEADLESS, NAVEGADOR_BINARIO, NAVEGADOR_JANELA (ex.: "1366,768") e
+    NAVEGADOR_PERFIL_LEVE; o perfil leve é ativado por padrão no modo headless.
+    Args:
+        chrome_options (Options): Opções do Chrome a serem ajustadas
+    Returns:
+        dict: Configuração efetivamente aplicada
+    """
+    if headless is None:
+        headless = _env_ativo("NAVEGADOR_HEADLESS")
+    if binario is None:
+        binario = os.environ.get("NAVEGADOR_BINARIO") or None
+    if tamanho_janela is None:
+        tamanho_janela = os.environ.get("NAVEGADOR_JANELA") or None
+    if perfil_leve is None:
+        perfil_leve = _env_ativo("NAVEGADOR_PERFIL_LEVE") if "NAVEGADOR_PERFIL_LEVE" in os.environ else headless
+    
+    if isinstance(tamanho_janela, (tuple, list)):
+        tamanho_janela = f"{tamanho_janela[0]},{tamanho_janela[1]}"
+    if headless and not tamanho_janela:
+        tamanho_janela = "1366,768"  # Sem tela não há o que maximizar
+    
+    if headless:
+        chrome_options.add_argument('--headless=new')
+    if binario:
+        chrome_options.binary_location = binario
+    if tamanho_janela:
+        chrome_options.add_argument(f'--window-size={tamanho_janela.replace("x", ",")}')
+    
+    if perfil_leve:
+        # Não baixa imagens nem fontes e desliga animações e recursos de fundo
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_argument('--disable-remote-fonts')
+        chrome_options.add_argument('--disable-smooth-scrolling')
+        chrome_options.add_argument('--disable-background-networking')
+        chrome_options.add_argument('--disable-component-update')
+        chrome_options.add_argument('--disable-default-apps')
+        chrome_options.add_argument('--disable-sync')
+        chrome_options.add_argument('--mute-audio')
+        chrome_options.add_argument('--no-first-run')
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+    
+    return {
+        'headless': headless,
+        'binario': binario,
+        'tamanho_janela': tamanho_janela,
+        'perfil_leve': perfil_leve,
+    }
+
+
+def aplicar_perfil_leve(driver):
+    """
+    Complementa o perfil leve após o navegador abrir: bloqueia o download de
+    fontes e desativa transições/animações CSS e do jQuery em todas as páginas
+    Args:
+        driver (WebDriver): Driver do Chrome já inicializado
+    """
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {
+            'urls': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+        })
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': JS_SEM_ANIMACOES})
+    except Exception as e:
+        print(f"[AVISO] Não foi possível aplicar o perfil leve completo: {e}")
+
+
+# Injetado em cada página no perfil leve: remove transições/animações CSS e as
+# animações do jQuery, que só atrasam modals e rolagens.
+JS_SEM_ANIMACOES = """
+    document.addEventListener('DOMContentLoaded', function() {
+        var estilo = document.createElement('style');
+        estilo.textContent = '*, *::before, *::after { transition: none !important; animation: none !important; }';
+        document.head.appendChild(estilo);
+        if (window.jQuery) { window.jQuery.fx.off = true; }
+    });
+"""
+
+
+# Script executado no navegador para ler toda a tabela gridAlunos de uma vez.
+# Reproduz a leitura elemento a elemento: nome na primeira célula e, para cada
+# célula seguinte que contém input, o valor atual e o atributo name do primeiro input.
+# Também informa se o checkbox N/C (chk-nc-<name>) de cada campo está marcado.
+JS_EXTRAIR_GRID = """
+    var tabela = document.getElementById('gridAlunos');
+    if (!tabela) { return null; }
+    var linhas = tabela.getElementsByTagName('tr');
+    var resultado = [];
+    for (var i = 0; i < linhas.length; i++) {
+        var colunas = linhas[i].getElementsByTagName('td');
+        if (colunas.length === 0) { continue; }
+        var nome = (colunas[0].innerText || colunas[0].textContent || '').trim().split('\\n')[0];
+        var valores = [nome];
+        var nomes = [nome];
+        var nc = [];
+        for (var j = 1; j < colunas.length; j++) {
+            var input = colunas[j].querySelector('input');
+            if (input) {
+                var nomeCampo = input.getAttribute('name');
+                var checkbox = document.getElementById('chk-nc-' + String(nomeCampo).toLowerCase());
+                valores.push(input.value);
+                nomes.push(nomeCampo);
+                nc.push(checkbox ? checkbox.checked : null);
+            }
+        }
+        resultado.push({valores: valores, nomes: nomes, nc: nc});
+    }
+    return resultado;
+"""
+
+
+# Script que aplica várias notas de uma vez. Recebe uma lista de pares [id, nota]
+# e devolve um mapa id -> true/false. Para cada campo visível e habilitado, define
+# o valor e dispara os mesmos eventos que a digitação (input, keyup e change),
+# para que as rotinas JavaScript do site recalculem médias e marquem alterações.
+JS_PREENCHER_NOTAS = """
+    var plano = arguments[0];
+    var resultado = {};
+    var definirValor = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    for (var i = 0; i < plano.length; i++) {
+        var id = plano[i][0];
+        var nota = plano[i][1];
+        var campo = document.getElementById(id);
+        if (!campo || campo.disabled || campo.getClientRects().length === 0) {
+            resultado[id] = false;
+            continue;
+        }
+        try {
+            campo.dispatchEvent(new FocusEvent('focus'));
+            definirValor.call(campo, nota);
+            campo.dispatchEvent(new Event('input', {bubbles: true}));
+            campo.dispatchEvent(new KeyboardEvent('keyup', {bubbles: true}));
+            campo.dispatchEvent(new Event('change', {bubbles: true}));
+            campo.dispatchEvent(new FocusEvent('blur'));
+            resultado[id] = true;
+        } catch (e) {
+            resultado[id] = false;
+        }
+    }
+    return resultado;
+"""
+
+
+# Script que marca vários checkboxes N/C de uma vez. Recebe os IDs base dos campos
+# e devolve um mapa id -> true/false indicando se o checkbox chk-nc-<id> ficou marcado.
+# O clique nativo executa os handlers do site (onclick ou addEventListener); a função
+# ativaNC só é chamada diretamente quando o clique não marcou o checkbox.
+JS_MARCAR_NC = """
+    var ids = arguments[0];
+    var resultado = {};
+    var temAtivaNC = typeof window.ativaNC === 'function';
+    for (var i = 0; i < ids.length; i++) {
+        var idCampo = ids[i];
+        var idBase = String(idCampo).toLowerCase();
+        var checkbox = document.getElementById('chk-nc-' + idBase);
+        if (!checkbox || checkbox.disabled) {
+            resultado[idCampo] = false;
+            continue;
+        }
+        try {
+            if (!checkbox.checked) {
+                checkbox.click();
+                if (!checkbox.checked) {
+                    checkbox.checked = true;
+                    checkbox.dispatchEvent(new Event('change', {bubbles: true}));
+                    if (temAtivaNC) { window.ativaNC(checkbox, idBase); }
+                }
+            }
+            resultado[idCampo] = checkbox.checked;
+        } catch (e) {
+            resultado[idCampo] = checkbox.checked;
+        }
+    }
+    return resultado;
+"""
+
+
+# Desmarca os checkboxes N/C de campos que voltaram a ter nota. Devolve um mapa
+# id -> true se o checkbox chk-nc-<id> ficou desmarcado (ou não existe). Como na
+# marcação, ativaNC só é chamada diretamente quando o clique não teve efeito.
+JS_DESMARCAR_NC = """
+    var ids = arguments[0];
+    var resultado = {};
+    var temAtivaNC = typeof window.ativaNC === 'function';
+    for (var i = 0; i < ids.length; i++) {
+        var idCampo = ids[i];
+        var idBase = String(idCampo).toLowerCase();
+        var checkbox = document.getElementById('chk-nc-' + idBase);
+        if (!checkbox || !checkbox.checked) {
+            resultado[idCampo] = true;
+            continue;
+        }
+        if (checkbox.disabled) {
+            resultado[idCampo] = false;
+            continue;
+        }
+        try {
+            checkbox.click();
+            if (checkbox.checked) {
+                checkbox.checked = false;
+                checkbox.dispatchEvent(new Event('change', {bubbles: true}));
+                if (temAtivaNC) { window.ativaNC(checkbox, idBase); }
+            }
+        } catch (e) {}
+        resultado[idCampo] = !checkbox.checked;
+    }
+    return resultado;
+"""
+
+
+# Lê de volta vários campos de uma vez para a verificação pós-preenchimento.
+# Recebe os IDs dos campos e devolve um mapa id -> [valor do input ou null se o
+# campo não existir, checkbox N/C marcado ou null se não houver checkbox].
+JS_LER_CAMPOS = """
+    var ids = arguments[0];
+    var resultado = {};
+    for (var i = 0; i < ids.length; i++) {
+        var id = ids[i];
+        var campo = document.getElementById(id) || document.getElementsByName(id)[0];
+        var checkbox = document.getElementById('chk-nc-' + String(id).toLowerCase());
+        resultado[id] = [campo ? campo.value : null, checkbox ? checkbox.checked : null];
+    }
+    return resultado;
+"""
+
+
+# Aciona o botão Salvar do registro de notas. As mensagens de retorno já exibidas
+# são marcadas antes do clique, para que apenas a resposta deste salvamento seja
+# considerada. Devolve false se o botão não existir ou estiver desabilitado.
+JS_SALVAR_NOTAS = """
+    var alertas = document.querySelectorAll('.alert-success, .alert-danger, .alert-error');
+    for (var i = 0; i < alertas.length; i++) { alertas[i].setAttribute('data-automacao-vista', '1'); }
+    var botao = document.getElementById('btnSalvar');
+    if (!botao || botao.disabled) { return false; }
+    botao.click();
+    return true;
+"""
+
+
+# Primeira mensagem de retorno nova após o clique em Salvar: [sucesso, texto] ou null.
+JS_CONFIRMACAO_SALVAR = """
+    var alertas = document.querySelectorAll('.alert-success, .alert-danger, .alert-error');
+    for (var i = 0; i < alertas.length; i++) {
+        if (!alertas[i].hasAttribute('data-automacao-vista')) {
+            return [alertas[i].classList.contains('alert-success'),
+                    (alertas[i].innerText || alertas[i].textContent || '').trim()];
+        }
+    }
+    return null;
+"""
+
+
+# Índice de presença: IDs dos inputs de nota, dos checkboxes chk-nc-* e dos
+# elementos desabilitados de gridAlunos, em uma passada. A tabela recebe uma marca
+# (propriedade JavaScript, sem alterar o DOM) para detectar quando é redesenhada.
+JS_INDICE_CAMPOS = """
+    var grid = document.getElementById('gridAlunos');
+    if (!grid) { return null; }
+    grid.__galileuIndice = arguments[0];
+    var campos = [], checkboxes = [], bloqueados = [];
+    var inputs = grid.getElementsByTagName('input');
+    for (var i = 0; i < inputs.length; i++) {
+        var input = inputs[i];
+        if (!input.id) { continue; }
+        if (input.type === 'checkbox') {
+            if (input.id.indexOf('chk-nc-') === 0) { checkboxes.push(input.id); }
+        } else {
+            campos.push(input.id);
+        }
+        if (input.disabled) { bloqueados.push(input.id); }
+    }
+    return {campos: campos, checkboxes: checkboxes, bloqueados: bloqueados};
+"""
+
+
+# Indica se a tabela indexada ainda é a mesma (não foi redesenhada).
+JS_INDICE_VALIDO = """
+    var grid = document.getElementById('gridAlunos');
+    return !!grid && grid.__galileuIndice === arguments[0];
+"""
+
+
+# Lê as opções (valor e texto) de um select, sem a opção vazia.
+JS_LER_OPCOES = """
+    var select = document.getElementById(arguments[0]);
+    if (!select) { return []; }
+    var opcoes = [];
+    for (var i = 0; i < select.options.length; i++) {
+        var opcao = select.options[i];
+        if (opcao.value) { opcoes.push([opcao.value, opcao.text.trim()]); }
+    }
+    return opcoes;
+"""
+
+
+# Indica se a turma pode ser selecionada direto: o curso já está selecionado na
+# página e a turma está entre as opções atuais de id_turma. Não altera a página.
+JS_TURMA_DISPONIVEL = """
+    var curso = document.getElementById('id_curso');
+    var turma = document.getElementById('id_turma');
+    var valorCurso = arguments[0], valorTurma = arguments[1];
+    if (!curso || !turma || turma.disabled || curso.value !== valorCurso) { return false; }
+    return Array.prototype.some.call(turma.options, function(opcao) {
+        return opcao.value === valorTurma;
+    });
+"""
+
+
+# Instala (uma única vez por página) um contador de requisições XHR pendentes e um
+# MutationObserver no body; a cada chamada zera o contador de mutações, marcando
+# o início de uma nova espera.
+JS_OBSERVAR_PAGINA = """
+    if (!window.__galileuObservador) {
+        window.__galileuXhrPendentes = 0;
+        var enviarOriginal = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function() {
+            window.__galileuXhrPendentes++;
+            this.addEventListener('loadend', function() {
+                window.__galileuXhrPendentes = Math.max(0, window.__galileuXhrPendentes - 1);
+            });
+            return enviarOriginal.apply(this, arguments);
+        };
+        window.__galileuObservador = new MutationObserver(function(mutacoes) {
+            window.__galileuMutacoes += mutacoes.length;
+            window.__galileuUltimaMutacao = Date.now();
+        });
+        window.__galileuObservador.observe(document.body, {childList: true, subtree: true});
+    }
+    window.__galileuMutacoes = 0;
+    window.__galileuUltimaMutacao = Date.now();
+"""
+
+# Retorna o estado atual da página usado pelas esperas por eventos.
+JS_ESTADO_PAGINA = """
+    var turma = document.getElementById('id_turma');
+    var loading = document.querySelectorAll('.modal.dialog-loading.show, .bootbox.modal.show');
+    var carregando = Array.prototype.some.call(loading, function(el) {
+        return el.getClientRects().length > 0;
+    });
+    return {
+        pendentes: (window.__galileuXhrPendentes || 0) + ((window.jQuery && window.jQuery.active) || 0),
+        carregando: carregando,
+        opcoesTurma: turma ? turma.options.length : 0,
+        grid: !!document.getElementById('gridAlunos'),
+        mutacoes: window.__galileuMutacoes || 0,
+        msDesdeMutacao: Date.now() - (window.__galileuUltimaMutacao || 0)
+    };
+"""
+
+
+def limpar_nome_turma(texto_turma):
+    """
+    Limpa o texto de uma turma para usá-lo como nome de arquivo
+    Args:
+        texto_turma (str): Rótulo da turma, ex.: '2025 / 6º ANO A-6º ANO-03/02/2025 a 19/12/2025'
+    Returns:
+        str: Nome sem datas, acentos e espaços
+    """
+    nome_base = re.sub(r'\d{2}/\d{2}/\d{4} a \d{2}/\d{2}/\d{4}', '', texto_turma)
+    nome_base = re.sub(r'[^A-Za-z0-9\s]+', '', nome_base)
+    return re.sub(r'\s+', '_', nome_base.strip())
+
+
+def _normalizar_rotulo(texto):
+    """Rótulo em maiúsculas e com espaços simples, para comparar nomes de curso/turma"""
+    return ' '.join(str(texto).split()).upper()
+
+
+def normalizar_nota(valor):
+    """
+    Normaliza uma nota para comparação: '7,5', '7.5' e 7.5 ficam iguais
+    Args:
+        valor: Valor da planilha ou do campo do site
+    Returns:
+        float ou str: Número, texto em maiúsculas ou '' para células vazias
+    """
+    if valor is None or pd.isna(valor):
+        return ''
+    texto = str(valor).strip()
+    try:
+        return float(texto.replace(',', '.'))
+    except ValueError:
+        return texto.upper()
+
+
+def normalizar_planilha_notas(planilha):
+    """
+    Normaliza, coluna a coluna, a planilha lida com header=None: a primeira linha
+    vira cabeçalho, números viram texto com vírgula (7.5 -> '7,5', 8 -> '8'),
+    variações de 'n/c' viram 'N/C' e células vazias, só com espaços ou 'nan'
+    viram nulas
+    Args:
+        planilha (DataFrame): Planilha bruta (primeira linha com os títulos)
+    Returns:
+        tuple: (DataFrame com colunas de notas do tipo string, números convertidos, células de notas)
+    """
+    cabecalho = list(planilha.iloc[0]) if len(planilha) else list(planilha.columns)
+    corpo = planilha.iloc[1:].reset_index(drop=True)
+    
+    colunas = {}
+    convertidos = 0
+    for posicao in range(corpo.shape[1]):
+        coluna = corpo.iloc[:, posicao].astype(object)
+        if posicao == 0:
+            colunas[posicao] = coluna
+            continue
+        
+        numeros = pd.to_numeric(coluna, errors='coerce')
+        eh_numero = numeros.notna()
+        convertidos += int(eh_numero.sum())
+        
+        texto = coluna.where(~eh_numero).astype("string").str.strip()
+        texto = texto.mask(texto.isin(["", "nan", "NaN"]))
+        eh_nc = texto.str.upper().str.replace(" ", "", regex=False).eq("N/C").fillna(False)
+        texto = texto.mask(eh_nc.astype(bool), "N/C")
+        
+        numeros_formatados = (numeros[eh_numero].astype(str)
+                              .str.replace(r"\.0$", "", regex=True)
+                              .str.replace(".", ",", regex=False))
+        texto[eh_numero] = numeros_formatados.astype("string")
+        colunas[posicao] = texto
+    
+    notas = pd.DataFrame(colunas, index=corpo.index)
+    notas.columns = cabecalho
+    return notas, convertidos, corpo.shape[0] * max(corpo.shape[1] - 1, 0)
+
+
+def carregar_tarefas_lote(caminho):
+    """
+    Lê o arquivo de tarefas do modo lote (YAML, JSON ou CSV)
+    Cada tarefa informa curso ('FUND2', 'MEDIO', o valor de id_curso ou o nome do
+    curso; opcional se a turma estiver no catálogo), turma (valor de id_turma ou
+    nome da turma), periodo ('1', '2' ou '3'), modo ('extrair' ou 'preencher'),
+    planilha (caminho do arquivo; opcional ao extrair) e, opcionalmente, aba
+    (aba de uma pasta consolidada) e disciplina (valor de id_disciplina).
+    Em YAML/JSON o arquivo pode ser uma lista ou um objeto com a chave 'tarefas'.
+    Uma pasta consolidada (.xlsx com aba Indice) gera uma tarefa 'preencher' por aba.
+    Args:
+        caminho (str): Caminho do arquivo de tarefas
+    Returns:
+        list: Tarefas normalizadas
+    """
+    extensao = Path(caminho).suffix.lower()
+    if extensao in (".xlsx", ".xlsm"):
+        indice = PastaConsolidada(caminho).indice()
+        if indice.empty:
+            raise ValueError(f"{caminho} não tem a aba Indice de uma pasta consolidada")
+        tarefas = [dict(curso=linha.get("Curso"), turma=linha.get("Turma"), periodo=linha.get("Periodo"),
+                        disciplina=linha.get("Disciplina"), aba=linha.get("Aba"), modo="preencher", planilha=caminho)
+                   for linha in indice.to_dict("records")]
+    elif extensao == ".csv":
+        tarefas = pd.read_csv(caminho, dtype=str, keep_default_na=False).to_dict("records")
+    else:
+        with open(caminho, encoding="utf-8") as arquivo:
+            if extensao in (".yaml", ".yml"):
+                if yaml is None:
+                    raise RuntimeError("PyYAML não está instalado (pip install pyyaml)")
+                conteudo = yaml.safe_load(arquivo)
+            else:
+                conteudo = json.load(arquivo)
+        tarefas = conteudo.get("tarefas", []) if isinstance(conteudo, dict) else conteudo
+    
+    normalizadas = []
+    for numero, tarefa in enumerate(tarefas or [], 1):
+        modo = str(tarefa.get("modo", "extrair")).strip().lower()
+        modo = {"extract": "extrair", "fill": "preencher"}.get(modo, modo)
+        if modo not in ("extrair", "preencher"):
+            raise ValueError(f"tarefa {numero}: modo inválido '{modo}' (use extrair ou preencher)")
+        for campo in ("turma", "periodo"):
+            if str(tarefa.get(campo, "")).strip() == "":
+                raise ValueError(f"tarefa {numero}: campo '{campo}' não informado")
+        normalizadas.append({
+            "curso": str(tarefa.get("curso") or "").strip(),
+            "turma": str(tarefa["turma"]).strip(),
+            "periodo": str(tarefa["periodo"]).strip(),
+            "modo": modo,
+            "planilha": str(tarefa.get("planilha") or "").strip() or None,
+            "aba": str(tarefa.get("aba") or "").strip() or None,
+            "disciplina": str(tarefa.get("disciplina") or "").strip() or None,
+        })
+    return normalizadas
+
+
 class AutomacaoNotasGalileu:
     """
     Classe principal para automação do sistema de notas Galileu EC2
     """
     
-    def __init__(self):
-        """Inicializa o sistema de automação"""
+    def __init__(self, headless=None, binario_navegador=None, tamanho_janela=None, perfil_leve=None,
+                 arquivo_sessao=None, diretorio_perfil=None, backend="navegador", arquivo_catalogo=None,
+                 arquivo_trace=None):
+        """
+        Inicializa o sistema de automação
+        Args:
+            headless (bool): Abre o navegador sem janela (padrão: NAVEGADOR_HEADLESS)
+            binario_navegador (str): Caminho do executável do Chrome/Chromium
+            tamanho_janela (str): Tamanho da janela, ex.: "1366,768" (padrão: maximizada)
+            perfil_leve (bool): Não carrega imagens, fontes e animações
+            arquivo_sessao (str): Arquivo JSON onde os cookies da sessão são guardados
+                                  entre execuções (padrão: GALILEU_SESSAO)
+            diretorio_perfil (str): Diretório de dados do Chrome reaproveitado entre
+                                    execuções (padrão: GALILEU_PERFIL_DIR)
+            backend (str): 'navegador' (Selenium) ou 'http' (sem navegador, apenas no modo lote)
+            arquivo_catalogo (str): Arquivo JSON do catálogo de cursos e turmas
+                                    (padrão: GALILEU_CATALOGO ou catalogo_galileu.json)
+            arquivo_trace (str): Liga a medição de tempos e grava o trace neste arquivo
+                                 .json ou .csv (padrão: GALILEU_TRACE; sem ele, desligada)
+        """
         self.driver = None
+        self.backend = backend
+        self.instrumentacao = Instrumentacao(arquivo_trace or os.environ.get("GALILEU_TRACE") or None)
+        self.cliente_http = None
+        self.url_base = os.environ.get("GALILEU_URL", URL_GALILEU).rstrip("/")
+        self.arquivo_sessao = arquivo_sessao or os.environ.get("GALILEU_SESSAO") or None
+        self.diretorio_perfil = diretorio_perfil or os.environ.get("GALILEU_PERFIL_DIR") or None
+        self.arquivo_catalogo = arquivo_catalogo or os.environ.get("GALILEU_CATALOGO") or ARQUIVO_CATALOGO
+        self.validade_catalogo_horas = VALIDADE_CATALOGO_HORAS
+        self.atualizar_catalogo = False  # Ignora o catálogo em disco na primeira leitura
+        self.catalogo = None
+        self.headless = headless
+        self.binario_navegador = binario_navegador
+        self.tamanho_janela = tamanho_janela
+        self.perfil_leve = perfil_leve
         self.df_usuario = None
         self.df_interno = None
+        self.estado_nc = {}  # id do campo -> checkbox N/C marcado na extração
         self.nome_arquivo_excel = None
+        self.formato_planilha = "xlsx"  # Formato das planilhas com nome gerado (xlsx, csv ou parquet)
+        self.notas = None
+        self.ultimo_relatorio = None
+        self.curso_atual = None
+        self.turma_atual = None
+        self.periodo_atual = None
+        self.extracao_em_lote = True  # Lê toda a tabela em uma única chamada JavaScript
+        self.preenchimento_em_lote = True  # Envia as notas ao site em poucas chamadas JavaScript
+        self.tamanho_lote_preenchimento = 150
+        self.preenchimento_diferencial = False  # Só altera campos diferentes da extração
+        self.retomar_preenchimento = False  # Pula campos já concluídos segundo o diário
+        self.verificacao_pos_preenchimento = True  # Relê os campos e corrige divergências antes do Salvar
+        self.tentativas_verificacao = 2  # Rodadas de correção dos campos divergentes
+        self.salvamento_automatico = False  # Clica em Salvar após o preenchimento e aguarda a confirmação
+        self.timeout_salvamento = 30
+        self.salvamentos = []  # Resultado do salvamento de cada turma/período
+        self.salvar_com_erros = False  # Salva automaticamente mesmo com erros ou divergências
+        self.modo_operacao = None  # Modo escolhido na linha de comando (None = pergunta)
+        self.cursos_exportacao = None  # Cursos da exportação completa (None = todos do catálogo)
+        self.periodos_exportacao = None  # Períodos da exportação completa (None = todos do site)
+        self.exportar_disciplinas = False  # Percorre também todas as opções de id_disciplina
+        self.diretorio_exportacao = None  # Padrão: exportacao_<data>
+        self.exportacao_consolidada = False  # Exportação completa em um único xlsx (uma aba por tabela)
+        self.aba_planilha = None  # Aba da pasta consolidada lida por carregar_notas_editadas
+        self._pastas_consolidadas = {}  # caminho -> PastaConsolidada aberta (compartilhada pelos trabalhadores)
+        self._trava_pastas = threading.Lock()
+        self._trava_catalogo = threading.Lock()  # Alterações e gravação do catálogo (compartilhado pelos trabalhadores)
+        self.diretorio_diarios = os.environ.get("GALILEU_DIARIOS") or "diarios"
+        self.diario = None
+        self.modo_observacao = None  # None (pergunta), 'unico' ou 'continuo': observa o salvamento da planilha
+        self.estabilidade_observacao = 1.5  # Segundos sem novas gravações antes de aceitar um salvamento
+        self._assinatura_planilha = None  # Último salvamento tratado pelo modo observação
+        self.timeout_espera = 15  # Limite (s) das esperas por eventos da página
+        self._preparacao_navegador = None  # Thread que abre o navegador enquanto o usuário digita
+        self._indice_campos = None  # IDs dos inputs presentes em gridAlunos (None = sem índice)
+        self._recarregar_registro = True  # Modo lote: recarrega a página antes da próxima tarefa
+        self._indice_checkboxes = set()  # IDs dos checkboxes chk-nc-* presentes
+        self._indice_bloqueados = set()  # IDs dos inputs e checkboxes desabilitados
+        self._versao_indice = 0
+        self._navegador_pronto = False
+        self._pagina_login_pronta = False
+        self._sessao_restaurada = False
         self.configuracao_curso = {
             'FUND2': '3533',
             'MEDIO': '3532'
         }
         
+    @medir_fase("inicio_navegador")
     def inicializar_navegador(self):
         """
         Inicializa o navegador Chrome com configurações para reduzir warnings
@@ -84,9 +682,24 @@ class AutomacaoNotasGalileu:
             chrome_options.add_argument('--disable-web-security')
             chrome_options.add_argument('--allow-running-insecure-content')
             
+            # Perfil dedicado mantém cookies e cache entre execuções
+            if self.diretorio_perfil:
+                chrome_options.add_argument(f'--user-data-dir={os.path.abspath(self.diretorio_perfil)}')
+            
+            # Modo headless, binário, tamanho da janela e perfil leve
+            modo = configurar_modo_navegador(
+                chrome_options, self.headless, self.binario_navegador,
+                self.tamanho_janela, self.perfil_leve
+            )
+            
             # Inicializar o driver com as opções configuradas
             self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.maximize_window()
+            if not modo['tamanho_janela']:
+                self.driver.maximize_window()
+            if modo['perfil_leve']:
+                aplicar_perfil_leve(self.driver)
+            if modo['headless']:
+                print("[INFO] Navegador em modo headless (sem janela)")
             
             print("[OK] Navegador iniciado com sucesso!")
             return True
@@ -94,25 +707,88 @@ class AutomacaoNotasGalileu:
             print(f"[ERRO] Erro ao inicializar navegador: {e}")
             return False
     
-    def fazer_login(self, usuario=None, senha=None):
+    def iniciar_navegador_em_segundo_plano(self):
+        """
+        Abre o navegador e a página de login (ou testa a sessão salva) em uma
+        thread, enquanto o usuário escolhe o modo e digita as credenciais.
+        fazer_login aguarda a thread apenas quando precisa do navegador
+        """
+        self._preparacao_navegador = threading.Thread(
+            target=self._preparar_navegador, name="preparacao-navegador", daemon=True
+        )
+        self._preparacao_navegador.start()
+    
+    def _preparar_navegador(self):
+        """Corpo da thread de preparação: navegador, sessão salva e página de login"""
+        self._navegador_pronto = self.inicializar_navegador()
+        if not self._navegador_pronto:
+            return
+        if self._tem_sessao_salva():
+            self._sessao_restaurada = self._restaurar_sessao()
+        if not self._sessao_restaurada:
+            try:
+                self._abrir_pagina_login()
+                self._pagina_login_pronta = True
+            except Exception:
+                self._pagina_login_pronta = False  # fazer_login tenta de novo
+    
+    def aguardar_navegador(self):
+        """
+        Aguarda a thread de preparação, se houver
+        Returns:
+            bool: True se o navegador está aberto
+        """
+        if self._preparacao_navegador is not None:
+            self._preparacao_navegador.join()
+            self._preparacao_navegador = None
+            return self._navegador_pronto
+        return self.driver is not None
+    
+    def _tem_sessao_salva(self):
+        """Indica se há cookies ou perfil dedicado para tentar reaproveitar a sessão"""
+        return bool(self.diretorio_perfil) or (bool(self.arquivo_sessao) and os.path.exists(self.arquivo_sessao))
+    
+    def _abrir_pagina_login(self):
+        """Abre /professor e aguarda o campo de usuário"""
+        print("[INFO] Acessando o sistema Galileu EC2...")
+        self.driver.get(f"{self.url_base}/professor")
+        WebDriverWait(self.driver, 10).until(
+            EC.presence_of_element_located((By.ID, "identity"))
+        )
+    
+    @medir_fase("login")
+    def fazer_login(self, usuario=None, senha=None, perguntar=True):
         """
         Realiza login no sistema Galileu EC2
         Args:
             usuario (str): Nome de usuário (se None, solicita input)
             senha (str): Senha (se None, solicita input)
+            perguntar (bool): Se False, credenciais ausentes são um erro (modo lote)
         Returns:
             bool: True se login realizado com sucesso
         """
         try:
-            print("[INFO] Acessando o sistema Galileu EC2...")
-            self.driver.get("https://ec2galileu.com.br/professor")
+            em_preparacao = self._preparacao_navegador is not None
             
-            # Aguarda a página carregar
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "identity"))
-            )
+            # Reaproveita a sessão da execução anterior, se ainda for válida. Com o
+            # navegador em preparação, a verificação da sessão termina antes das perguntas
+            if em_preparacao:
+                if self._tem_sessao_salva() and not self.aguardar_navegador():
+                    return False
+                restaurada = self._sessao_restaurada
+            else:
+                restaurada = self._restaurar_sessao()
+            if restaurada:
+                print("[OK] Sessão anterior reaproveitada - login não necessário!")
+                return True
+            
+            if not em_preparacao:
+                self._abrir_pagina_login()
             
             # Solicita credenciais se não fornecidas
+            if not perguntar and not (usuario and senha):
+                print("[ERRO] Sessão salva inválida e GALILEU_USUARIO/GALILEU_SENHA não definidos")
+                return False
             if not usuario:
                 usuario = input("[INPUT] Digite seu usuário: ")
             if not senha:
@@ -120,6 +796,13 @@ class AutomacaoNotasGalileu:
                 print("[INFO] A senha não aparecerá na tela enquanto você digita (isso é normal para segurança)")
                 senha = getpass.getpass("[INPUT] Digite sua senha: ")
             
+            # Navegador aberto em segundo plano durante as perguntas
+            if em_preparacao:
+                if not self.aguardar_navegador():
+                    return False
+                if not self._pagina_login_pronta:
+                    self._abrir_pagina_login()
+            
             # Preenche credenciais
             user_input = self.driver.find_element(By.ID, "identity")
             user_input.clear()
@@ -130,13 +813,15 @@ class AutomacaoNotasGalileu:
             password_input.send_keys(senha)
             
             # Clica em entrar
+            url_anterior = self.driver.current_url
             entrar_button = self.driver.find_element(By.XPATH, "//button[contains(.,' Entrar')]")
             entrar_button.click()
             
             # Verifica se login foi bem-sucedido aguardando redirecionamento
-            time.sleep(3)
+            self._aguardar_mudanca_url(url_anterior)
             if "login" not in self.driver.current_url.lower():
                 print("[OK] Login realizado com sucesso!")
+                self._salvar_sessao()
                 return True
             else:
                 print("[ERRO] Falha no login - verifique suas credenciais")
@@ -146,6 +831,75 @@ class AutomacaoNotasGalileu:
             print(f"[ERRO] Erro durante login: {e}")
             return False
     
+    def _restaurar_sessao(self):
+        """
+        Tenta reaproveitar a sessão autenticada de uma execução anterior, carregando
+        os cookies salvos (ou usando o perfil dedicado do Chrome) e abrindo
+        /professor/registro-nota para confirmar que a sessão ainda é válida
+        Returns:
+            bool: True se a sessão está válida e o login pode ser pulado
+        """
+        tem_cookies = bool(self.arquivo_sessao) and os.path.exists(self.arquivo_sessao)
+        if not tem_cookies and not self.diretorio_perfil:
+            return False
+        
+        try:
+            if tem_cookies:
+                with open(self.arquivo_sessao, encoding="utf-8") as arquivo:
+                    cookies = json.load(arquivo)
+                self._aplicar_cookies(cookies)
+            
+            print("[INFO] Verificando sessão salva...")
+            self.driver.get(f"{self.url_base}/professor/registro-nota")
+            
+            # A página decide: filtros do registro (sessão válida) ou formulário de login
+            def pagina_decidida(driver):
+                if driver.find_elements(By.ID, "id_curso"):
+                    return "registro"
+                if driver.find_elements(By.ID, "identity"):
+                    return "login"
+                return False
+            
+            pagina = WebDriverWait(self.driver, self.timeout_espera, poll_frequency=0.1).until(pagina_decidida)
+            if pagina == "registro" and "login" not in self.driver.current_url.lower():
+                return True
+        except Exception:
+            pass
+        print("[INFO] Sessão salva expirada ou inválida - será necessário fazer login")
+        return False
+    
+    def _aplicar_cookies(self, cookies):
+        """
+        Adiciona cookies ao navegador (é preciso estar no domínio do Galileu)
+        Args:
+            cookies (list): Cookies no formato retornado por driver.get_cookies()
+        """
+        self.driver.get(f"{self.url_base}/professor")
+        for cookie in cookies:
+            cookie = {chave: valor for chave, valor in cookie.items() if chave != 'sameSite'}
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception:
+                continue  # Cookie de outro domínio ou inválido
+    
+    def _salvar_sessao(self):
+        """Guarda os cookies da sessão autenticada para as próximas execuções"""
+        if not self.arquivo_sessao:
+            return
+        try:
+            # Arquivo com permissão apenas para o dono: contém o token de sessão
+            descritor = os.open(self.arquivo_sessao, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            if hasattr(os, 'fchmod'):
+                os.fchmod(descritor, 0o600)  # O modo do os.open só vale para arquivos novos
+            with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+                json.dump(self.driver.get_cookies(), arquivo)
+            print(f"[INFO] Sessão salva em: {self.arquivo_sessao}")
+        except Exception as e:
+            print(f"[AVISO] Não foi possível salvar a sessão: {e}")
+    
+    @medir_fase("acesso_registro")
     def acessar_registro_notas(self):
         """
         Navega para a página de registro de notas
@@ -154,7 +908,7 @@ class AutomacaoNotasGalileu:
         """
         try:
             print("[INFO] Acessando registro de notas...")
-            self.driver.get("https://ec2galileu.com.br/professor/registro-nota")
+            self.driver.get(f"{self.url_base}/professor/registro-nota")
             
             # Aguarda página carregar
             WebDriverWait(self.driver, 10).until(
@@ -247,18 +1001,22 @@ class AutomacaoNotasGalileu:
                 else:
                     print("[ERRO] Opção inválida. Digite 1 ou 2.")
             
-            # Selecionar curso no sistema
-            Select(self.driver.find_element(By.ID, "id_curso")).select_by_value(curso_id)
-            time.sleep(3)  # Aguarda carregamento das turmas
+            # Turmas do catálogo dispensam selecionar o curso e esperar o AJAX
+            turmas_catalogo = self._turmas_do_catalogo(curso_id)
             
             # 2. Listar e selecionar turmas disponíveis
-            print("\nTurmas disponíveis:")
-            select_turma = Select(self.driver.find_element(By.ID, "id_turma"))
-            turmas_disponiveis = []
+            if turmas_catalogo:
+                turmas_disponiveis = turmas_catalogo
+            else:
+                # Selecionar curso no sistema (aguarda carregamento das turmas)
+                self._selecionar_curso(curso_id)
+                select_turma = Select(self.driver.find_element(By.ID, "id_turma"))
+                turmas_disponiveis = []
+                for option in select_turma.options[1:]:  # Pula a primeira opção vazia
+                    turmas_disponiveis.append((option.get_attribute('value'), option.text.strip()))
             
-            for i, option in enumerate(select_turma.options[1:], 1):  # Pula a primeira opção vazia
-                turma_texto = option.text.strip()
-                turmas_disponiveis.append((option.get_attribute('value'), turma_texto))
+            print("\nTurmas disponíveis:")
+            for i, (_, turma_texto) in enumerate(turmas_disponiveis, 1):
                 print(f"{i}. {turma_texto}")
             
             while True:
@@ -266,7 +1024,10 @@ class AutomacaoNotasGalileu:
                     escolha_turma = int(input(f"\nDigite o número da turma (1-{len(turmas_disponiveis)}): "))
                     if 1 <= escolha_turma <= len(turmas_disponiveis):
                         turma_selecionada = turmas_disponiveis[escolha_turma - 1]
-                        select_turma.select_by_value(turma_selecionada[0])
+                        if turmas_catalogo:
+                            self._selecionar_curso_e_turma(curso_id, *turma_selecionada)
+                        else:
+                            self._selecionar_turma(turma_selecionada[0])
                         print(f"[OK] Selecionada: {turma_selecionada[1]}")
                         break
                     else:
@@ -274,8 +1035,6 @@ class AutomacaoNotasGalileu:
                 except ValueError:
                     print("[ERRO] Digite apenas números.")
             
-            time.sleep(3)  # Aguarda carregamento
-            
             # 3. Selecionar período
             print("\nSelecione o período:")
             print("1. 1º Trimestre")
@@ -285,173 +1044,359 @@ class AutomacaoNotasGalileu:
             while True:
                 escolha_periodo = input("\nDigite 1, 2 ou 3: ").strip()
                 if escolha_periodo in ['1', '2', '3']:
-                    Select(self.driver.find_element(By.ID, "nr_periodo")).select_by_value(escolha_periodo)
+                    self._selecionar_periodo(escolha_periodo)
                     print(f"[OK] Selecionado: {escolha_periodo}º Trimestre")
                     break
                 else:
                     print("[ERRO] Opção inválida. Digite 1, 2 ou 3.")
             
-            time.sleep(3)  # Aguarda carregamento final
             print("\n[OK] Configuração concluída com sucesso!")
             return True
             
         except Exception as e:
             print(f"[ERRO] Erro durante configuração: {e}")
             return False
+    
+    @medir_fase("filtro_curso")
+    def _selecionar_curso(self, curso_id):
         """
-        Interface amigável para configurar curso, turma e período
+        Seleciona o curso e aguarda o carregamento da lista de turmas
+        Args:
+            curso_id (str): Valor da opção em id_curso
+        """
+        self._preparar_observador_pagina()
+        Select(self.driver.find_element(By.ID, "id_curso")).select_by_value(curso_id)
+        self.curso_atual = curso_id
+        self._aguardar_opcoes_turma()
+    
+    @medir_fase("filtro_turma")
+    def _selecionar_turma(self, turma_valor):
+        """
+        Seleciona a turma e aguarda as requisições disparadas pela troca
+        Args:
+            turma_valor (str): Valor da opção em id_turma
+        """
+        self._preparar_observador_pagina()
+        Select(self.driver.find_element(By.ID, "id_turma")).select_by_value(turma_valor)
+        self.turma_atual = turma_valor
+        self._aguardar_requisicoes_concluidas()
+    
+    def _selecionar_curso_e_turma(self, curso_id, turma_valor, rotulo=None):
+        """
+        Seleciona curso e turma. Se o curso já está selecionado na página e a turma
+        está entre as opções atuais, a turma é selecionada direto, sem esperar o
+        recarregamento das turmas. Uma turma do catálogo (rótulo informado) que
+        não existe mais no site atualiza a entrada do curso no catálogo
+        Args:
+            curso_id (str): Valor da opção em id_curso
+            turma_valor (str): Valor da opção em id_turma
+            rotulo (str): Texto da turma no catálogo (None = turma fora do catálogo)
+        """
+        try:
+            disponivel = self.driver.execute_script(JS_TURMA_DISPONIVEL, curso_id, turma_valor)
+        except Exception:
+            disponivel = False
+        if disponivel:
+            self.curso_atual = curso_id
+            self._selecionar_turma(turma_valor)
+            return
+        
+        self._selecionar_curso(curso_id)
+        turmas = self.driver.execute_script(JS_LER_OPCOES, "id_turma") or []
+        if turma_valor not in [valor for valor, _ in turmas]:
+            if rotulo is not None:
+                print(f"[AVISO] Turma '{rotulo}' não existe mais no site; atualizando o catálogo do curso...")
+                self._atualizar_turmas_catalogo(curso_id, turmas)
+            raise ValueError(f"turma '{rotulo or turma_valor}' não existe mais no curso {curso_id}")
+        self._selecionar_turma(turma_valor)
+    
+    def _atualizar_turmas_catalogo(self, curso_id, turmas):
+        """
+        Substitui as turmas de um curso no catálogo pelas opções lidas do site e
+        grava o catálogo em disco
+        Args:
+            curso_id (str): Valor da opção em id_curso
+            turmas (list): Pares [valor, rótulo] atuais de id_turma
+        """
+        with self._trava_catalogo:
+            for curso in (self.catalogo or {}).get('cursos', []):
+                if curso['valor'] == curso_id:
+                    curso['turmas'] = [list(turma) for turma in turmas]
+                    try:
+                        self._gravar_catalogo()
+                    except Exception as e:
+                        print(f"[AVISO] Não foi possível gravar o catálogo de turmas: {e}")
+                    return
+    
+    @medir_fase("catalogo")
+    def carregar_catalogo(self, atualizar=False):
+        """
+        Carrega o catálogo de cursos e turmas do disco. Se o arquivo não existir,
+        estiver vencido (validade_catalogo_horas), for de outro endereço ou
+        atualizar=True, consulta o site e grava um catálogo novo
+        Args:
+            atualizar (bool): Ignora o arquivo em disco e consulta o site
         Returns:
-            bool: True se configuração realizada com sucesso
+            dict: {'gerado_em', 'url_base', 'cursos': [{'valor', 'rotulo', 'turmas': [[valor, rótulo]]}]}
+                  ou None se o catálogo não estiver disponível
         """
+        if self.catalogo and not atualizar:
+            return self.catalogo
+        
+        guardado = self._ler_catalogo_disco()
+        vencido = not guardado or time.time() - guardado.get('gerado_em', 0) > self.validade_catalogo_horas * 3600
+        if guardado and not vencido and not atualizar:
+            self.catalogo = guardado
+            print(f"[INFO] Catálogo de turmas carregado de {self.arquivo_catalogo}")
+            return self.catalogo
+        
         try:
-            print("\n" + "="*60)
-            print("CONFIGURACAO DE FILTROS")
-            print("="*60)
-            
-            # 1. Selecionar Curso
-            print("\nSelecione o curso:")
-            print("1. Ensino Fundamental II")
-            print("2. Ensino Médio")
-            
-            while True:
-                escolha_curso = input("\nDigite 1 ou 2: ").strip()
-                if escolha_curso == "1":
-                    curso_id = self.configuracao_curso['FUND2']
-                    print("[OK] Selecionado: Ensino Fundamental II")
-                    break
-                elif escolha_curso == "2":
-                    curso_id = self.configuracao_curso['MEDIO']
-                    print("[OK] Selecionado: Ensino Médio")
-                    break
-                else:
-                    print("[ERRO] Opção inválida. Digite 1 ou 2.")
-            
-            # Selecionar curso no sistema
-            Select(self.driver.find_element(By.ID, "id_curso")).select_by_value(curso_id)
-            time.sleep(3)  # Aguarda carregamento das turmas
-            
-            # 2. Listar e selecionar turmas disponíveis
-            print("\nTurmas disponíveis:")
-            select_turma = Select(self.driver.find_element(By.ID, "id_turma"))
-            turmas_disponiveis = []
-            
-            for i, option in enumerate(select_turma.options[1:], 1):  # Pula a primeira opção vazia
-                turma_texto = option.text.strip()
-                turmas_disponiveis.append((option.get_attribute('value'), turma_texto))
-                print(f"{i}. {turma_texto}")
-            
-            while True:
-                try:
-                    escolha_turma = int(input(f"\nDigite o número da turma (1-{len(turmas_disponiveis)}): "))
-                    if 1 <= escolha_turma <= len(turmas_disponiveis):
-                        turma_selecionada = turmas_disponiveis[escolha_turma - 1]
-                        select_turma.select_by_value(turma_selecionada[0])
-                        print(f"[OK] Selecionada: {turma_selecionada[1]}")
-                        break
-                    else:
-                        print(f"[ERRO] Número inválido. Digite entre 1 e {len(turmas_disponiveis)}.")
-                except ValueError:
-                    print("[ERRO] Digite apenas números.")
-            
-            time.sleep(3)  # Aguarda carregamento
-            
-            # 3. Selecionar período
-            print("\nSelecione o período:")
-            print("1. 1º Trimestre")
-            print("2. 2º Trimestre") 
-            print("3. 3º Trimestre")
-            
-            while True:
-                escolha_periodo = input("\nDigite 1, 2 ou 3: ").strip()
-                if escolha_periodo in ['1', '2', '3']:
-                    Select(self.driver.find_element(By.ID, "nr_periodo")).select_by_value(escolha_periodo)
-                    print(f"[OK] Selecionado: {escolha_periodo}º Trimestre")
-                    break
-                else:
-                    print("[ERRO] Opção inválida. Digite 1, 2 ou 3.")
-            
-            time.sleep(3)  # Aguarda carregamento final
-            print("\n[OK] Configuração concluída com sucesso!")
-            return True
-            
+            print("[INFO] Consultando cursos e turmas para o catálogo...")
+            cursos = self._descobrir_catalogo()
+            if not any(curso['turmas'] for curso in cursos):
+                raise RuntimeError("nenhuma turma encontrada")
+            with self._trava_catalogo:
+                self.catalogo = {'gerado_em': time.time(), 'url_base': self.url_base, 'cursos': cursos}
+                self._gravar_catalogo()
+            total_turmas = sum(len(curso['turmas']) for curso in cursos)
+            print(f"[OK] Catálogo atualizado: {len(cursos)} cursos, {total_turmas} turmas ({self.arquivo_catalogo})")
         except Exception as e:
-            print(f"[ERRO] Erro durante configuração: {e}")
-            return False
+            print(f"[AVISO] Não foi possível atualizar o catálogo de turmas: {e}")
+            self.catalogo = guardado  # Catálogo vencido ainda é melhor que nenhum
+        
+        return self.catalogo
     
-    def extrair_dados_tabela(self, forcar_sobrescrita=False):
+    def _gravar_catalogo(self):
         """
-        Extrai dados da tabela de alunos e cria planilha Excel
-        Args:
-            forcar_sobrescrita (bool): Se True, sobrescreve arquivo sem perguntar
+        Grava o catálogo em disco de forma atômica (arquivo temporário exclusivo +
+        replace). Deve ser chamado com _trava_catalogo adquirida
+        """
+        descritor, temporario = tempfile.mkstemp(
+            prefix=os.path.basename(self.arquivo_catalogo) + ".", suffix=".tmp",
+            dir=os.path.dirname(os.path.abspath(self.arquivo_catalogo)))
+        try:
+            with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+                json.dump(self.catalogo, arquivo, ensure_ascii=False, indent=2)
+            os.replace(temporario, self.arquivo_catalogo)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+    
+    def _ler_catalogo_disco(self):
+        """
+        Lê o arquivo do catálogo, se existir e for do mesmo endereço do sistema
         Returns:
-            bool: True se extração realizada com sucesso
+            dict: Catálogo ou None
         """
+        if not self.arquivo_catalogo or not os.path.exists(self.arquivo_catalogo):
+            return None
         try:
-            print("\n" + "="*60)
-            print("EXTRAINDO DADOS DA TABELA")
-            print("="*60)
-            
-            # Aguarda tabela carregar
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.ID, "gridAlunos"))
-            )
-            
-            tabela = self.driver.find_element(By.ID, "gridAlunos")
-            linhas = tabela.find_elements(By.TAG_NAME, "tr")
-            
-            dados_tabela = []
-            dados_tabela_interna = []
-            
-            print(f"[INFO] Processando {len(linhas)} linhas da tabela...")
-            
-            for i, linha in enumerate(linhas):
-                colunas = linha.find_elements(By.TAG_NAME, "td")
-                if colunas:
-                    # Nome do aluno (primeira coluna, primeira linha do texto)
-                    nome_aluno = colunas[0].text.strip().split("\n")[0]
-                    dados_linha = [nome_aluno]
-                    dados_linha_interna = [nome_aluno]
-                    
-                    # Extrai inputs das demais colunas
-                    for coluna in colunas[1:]:
-                        inputs = coluna.find_elements(By.CSS_SELECTOR, "input")
-                        if inputs:
-                            input_element = inputs[0]
-                            input_value = input_element.get_attribute("value")
-                            input_name = input_element.get_attribute("name")
-                            dados_linha.append(input_value)
-                            dados_linha_interna.append(input_name)
-                    
-                    dados_tabela.append(dados_linha)
-                    dados_tabela_interna.append(dados_linha_interna)
-                    
-                    if i % 5 == 0:  # Progresso a cada 5 linhas
-                        print(f"  [PROG] Processando linha {i+1}...")
-            
-            # Nomes das colunas
-            nomes_colunas = [
-                "Aluno", "VERIFICACAO PARCIAL", "VERIFICACAO GLOBAL", 
-                "ATIVIDADE 1", "ATIVIDADE 2", "ATIVIDADE 3", "ATIVIDADE 4", 
-                "PONTO OLIMPIADA", "MEDIA MANUAL"
-            ]
-            
-            # Criar DataFrames
-            max_cols = max(len(linha) for linha in dados_tabela)
-            colunas_usadas = nomes_colunas[:max_cols]
+            with open(self.arquivo_catalogo, encoding="utf-8") as arquivo:
+                catalogo = json.load(arquivo)
+            if catalogo.get('url_base') != self.url_base:
+                return None
+            return catalogo
+        except Exception as e:
+            print(f"[AVISO] Catálogo de turmas inválido ({e}), ele será recriado")
+            return None
+    
+    def _descobrir_catalogo(self):
+        """
+        Consulta no site os cursos disponíveis e as turmas de cada um
+        Returns:
+            list: [{'valor', 'rotulo', 'turmas': [[valor, rótulo]]}]
+        """
+        rotulos_padrao = {valor: nome for nome, valor in self.configuracao_curso.items()}
+        cursos = []
+        
+        if self.backend == 'http':
+            opcoes_curso = self.cliente_http.listar_cursos() or list(rotulos_padrao.items())
+            for valor, rotulo in opcoes_curso:
+                turmas = self.cliente_http.listar_turmas(valor)
+                cursos.append({'valor': valor, 'rotulo': rotulo, 'turmas': [list(t) for t in turmas]})
+            return cursos
+        
+        if not self.driver.find_elements(By.ID, "id_curso") and not self.acessar_registro_notas():
+            raise RuntimeError("página de registro de notas indisponível")
+        opcoes_curso = self.driver.execute_script(JS_LER_OPCOES, "id_curso") or list(rotulos_padrao.items())
+        for valor, rotulo in opcoes_curso:
+            self._selecionar_curso(valor)
+            turmas = self.driver.execute_script(JS_LER_OPCOES, "id_turma") or []
+            cursos.append({'valor': valor, 'rotulo': rotulo, 'turmas': [list(t) for t in turmas]})
+        return cursos
+    
+    def _turmas_do_catalogo(self, curso_id):
+        """
+        Turmas de um curso segundo o catálogo (carregado sob demanda)
+        Args:
+            curso_id (str): Valor da opção em id_curso
+        Returns:
+            list: Pares (valor, rótulo); vazia se o catálogo não tiver o curso
+        """
+        catalogo = self.carregar_catalogo(self.atualizar_catalogo)
+        self.atualizar_catalogo = False
+        for curso in (catalogo or {}).get('cursos', []):
+            if curso['valor'] == curso_id:
+                return [tuple(turma) for turma in curso['turmas']]
+        return []
+    
+    def _localizar_turma(self, curso, turma):
+        """
+        Resolve curso e turma informados por valor ou por nome usando o catálogo
+        Args:
+            curso (str): 'FUND2', 'MEDIO', valor de id_curso, nome do curso ou vazio
+            turma (str): Valor de id_turma ou nome da turma (completo ou parte única dele)
+        Returns:
+            tuple: (curso_id, turma_valor, rótulo da turma ou None se não estiver no catálogo)
+        """
+        curso_id = self._resolver_curso(curso) if curso else None
+        cursos = (self.catalogo or {}).get('cursos', [])
+        if curso:
+            cursos = [c for c in cursos if c['valor'] == curso_id
+                      or _normalizar_rotulo(c['rotulo']) == _normalizar_rotulo(curso)]
+        
+        candidatos = [(c['valor'], valor, rotulo) for c in cursos for valor, rotulo in c['turmas']]
+        procurado = _normalizar_rotulo(turma)
+        exatos = [t for t in candidatos if t[1] == turma]
+        if not exatos:
+            exatos = [t for t in candidatos if procurado in (_normalizar_rotulo(t[2]),
+                                                             _normalizar_rotulo(limpar_nome_turma(t[2])))]
+        if not exatos:
+            exatos = [t for t in candidatos if procurado in _normalizar_rotulo(t[2])]
+        if len(exatos) == 1:
+            return exatos[0]
+        if len(exatos) > 1:
+            raise ValueError(f"turma '{turma}' é ambígua: " + ", ".join(t[2] for t in exatos[:5]))
+        if curso_id:
+            return curso_id, turma, None  # Fora do catálogo: usa o valor informado
+        raise ValueError(f"turma '{turma}' não encontrada no catálogo e curso não informado")
+    
+    @medir_fase("filtro_periodo")
+    def _selecionar_periodo(self, periodo):
+        """
+        Seleciona o período e aguarda a tabela gridAlunos ser redesenhada
+        Args:
+            periodo (str): Valor da opção em nr_periodo ('1', '2' ou '3')
+        """
+        select_periodo = Select(self.driver.find_element(By.ID, "nr_periodo"))
+        # Reescolher o período já selecionado não dispara recarga da tabela
+        try:
+            ja_selecionado = select_periodo.first_selected_option.get_attribute('value') == periodo
+        except NoSuchElementException:
+            ja_selecionado = False
+        self._preparar_observador_pagina()
+        select_periodo.select_by_value(periodo)
+        self.periodo_atual = periodo
+        self._aguardar_grid_atualizado(exigir_mutacao=not ja_selecionado)
+    
+    def _aguardar_condicao(self, condicao, timeout=None, descricao="condição"):
+        """
+        Aguarda até que uma condição seja satisfeita, retornando assim que ela ocorrer
+        Args:
+            condicao (callable): Função que recebe o driver e retorna um valor verdadeiro
+            timeout (float): Limite máximo em segundos (padrão: self.timeout_espera)
+            descricao (str): Descrição usada na mensagem de timeout
+        Returns:
+            bool: True se a condição foi satisfeita dentro do limite
+        """
+        limite = self.timeout_espera if timeout is None else timeout
+        try:
+            WebDriverWait(self.driver, limite, poll_frequency=0.1).until(condicao)
+            return True
+        except TimeoutException:
+            print(f"   [AVISO] Tempo esgotado ({limite}s) aguardando {descricao}")
+            return False
+    
+    def _preparar_observador_pagina(self):
+        """
+        Instala na página os contadores de requisições pendentes e de mutações do DOM
+        Deve ser chamado imediatamente antes da ação que dispara o carregamento
+        """
+        self._indice_campos = None  # A ação a seguir redesenha a tabela
+        try:
+            self.driver.execute_script(JS_OBSERVAR_PAGINA)
+        except Exception as e:
+            print(f"   [AVISO] Não foi possível instalar observador da página: {e}")
+    
+    def _aguardar_opcoes_turma(self, timeout=None):
+        """
+        Aguarda o select id_turma receber as opções do curso selecionado
+        Returns:
+            bool: True se as turmas foram carregadas
+        """
+        def turmas_carregadas(driver):
+            estado = driver.execute_script(JS_ESTADO_PAGINA)
+            return estado['opcoesTurma'] > 1 and estado['pendentes'] == 0
+        
+        return self._aguardar_condicao(turmas_carregadas, timeout, "lista de turmas")
+    
+    def _aguardar_requisicoes_concluidas(self, timeout=None):
+        """
+        Aguarda não haver requisições AJAX pendentes nem modals de loading visíveis
+        Returns:
+            bool: True se a página ficou ociosa
+        """
+        def pagina_ociosa(driver):
+            estado = driver.execute_script(JS_ESTADO_PAGINA)
+            return estado['pendentes'] == 0 and not estado['carregando']
+        
+        return self._aguardar_condicao(pagina_ociosa, timeout, "requisições da página")
+    
+    def _aguardar_grid_atualizado(self, timeout=None, exigir_mutacao=True):
+        """
+        Aguarda a tabela gridAlunos ser redesenhada: houve mutação no DOM desde a
+        preparação do observador, não há requisições pendentes e o DOM está estável
+        Args:
+            exigir_mutacao (bool): Se False, basta a tabela estar presente e a página ociosa
+        Returns:
+            bool: True se a tabela está pronta para leitura
+        """
+        def grid_pronto(driver):
+            estado = driver.execute_script(JS_ESTADO_PAGINA)
+            if not estado['grid'] or estado['pendentes'] > 0 or estado['carregando']:
+                return False
+            if exigir_mutacao and estado['mutacoes'] == 0:
+                return False
+            return estado['msDesdeMutacao'] >= 200  # DOM estável
+        
+        return self._aguardar_condicao(grid_pronto, timeout, "tabela de alunos")
+    
+    def _aguardar_mudanca_url(self, url_anterior, timeout=None):
+        """
+        Aguarda a URL mudar (redirecionamento) ou uma mensagem de erro aparecer
+        Args:
+            url_anterior (str): URL antes da ação
+        Returns:
+            bool: True se a URL mudou
+        """
+        def url_mudou_ou_erro(driver):
+            return (driver.current_url != url_anterior
+                    or driver.find_elements(By.CSS_SELECTOR, ".alert-danger, .alert-error"))
+        
+        self._aguardar_condicao(url_mudou_ou_erro, timeout, "redirecionamento")
+        return self.driver.current_url != url_anterior
+    
+    def extrair_dados_tabela(self, forcar_sobrescrita=False, nome_arquivo=None):
+        """
+        Extrai dados da tabela de alunos e cria planilha Excel
+        Args:
+            forcar_sobrescrita (bool): Se True, sobrescreve arquivo sem perguntar
+            nome_arquivo (str): Caminho da planilha a criar (padrão: nome da turma)
+        Returns:
+            bool: True se extração realizada com sucesso
+        """
+        try:
+            print("\n" + "="*60)
+            print("EXTRAINDO DADOS DA TABELA")
+            print("="*60)
             
-            self.df_usuario = pd.DataFrame(dados_tabela, columns=colunas_usadas)
-            self.df_interno = pd.DataFrame(dados_tabela_interna, columns=colunas_usadas)
+            if not self._ler_tabela_alunos():
+                return False
             
             # Gerar nome do arquivo baseado na turma selecionada
-            select_turma = self.driver.find_element(By.ID, "id_turma")
-            turma_selecionada = select_turma.find_element(By.CSS_SELECTOR, "option:checked").text.strip()
-            
-            # Limpar nome para usar como arquivo
-            nome_base = re.sub(r'\d{2}/\d{2}/\d{4} a \d{2}/\d{2}/\d{4}', '', turma_selecionada)
-            nome_base = re.sub(r'[^A-Za-z0-9\s]+', '', nome_base)
-            nome_base = re.sub(r'\s+', '_', nome_base.strip())
-            
-            self.nome_arquivo_excel = f"{nome_base}_Notas_Para_Edicao.xlsx"
+            self.nome_arquivo_excel = nome_arquivo or (f"{self._nome_base_turma_selecionada()}_Notas_Para_Edicao"
+                                                       f"{extensao_formato(self.formato_planilha)}")
             
             # Verificar se arquivo já existe (apenas se não for forçar sobrescrita)
             if not forcar_sobrescrita:
@@ -467,22 +1412,148 @@ class AutomacaoNotasGalileu:
                     print("[INFO] Arquivo será sobrescrito...")
                 # Se for "criar_novo", continua normalmente
             
-            # Salvar arquivo Excel
-            caminho_completo = os.path.join(os.getcwd(), self.nome_arquivo_excel)
-            self.df_usuario.to_excel(caminho_completo, index=False)
-            
-            print(f"\n[OK] Dados extraídos com sucesso!")
-            print(f"[INFO] Arquivo criado: {self.nome_arquivo_excel}")
-            print(f"[INFO] Localização: {caminho_completo}")
-            print(f"[INFO] Total de alunos: {len(self.df_usuario)}")
-            print(f"[INFO] Colunas de notas: {len(self.df_usuario.columns) - 1}")
-            
+            self._gravar_planilha_usuario()
             return True
             
         except Exception as e:
             print(f"[ERRO] Erro ao extrair dados: {e}")
             return False
     
+    @medir_fase("excel_gravacao")
+    def _gravar_planilha_usuario(self):
+        """Salva df_usuario na planilha self.nome_arquivo_excel (formato pela extensão)"""
+        caminho_completo = os.path.join(os.getcwd(), self.nome_arquivo_excel)
+        gravar_planilha(self.df_usuario, caminho_completo, formato_planilha(caminho_completo, self.formato_planilha))
+        
+        print(f"\n[OK] Dados extraídos com sucesso!")
+        print(f"[INFO] Arquivo criado: {self.nome_arquivo_excel}")
+        print(f"[INFO] Localização: {caminho_completo}")
+        print(f"[INFO] Total de alunos: {len(self.df_usuario)}")
+        print(f"[INFO] Colunas de notas: {len(self.df_usuario.columns) - 1}")
+    
+    @medir_fase("extracao")
+    def _ler_tabela_alunos(self):
+        """
+        Lê a tabela gridAlunos e monta df_usuario (valores) e df_interno (IDs dos campos)
+        Returns:
+            bool: True se a tabela tinha alunos
+        """
+        # Aguarda tabela carregar
+        WebDriverWait(self.driver, 15).until(
+            EC.presence_of_element_located((By.ID, "gridAlunos"))
+        )
+        
+        dados_tabela, dados_tabela_interna = self._coletar_linhas_grid()
+        return self._montar_dataframes(dados_tabela, dados_tabela_interna)
+    
+    def _montar_dataframes(self, dados_tabela, dados_tabela_interna):
+        """
+        Monta df_usuario (valores) e df_interno (IDs dos campos) a partir das linhas lidas
+        Args:
+            dados_tabela (list): Linhas com nome do aluno e valores dos inputs
+            dados_tabela_interna (list): Linhas com nome do aluno e names dos inputs
+        Returns:
+            bool: True se a tabela tinha alunos
+        """
+        # Nomes das colunas
+        nomes_colunas = [
+            "Aluno", "VERIFICACAO PARCIAL", "VERIFICACAO GLOBAL", 
+            "ATIVIDADE 1", "ATIVIDADE 2", "ATIVIDADE 3", "ATIVIDADE 4", 
+            "PONTO OLIMPIADA", "MEDIA MANUAL"
+        ]
+        
+        if not dados_tabela:
+            print("[ERRO] Nenhum aluno encontrado na tabela")
+            return False
+        
+        # Criar DataFrames
+        max_cols = max(len(linha) for linha in dados_tabela)
+        colunas_usadas = nomes_colunas[:max_cols]
+        
+        self.df_usuario = pd.DataFrame(dados_tabela, columns=colunas_usadas)
+        self.df_interno = pd.DataFrame(dados_tabela_interna, columns=colunas_usadas)
+        return True
+    
+    def _nome_base_turma_selecionada(self):
+        """
+        Gera um nome de arquivo a partir do texto da turma selecionada
+        Returns:
+            str: Nome sem datas, acentos e espaços (ex.: '2025_6_ANO_A6_ANO')
+        """
+        select_turma = self.driver.find_element(By.ID, "id_turma")
+        turma_selecionada = select_turma.find_element(By.CSS_SELECTOR, "option:checked").text.strip()
+        return limpar_nome_turma(turma_selecionada)
+    
+    
+    def _coletar_linhas_grid(self):
+        """
+        Lê nomes, valores e nomes internos dos inputs da tabela gridAlunos
+        Usa uma única chamada JavaScript e, se ela falhar, recorre à leitura
+        elemento por elemento
+        Returns:
+            tuple: (dados_tabela, dados_tabela_interna)
+        """
+        self.estado_nc = {}  # Leitura elemento a elemento não consulta os checkboxes
+        if self.extracao_em_lote:
+            try:
+                linhas = self.driver.execute_script(JS_EXTRAIR_GRID)
+                if linhas:
+                    dados_tabela = [linha["valores"] for linha in linhas]
+                    dados_tabela_interna = [linha["nomes"] for linha in linhas]
+                    self.estado_nc = {
+                        id_campo: marcado
+                        for linha in linhas
+                        for id_campo, marcado in zip(linha["nomes"][1:], linha.get("nc") or [])
+                        if marcado is not None
+                    }
+                    print(f"[INFO] {len(dados_tabela)} alunos lidos em uma única chamada")
+                    return dados_tabela, dados_tabela_interna
+                print("[AVISO] Leitura rápida não retornou dados, usando leitura elemento a elemento...")
+            except Exception as e:
+                print(f"[AVISO] Leitura rápida falhou ({e}), usando leitura elemento a elemento...")
+        
+        return self._coletar_linhas_grid_por_elemento()
+    
+    def _coletar_linhas_grid_por_elemento(self):
+        """
+        Lê a tabela gridAlunos consultando cada linha, célula e input via WebDriver
+        Returns:
+            tuple: (dados_tabela, dados_tabela_interna)
+        """
+        tabela = self.driver.find_element(By.ID, "gridAlunos")
+        linhas = tabela.find_elements(By.TAG_NAME, "tr")
+        
+        dados_tabela = []
+        dados_tabela_interna = []
+        
+        print(f"[INFO] Processando {len(linhas)} linhas da tabela...")
+        
+        for i, linha in enumerate(linhas):
+            colunas = linha.find_elements(By.TAG_NAME, "td")
+            if colunas:
+                # Nome do aluno (primeira coluna, primeira linha do texto)
+                nome_aluno = colunas[0].text.strip().split("\n")[0]
+                dados_linha = [nome_aluno]
+                dados_linha_interna = [nome_aluno]
+                
+                # Extrai inputs das demais colunas
+                for coluna in colunas[1:]:
+                    inputs = coluna.find_elements(By.CSS_SELECTOR, "input")
+                    if inputs:
+                        input_element = inputs[0]
+                        input_value = input_element.get_attribute("value")
+                        input_name = input_element.get_attribute("name")
+                        dados_linha.append(input_value)
+                        dados_linha_interna.append(input_name)
+                
+                dados_tabela.append(dados_linha)
+                dados_tabela_interna.append(dados_linha_interna)
+                
+                if i % 5 == 0:  # Progresso a cada 5 linhas
+                    print(f"  [PROG] Processando linha {i+1}...")
+        
+        return dados_tabela, dados_tabela_interna
+    
     def aguardar_edicao_planilha(self):
         """
         Pausa o programa para o usuário editar a planilha
@@ -502,6 +1573,9 @@ class AutomacaoNotasGalileu:
         print("   • Não altere os nomes dos alunos")
         print("\nIMPORTANTE: Feche o Excel completamente antes de continuar!")
         
+        if self.modo_observacao:
+            return self._aguardar_salvamento_planilha()
+        
         while True:
             # Limpar o buffer do input para evitar caracteres estranhos
             sys.stdout.flush()
@@ -522,6 +1596,59 @@ class AutomacaoNotasGalileu:
                 print(f"[ERRO] Erro no input: {e}")
                 continue
     
+    def _aguardar_salvamento_planilha(self, referencia=None, exigir_fechada=True):
+        """
+        Observa a planilha até um salvamento completo (modo observação), sem perguntar
+        Args:
+            referencia (tuple): Assinatura do arquivo já tratada (padrão: a atual)
+            exigir_fechada (bool): Espera o Excel fechar o arquivo antes de continuar
+        Returns:
+            bool: True quando a planilha foi salva; False se cancelado
+        """
+        caminho_excel = os.path.join(os.getcwd(), self.nome_arquivo_excel)
+        if exigir_fechada:
+            print("\n[INFO] Modo observação: o preenchimento começa sozinho quando a planilha "
+                  "for salva e o Excel fechado (Ctrl+C cancela)")
+        try:
+            self._assinatura_planilha = aguardar_planilha_salva(
+                caminho_excel, referencia, estabilidade=self.estabilidade_observacao,
+                exigir_fechada=exigir_fechada,
+                formato=formato_planilha(caminho_excel, self.formato_planilha),
+            )
+        except KeyboardInterrupt:
+            print("\n[INFO] Operação cancelada pelo usuário.")
+            return False
+        print(f"[OK] Salvamento detectado em {time.strftime('%H:%M:%S')}, continuando...")
+        return True
+    
+    def observar_alteracoes_planilha(self):
+        """
+        Modo observação contínua: a cada novo salvamento da planilha, relê a tabela
+        do site e envia apenas os campos alterados. Termina com Ctrl+C
+        Returns:
+            int: Quantidade de salvamentos processados
+        """
+        print("\n[INFO] Observando novas alterações na planilha; cada salvamento (Ctrl+S) "
+              "é enviado ao site. Ctrl+C encerra a observação.")
+        diferencial_original = self.preenchimento_diferencial
+        self.preenchimento_diferencial = True
+        processados = 0
+        try:
+            while self._aguardar_salvamento_planilha(self._assinatura_planilha, exigir_fechada=False):
+                # A tabela do site é relida para comparar com o que já foi preenchido
+                try:
+                    if self._ler_tabela_alunos() and self.carregar_notas_editadas():
+                        self.preencher_notas_automaticamente()
+                        processados += 1
+                except Exception as e:
+                    print(f"[ERRO] Não foi possível enviar as alterações: {e}")
+                print("\n[INFO] Aguardando o próximo salvamento (Ctrl+C encerra)...")
+        finally:
+            self.preenchimento_diferencial = diferencial_original
+        print(f"[INFO] Observação encerrada ({processados} salvamentos processados).")
+        return processados
+    
+    @medir_fase("excel_leitura")
     def carregar_notas_editadas(self):
         """
         Carrega a planilha editada pelo usuário
@@ -539,34 +1666,18 @@ class AutomacaoNotasGalileu:
                 print(f"[ERRO] Arquivo não encontrado: {caminho_excel}")
                 return False
             
-            print(f"[INFO] Carregando: {self.nome_arquivo_excel}")
+            print(f"[INFO] Carregando: {self.nome_arquivo_excel}" + (f" (aba {self.aba_planilha})" if self.aba_planilha else ""))
             
             # Carregar planilha suprimindo warnings do pandas
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore")
-                notas = pd.read_excel(caminho_excel, sheet_name=0, header=None)
-            
-            # Converter floats para string com vírgula
-            total_celulas = 0
-            celulas_convertidas = 0
-            
-            for i in range(len(notas)):
-                for j in range(1, min(8, len(notas.columns))):
-                    total_celulas += 1
-                    try:
-                        valor = notas.iloc[i, j]
-                        if isinstance(valor, float) and not pd.isna(valor):
-                            notas.iloc[i, j] = str(valor).replace('.', ',')
-                            celulas_convertidas += 1
-                    except IndexError:
-                        continue
-            
-            # Processar valores especiais
-            notas = notas.replace("nan", np.nan)
+                if self.aba_planilha:
+                    notas = self._pasta_consolidada(caminho_excel).ler_aba(self.aba_planilha)
+                else:
+                    notas = ler_planilha(caminho_excel, formato_planilha(caminho_excel, self.formato_planilha))
             
-            # Transformar primeira linha em cabeçalho
-            notas.columns = notas.iloc[0]
-            self.notas = notas[1:]
+            # Números com vírgula, N/C, células vazias e cabeçalho, em todas as colunas de notas
+            self.notas, celulas_convertidas, total_celulas = normalizar_planilha_notas(notas)
             
             print(f"[OK] Planilha carregada com sucesso!")
             print(f"[INFO] Dados processados: {self.notas.shape[0]} alunos, {self.notas.shape[1]} colunas")
@@ -578,6 +1689,15 @@ class AutomacaoNotasGalileu:
             print(f"[ERRO] Erro ao carregar planilha: {e}")
             return False
     
+    def _pasta_consolidada(self, caminho):
+        """PastaConsolidada do arquivo, aberta uma única vez por execução"""
+        chave = os.path.abspath(caminho)
+        with self._trava_pastas:
+            if chave not in self._pastas_consolidadas:
+                self._pastas_consolidadas[chave] = PastaConsolidada(caminho)
+            return self._pastas_consolidadas[chave]
+    
+    @medir_fase("preenchimento")
     def preencher_notas_automaticamente(self):
         """
         Preenche automaticamente as notas no sistema
@@ -594,53 +1714,155 @@ class AutomacaoNotasGalileu:
             campos_preenchidos = 0
             campos_com_checkbox = 0
             erros = 0
+            falhas = set()  # IDs dos campos com falha no preenchimento
             
             print(f"[INFO] Processando {num_alunos} alunos...")
             print(f"[INFO] Total de campos estimados: {total_campos}")
+            
+            plano, campos_ignorados, campos_retomados = self._preparar_plano()
+            plano_filtrado = bool(campos_ignorados or campos_retomados)
+            
+            # Campos que faltam ou estão bloqueados na página são relatados sem esperar por eles
+            ausentes, bloqueados = self._campos_indisponiveis(plano)
+            indisponiveis = set(ausentes) | set(bloqueados)
+            for descricao, grupo in (("não existem ou estão bloqueados na página e não serão enviados", ausentes),
+                                     ("estão em colunas bloqueadas, sem alteração, e serão ignorados", bloqueados)):
+                if grupo:
+                    por_coluna = {}
+                    for item in plano:
+                        if item['id_campo'] in grupo:
+                            coluna = self.df_interno.columns[item['coluna']]
+                            por_coluna[coluna] = por_coluna.get(coluna, 0) + 1
+                    print(f"[AVISO] {len(grupo)} campos {descricao}: "
+                          + ", ".join(f"{coluna} ({quantidade})" for coluna, quantidade in por_coluna.items()))
+            plano_por_aluno = {}
+            for item in plano:
+                plano_por_aluno.setdefault(item['linha'], []).append(item)
+            
+            # Notas em campos com N/C marcado no site: o N/C é desmarcado antes da
+            # escrita, senão o campo continua somente leitura e é salvo como N/C
+            nc_nao_desmarcado = set()
+            ids_desmarcar = [item['id_campo'] for item in plano if item['acao'] == 'nota'
+                             and item['id_campo'] not in indisponiveis and self.estado_nc.get(item['id_campo']) is not False]
+            if ids_desmarcar:
+                resultados_desmarcar = self._desmarcar_checkboxes_nc(ids_desmarcar)
+                nc_nao_desmarcado = {id_campo for id_campo, ok in resultados_desmarcar.items() if not ok}
+                if nc_nao_desmarcado:
+                    print(f"[AVISO] {len(nc_nao_desmarcado)} checkboxes N/C não puderam ser desmarcados; "
+                          "as notas desses campos não serão escritas")
+            
+            # Envia todas as notas em poucas chamadas JavaScript
+            resultados_lote = {}
+            if self.preenchimento_em_lote:
+                notas_lote = {item['id_campo']: item['valor'] for item in plano if item['acao'] == 'nota'
+                              and item['id_campo'] not in indisponiveis and item['id_campo'] not in nc_nao_desmarcado}
+                if notas_lote:
+                    print(f"[INFO] Enviando {len(notas_lote)} notas em lote...")
+                    resultados_lote = self._preencher_notas_em_lote(notas_lote)
+                    falhas_lote = sum(1 for ok in resultados_lote.values() if not ok)
+                    print(f"[INFO] Lote concluído: {len(resultados_lote) - falhas_lote} ok, {falhas_lote} para tentar individualmente")
+            
+            # Marca todos os N/C da turma em uma única passada
+            resultados_nc = {}
+            if self.preenchimento_em_lote:
+                ids_nc = [item['id_campo'] for item in plano if item['acao'] == 'nc' and item['id_campo'] not in indisponiveis]
+                if ids_nc:
+                    print(f"[INFO] Marcando {len(ids_nc)} checkboxes N/C em lote...")
+                    resultados_nc = self._marcar_checkboxes_nc_em_lote(ids_nc)
+                    nao_marcados = [id_campo for id_campo, ok in resultados_nc.items() if not ok]
+                    if nao_marcados:
+                        print(f"[AVISO] {len(nao_marcados)} checkboxes N/C não ficaram marcados: {', '.join(nao_marcados[:10])}"
+                              + (" ..." if len(nao_marcados) > 10 else ""))
+            
             print("\n[INFO] Iniciando preenchimento...")
             
             # Loop principal de preenchimento
             for i in range(num_alunos):
+                if plano_filtrado and i not in plano_por_aluno:
+                    continue
                 nome_aluno = self.df_interno.iloc[i, 0]
                 print(f"\n[ALUNO] Processando: {nome_aluno}")
                 
-                # Percorrer colunas de notas
-                for j in range(1, len(self.df_interno.columns)):
-                    id_campo = self.df_interno.iloc[i, j]
-                    
-                    # Pular campos de média manual
-                    if "media-manual" in str(id_campo).lower():
-                        continue
+                # Percorrer campos de notas do aluno
+                for item in plano_por_aluno.get(i, []):
+                    id_campo = item['id_campo']
+                    coluna = self.df_interno.columns[item['coluna']]
                     
                     try:
-                        # Verificar se há nota para este campo
-                        if not pd.isna(self.notas.iloc[i, j]):
-                            nota = str(self.notas.iloc[i, j]).strip()
-                            
-                            # Caso especial: N/C (Não Contabilizar)
-                            if nota.upper() == "N/C":
-                                if self._marcar_checkbox_nc(id_campo):
-                                    campos_com_checkbox += 1
-                                    print(f"   [NC] N/C marcado")
+                        if item['acao'] == 'erro':
+                            raise ValueError(item['mensagem'])
+                        
+                        if id_campo in ausentes:
+                            self.diario.registrar(item, 'falha', nome_aluno, coluna, ausentes[id_campo])
+                            print(f"   [PULADO] Campo {id_campo}: {ausentes[id_campo]}")
+                            continue
+                        if id_campo in bloqueados:
+                            self.diario.registrar(item, 'ignorado', nome_aluno, coluna, bloqueados[id_campo])
+                            continue
+                        
+                        if item['acao'] == 'nota' and id_campo in nc_nao_desmarcado:
+                            erros += 1
+                            falhas.add(id_campo)
+                            self.diario.registrar(item, 'falha', nome_aluno, coluna, "checkbox N/C não pôde ser desmarcado")
+                            print(f"   [ERRO] Checkbox N/C do campo {id_campo} não pôde ser desmarcado")
+                        elif item['acao'] == 'nota':
+                            # Notas não confirmadas pelo lote são preenchidas campo a campo
+                            if resultados_lote.get(id_campo) or self._preencher_campo_nota(id_campo, item['valor']):
+                                campos_preenchidos += 1
+                                self.diario.registrar(item, 'preenchido', nome_aluno, coluna)
+                                print(f"   [NOTA] Nota: {item['valor']}")
+                            else:
+                                erros += 1
+                                falhas.add(id_campo)
+                                self.diario.registrar(item, 'falha', nome_aluno, coluna, "campo não pôde ser preenchido")
+                                print(f"   [ERRO] Campo {id_campo} não pôde ser preenchido")
+                        elif resultados_nc.get(id_campo) or self._marcar_checkbox_nc(id_campo):
+                            campos_com_checkbox += 1
+                            self.diario.registrar(item, 'nc', nome_aluno, coluna)
+                            if item['origem'] == 'N/C':
+                                print(f"   [NC] N/C marcado")
                             else:
-                                # Preencher nota normal
-                                if self._preencher_campo_nota(id_campo, nota):
-                                    campos_preenchidos += 1
-                                    print(f"   [NOTA] Nota: {nota}")
-                        else:
-                            # Célula vazia = marcar como N/C (Não Contabilizar)
-                            if self._marcar_checkbox_nc(id_campo):
-                                campos_com_checkbox += 1
                                 print(f"   [Vazio] N/C marcada")
+                        else:
+                            erros += 1
+                            falhas.add(id_campo)
+                            self.diario.registrar(item, 'falha', nome_aluno, coluna, "checkbox N/C não pôde ser marcado")
+                            print(f"   [ERRO] Checkbox N/C do campo {id_campo} não pôde ser marcado")
                                 
                     except Exception as e:
                         erros += 1
-                        print(f"   [ERRO] Erro no campo {j}: {e}")
+                        falhas.add(id_campo)
+                        self.diario.registrar(item, 'falha', nome_aluno, coluna, e)
+                        print(f"   [ERRO] Erro no campo {item['coluna']}: {e}")
                 
                 # Mostrar progresso
                 progresso = ((i + 1) / num_alunos) * 100
                 print(f"   [PROG] Progresso: {progresso:.1f}%")
             
+            # Confere no site o que foi preenchido e corrige as divergências
+            divergentes = []
+            corrigidos = 0
+            if self.verificacao_pos_preenchimento:
+                conferir = [item for item in plano if item['acao'] in ('nota', 'nc') and item['id_campo'] not in indisponiveis]
+                corrigidos_itens, divergentes = self.verificar_preenchimento(conferir)
+                corrigidos = len(corrigidos_itens)
+                # Os contadores passam a refletir o estado final da página
+                for item in corrigidos_itens:
+                    if item['id_campo'] in falhas:
+                        erros -= 1
+                        falhas.discard(item['id_campo'])
+                        if item['acao'] == 'nota':
+                            campos_preenchidos += 1
+                        else:
+                            campos_com_checkbox += 1
+                for item in divergentes:
+                    if item['id_campo'] not in falhas:
+                        erros += 1
+                        if item['acao'] == 'nota':
+                            campos_preenchidos -= 1
+                        else:
+                            campos_com_checkbox -= 1
+            
             # Relatório final
             print("\n" + "="*60)
             print("RELATORIO FINAL")
@@ -648,7 +1870,40 @@ class AutomacaoNotasGalileu:
             print(f"[OK] Campos preenchidos com notas: {campos_preenchidos}")
             print(f"[OK] Campos marcados como N/C ou falta: {campos_com_checkbox}")
             print(f"[ERRO] Erros encontrados: {erros}")
+            if self.preenchimento_diferencial:
+                print(f"[INFO] Campos sem alteração ignorados: {campos_ignorados}")
+            if self.retomar_preenchimento:
+                print(f"[INFO] Campos já concluídos em execução anterior: {campos_retomados}")
             print(f"[INFO] Total processado: {campos_preenchidos + campos_com_checkbox + erros}")
+            if ausentes:
+                print(f"[AVISO] Campos da planilha não enviados (ausentes ou bloqueados na página): {len(ausentes)}")
+            if bloqueados:
+                print(f"[INFO] Campos em colunas bloqueadas sem alteração: {len(bloqueados)}")
+            if self.verificacao_pos_preenchimento:
+                print(f"[INFO] Verificação: {corrigidos} campos corrigidos, {len(divergentes)} ainda divergentes")
+            
+            arquivo_erros = self._fechar_diario()
+            self.ultimo_relatorio = {
+                'campos_preenchidos': campos_preenchidos,
+                'campos_nc': campos_com_checkbox,
+                'campos_ignorados': campos_ignorados,
+                'campos_retomados': campos_retomados,
+                'erros': erros,
+                'corrigidos_verificacao': corrigidos,
+                'divergencias': len(divergentes),
+                'campos_ausentes': len(ausentes),
+                'campos_bloqueados': len(bloqueados),
+                'relatorio_erros': arquivo_erros,
+            }
+            if self.salvamento_automatico:
+                # Turma com campos errados não é salva sem revisão, salvo pedido explícito
+                pendencias = []
+                if erros:
+                    pendencias.append(f"{erros} campos com erro ou divergentes da planilha")
+                if ausentes:
+                    pendencias.append(f"{len(ausentes)} campos ausentes ou bloqueados na página")
+                bloqueio = " e ".join(pendencias) if pendencias and not self.salvar_com_erros else None
+                self.ultimo_relatorio['salvamento'] = self.salvar_notas_no_site(bloqueio)
             
             if erros == 0:
                 print("\n[SUCESSO] Preenchimento concluído com SUCESSO! Todas as notas foram inseridas.")
@@ -659,8 +1914,427 @@ class AutomacaoNotasGalileu:
             
         except Exception as e:
             print(f"[ERRO] Erro durante preenchimento automático: {e}")
+            print("[INFO] Os campos já concluídos estão no diário; use --retomar para continuar deste ponto.")
+            self._fechar_diario()
+            return False
+    
+    @medir_fase("salvamento")
+    def salvar_notas_no_site(self, bloqueio=None):
+        """
+        Clica em Salvar e aguarda a mensagem de confirmação ou de erro do servidor.
+        O resultado é registrado em self.salvamentos com a turma e o período
+        Args:
+            bloqueio (str): Motivo para não salvar (ex.: campos com erro); o
+                registro é gravado sem clicar em Salvar
+        Returns:
+            dict: {'curso', 'turma', 'periodo', 'sucesso', 'mensagem', 'horario'}
+        """
+        registro = self._novo_registro_salvamento()
+        if bloqueio:
+            registro['mensagem'] = f"não salvo: {bloqueio}"
+            print(f"\n[AVISO] Salvamento automático não realizado: {bloqueio}")
+            print("[INFO] Revise a página e clique em Salvar manualmente (ou use --salvar-com-erros).")
+            self.salvamentos.append(registro)
+            return registro
+        try:
+            print("\n[INFO] Salvando as notas no site...")
+            self._aguardar_loading_desaparecer()
+            if not self.driver.execute_script(JS_SALVAR_NOTAS):
+                registro['mensagem'] = "botão Salvar não encontrado ou desabilitado"
+            else:
+                confirmacao = {}
+                
+                def resposta_servidor(driver):
+                    confirmacao['valor'] = driver.execute_script(JS_CONFIRMACAO_SALVAR)
+                    return confirmacao['valor']
+                
+                if self._aguardar_condicao(resposta_servidor, self.timeout_salvamento, "confirmação do salvamento"):
+                    registro['sucesso'], registro['mensagem'] = bool(confirmacao['valor'][0]), confirmacao['valor'][1]
+                else:
+                    registro['mensagem'] = "servidor não confirmou o salvamento"
+        except Exception as e:
+            registro['mensagem'] = f"erro ao salvar: {e}"
+        
+        if registro['sucesso']:
+            print(f"[OK] Notas salvas no site: {registro['mensagem']}")
+        else:
+            print(f"[ERRO] Salvamento não confirmado: {registro['mensagem']}")
+            print("[INFO] Confira a página e clique em Salvar manualmente.")
+        self.salvamentos.append(registro)
+        return registro
+    
+    def _novo_registro_salvamento(self):
+        """Registro de salvamento da turma/período atual, ainda sem resultado"""
+        return {
+            'curso': self.curso_atual, 'turma': self.turma_atual, 'periodo': self.periodo_atual,
+            'sucesso': False, 'mensagem': None, 'horario': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+    
+    def imprimir_resumo_salvamentos(self):
+        """Mostra o resultado do salvamento automático de cada turma/período"""
+        if not self.salvamentos:
+            return
+        print("\n[INFO] Salvamentos automáticos:")
+        for registro in self.salvamentos:
+            situacao = "OK" if registro['sucesso'] else "FALHA"
+            print(f"   [{situacao}] curso {registro['curso']} / turma {registro['turma']} / "
+                  f"período {registro['periodo']}: {registro['mensagem']}")
+    
+    @medir_fase("verificacao")
+    def verificar_preenchimento(self, plano):
+        """
+        Relê de uma vez os campos do plano no site, compara com os valores
+        pretendidos e refaz apenas os divergentes, por até tentativas_verificacao
+        rodadas. O diário recebe o resultado final de cada campo corrigido ou divergente
+        Args:
+            plano (list): Itens 'nota' e 'nc' do plano de preenchimento
+        Returns:
+            tuple: (itens corrigidos na verificação, itens que continuam divergentes)
+        """
+        if not plano:
+            return [], []
+        
+        print(f"\n[INFO] Verificando {len(plano)} campos no site...")
+        divergentes = self._conferir_campos(plano)
+        pendentes_iniciais = {item['id_campo'] for item, _ in divergentes}
+        irrecuperaveis = []  # Divergências que refazer a escrita não corrige
+        
+        for tentativa in range(1, self.tentativas_verificacao + 1):
+            # Nota sob N/C marcado só é corrigida desmarcando o N/C antes de reescrever
+            sob_nc = [item['id_campo'] for item, encontrado in divergentes
+                      if item['acao'] == 'nota' and encontrado == "N/C marcado"]
+            desmarcados = self._desmarcar_checkboxes_nc(sob_nc) if sob_nc else {}
+            
+            recuperaveis = []
+            for item, encontrado in divergentes:
+                if encontrado in ("campo inexistente", "sem checkbox N/C"):
+                    irrecuperaveis.append((item, encontrado))
+                elif encontrado == "N/C marcado" and not desmarcados.get(item['id_campo']):
+                    irrecuperaveis.append((item, "N/C marcado (não foi possível desmarcar)"))
+                else:
+                    recuperaveis.append((item, encontrado))
+            divergentes = recuperaveis
+            if not divergentes:
+                break
+            print(f"[INFO] Tentativa {tentativa}: refazendo {len(divergentes)} campos divergentes...")
+            itens = [item for item, _ in divergentes]
+            notas = {item['id_campo']: item['valor'] for item in itens if item['acao'] == 'nota'}
+            ids_nc = [item['id_campo'] for item in itens if item['acao'] == 'nc']
+            if notas:
+                resultados = self._preencher_notas_em_lote(notas) if self.preenchimento_em_lote else {}
+                for id_campo, nota in notas.items():
+                    if not resultados.get(id_campo):
+                        self._preencher_campo_nota(id_campo, nota)
+            if ids_nc:
+                resultados = self._marcar_checkboxes_nc_em_lote(ids_nc) if self.preenchimento_em_lote else {}
+                for id_campo in ids_nc:
+                    if not resultados.get(id_campo):
+                        self._marcar_checkbox_nc(id_campo)
+            divergentes = self._conferir_campos(itens)
+        divergentes += irrecuperaveis
+        
+        ids_divergentes = {item['id_campo'] for item, _ in divergentes}
+        corrigidos = [item for item in plano
+                      if item['id_campo'] in pendentes_iniciais and item['id_campo'] not in ids_divergentes]
+        
+        for item in corrigidos:
+            self.diario.registrar(item, 'preenchido' if item['acao'] == 'nota' else 'nc',
+                                  self.df_interno.iloc[item['linha'], 0], self.df_interno.columns[item['coluna']])
+        for item, encontrado in divergentes:
+            self.diario.registrar(item, 'falha', self.df_interno.iloc[item['linha'], 0],
+                                  self.df_interno.columns[item['coluna']], f"valor no site após verificação: {encontrado}")
+        
+        if divergentes:
+            print(f"[AVISO] {len(divergentes)} campos continuam diferentes da planilha:")
+            for item, encontrado in divergentes[:10]:
+                esperado = item['valor'] if item['acao'] == 'nota' else "N/C"
+                print(f"   • {self.df_interno.iloc[item['linha'], 0]} / {self.df_interno.columns[item['coluna']]}: "
+                      f"esperado {esperado}, no site {encontrado}")
+            if len(divergentes) > 10:
+                print(f"   ... e mais {len(divergentes) - 10} (veja o relatório de falhas do diário)")
+        else:
+            print(f"[OK] Todos os campos conferem com a planilha ({len(corrigidos)} corrigidos na verificação)")
+        
+        return corrigidos, [item for item, _ in divergentes]
+    
+    def _conferir_campos(self, plano):
+        """
+        Lê os campos do plano em uma chamada JavaScript por lote e devolve os divergentes
+        Args:
+            plano (list): Itens 'nota' e 'nc' do plano
+        Returns:
+            list: Pares (item, descrição do valor encontrado no site)
+        """
+        lidos = {}
+        ids = [item['id_campo'] for item in plano]
+        for inicio in range(0, len(ids), self.tamanho_lote_preenchimento):
+            lote = ids[inicio:inicio + self.tamanho_lote_preenchimento]
+            try:
+                lidos.update(self.driver.execute_script(JS_LER_CAMPOS, lote) or {})
+            except Exception as e:
+                print(f"   [AVISO] Falha ao ler campos para verificação: {e}")
+        
+        divergentes = []
+        for item in plano:
+            valor, marcado = lidos.get(item['id_campo']) or (None, None)
+            if valor is None and marcado is None:
+                divergentes.append((item, "campo inexistente"))
+            elif item['acao'] == 'nota':
+                if marcado is True:
+                    divergentes.append((item, "N/C marcado"))
+                elif normalizar_nota(valor) != normalizar_nota(item['valor']):
+                    divergentes.append((item, repr(valor)))
+            elif marcado is not True:
+                divergentes.append((item, "N/C desmarcado" if marcado is False else "sem checkbox N/C"))
+        return divergentes
+    
+    def _preparar_plano(self):
+        """
+        Monta o plano de preenchimento, aplica o modo diferencial e a retomada e
+        abre o diário da turma/período (campos ignorados já ficam registrados)
+        Returns:
+            tuple: (plano, campos ignorados, campos pulados por já estarem concluídos)
+        """
+        plano = self._montar_plano_preenchimento()
+        
+        ignorados = []
+        if self.preenchimento_diferencial:
+            plano, ignorados = self._filtrar_plano_diferencial(plano)
+            print(f"[INFO] Preenchimento diferencial: {len(plano)} campos alterados, "
+                  f"{len(ignorados)} sem alteração ignorados")
+        
+        self.diario = DiarioPreenchimento(self._caminho_diario())
+        retomados = 0
+        if self.retomar_preenchimento:
+            feitos = self.diario.concluidos(plano)
+            # Concluídos no diário mas ausentes no site (ex.: navegador fechou antes
+            # de salvar) voltam para o plano
+            _, confirmados = self._filtrar_plano_diferencial([item for item in plano if item['id_campo'] in feitos])
+            ids_confirmados = {item['id_campo'] for item in confirmados}
+            plano = [item for item in plano if item['id_campo'] not in ids_confirmados]
+            retomados = len(ids_confirmados)
+            print(f"[INFO] Retomada ({self.diario.caminho}): {retomados} campos já concluídos, "
+                  f"{len(feitos) - retomados} registrados no diário mas ausentes no site, {len(plano)} a preencher")
+        
+        self.diario.abrir(
+            planilha=self.nome_arquivo_excel, curso=self.curso_atual, turma=self.turma_atual,
+            periodo=self.periodo_atual, diferencial=self.preenchimento_diferencial,
+            retomada=self.retomar_preenchimento, campos=len(plano),
+        )
+        for item in ignorados:
+            self.diario.registrar(item, 'ignorado', self.df_interno.iloc[item['linha'], 0],
+                                  self.df_interno.columns[item['coluna']])
+        
+        return plano, len(ignorados), retomados
+    
+    def _caminho_diario(self):
+        """
+        Arquivo do diário da turma/período atual (ou da planilha, se a turma não for conhecida)
+        Returns:
+            str: Caminho do .jsonl dentro de diretorio_diarios
+        """
+        partes = [str(p) for p in (self.curso_atual, self.turma_atual, self.periodo_atual) if p]
+        identificacao = "_".join(partes) if partes else Path(self.nome_arquivo_excel or "planilha").stem
+        return os.path.join(self.diretorio_diarios, f"diario_{re.sub(r'[^A-Za-z0-9_-]+', '_', identificacao)}.jsonl")
+    
+    def _fechar_diario(self):
+        """
+        Fecha o diário da execução e informa o relatório de falhas, se houver
+        Returns:
+            str: Caminho do relatório de falhas ou None
+        """
+        if self.diario is None:
+            return None
+        try:
+            arquivo_erros = self.diario.fechar()
+            if arquivo_erros:
+                print(f"[INFO] Campos com falha gravados em: {arquivo_erros}")
+            return arquivo_erros
+        except Exception as e:
+            print(f"[AVISO] Não foi possível fechar o diário de preenchimento: {e}")
+            return None
+    
+    def _montar_plano_preenchimento(self):
+        """
+        Monta a lista de operações a partir de df_interno e da planilha editada
+        Returns:
+            list: Dicionários com linha, coluna, id_campo, acao ('nota', 'nc' ou 'erro'),
+                  valor e origem de cada campo
+        """
+        plano = []
+        ids_campos = self.df_interno.to_numpy(dtype=object)
+        valores = self.notas.to_numpy(dtype=object, na_value=None)
+        
+        for i in range(ids_campos.shape[0]):
+            for j in range(1, ids_campos.shape[1]):
+                id_campo = ids_campos[i, j]
+                
+                # Pular campos de média manual
+                if "media-manual" in str(id_campo).lower():
+                    continue
+                
+                item = {'linha': i, 'coluna': j, 'id_campo': id_campo, 'valor': None, 'origem': None}
+                try:
+                    valor = valores[i, j]
+                    if valor is None or pd.isna(valor):
+                        # Célula vazia = marcar como N/C (Não Contabilizar)
+                        item.update(acao='nc', origem='vazio')
+                    elif str(valor).strip().upper() == "N/C":
+                        item.update(acao='nc', origem='N/C')
+                    else:
+                        item.update(acao='nota', valor=str(valor).strip())
+                except Exception as e:
+                    item.update(acao='erro', mensagem=str(e))
+                
+                plano.append(item)
+        
+        return plano
+    
+    def _filtrar_plano_diferencial(self, plano):
+        """
+        Mantém no plano apenas os campos cujo valor na planilha difere do que foi
+        extraído do site (df_usuario e estado_nc). Campos cujo estado N/C não foi
+        lido na extração são sempre mantidos
+        Args:
+            plano (list): Plano montado por _montar_plano_preenchimento
+        Returns:
+            tuple: (campos alterados, campos sem alteração)
+        """
+        alterados = []
+        inalterados = []
+        for item in plano:
+            id_campo = item['id_campo']
+            marcado = self.estado_nc.get(id_campo)
+            try:
+                original = self.df_usuario.iloc[item['linha'], item['coluna']]
+            except IndexError:
+                alterados.append(item)
+                continue
+            
+            if item['acao'] == 'nota':
+                inalterado = marcado is not True and normalizar_nota(item['valor']) == normalizar_nota(original)
+            elif item['acao'] == 'nc':
+                inalterado = marcado is True
+            else:
+                inalterado = False
+            
+            (inalterados if inalterado else alterados).append(item)
+        
+        return alterados, inalterados
+    
+    @medir_fase("preenchimento_notas_lote")
+    def _preencher_notas_em_lote(self, notas):
+        """
+        Preenche vários campos de nota com poucas chamadas JavaScript
+        Args:
+            notas (dict): Mapa id do campo -> nota a ser inserida
+        Returns:
+            dict: Mapa id do campo -> True se o valor foi aplicado no campo
+        """
+        resultados = {}
+        itens = list(notas.items())
+        
+        for inicio in range(0, len(itens), self.tamanho_lote_preenchimento):
+            lote = itens[inicio:inicio + self.tamanho_lote_preenchimento]
+            try:
+                with self.instrumentacao.medir_campos("nota_lote", len(lote)):
+                    resultados.update(self.driver.execute_script(JS_PREENCHER_NOTAS, lote) or {})
+            except Exception as e:
+                print(f"   [AVISO] Falha no envio em lote: {e}")
+            
+            # Campos sem resposta do navegador ficam para o preenchimento individual
+            for id_campo, _ in lote:
+                resultados.setdefault(id_campo, False)
+        
+        return resultados
+    
+    def _atualizar_indice_campos(self):
+        """
+        Garante um índice de presença atual: reaproveita o índice se a tabela não
+        foi redesenhada desde a última leitura, senão relê os IDs em uma chamada
+        Returns:
+            bool: True se o índice está disponível
+        """
+        try:
+            if self._indice_campos is not None and self.driver.execute_script(JS_INDICE_VALIDO, self._versao_indice):
+                return True
+            self._versao_indice += 1
+            indice = self.driver.execute_script(JS_INDICE_CAMPOS, self._versao_indice)
+        except Exception as e:
+            print(f"   [AVISO] Índice de campos indisponível ({e}); campos ausentes aguardarão o tempo limite")
+            indice = None
+        if not indice:
+            self._indice_campos = None
+            return False
+        self._indice_campos = set(indice['campos'])
+        self._indice_checkboxes = set(indice['checkboxes'])
+        self._indice_bloqueados = set(indice.get('bloqueados') or [])
+        return True
+    
+    def _campos_indisponiveis(self, plano):
+        """
+        Itens do plano que não podem ser aplicados na página, segundo o índice de presença
+        Args:
+            plano (list): Itens do plano de preenchimento
+        Returns:
+            tuple: (ausentes, bloqueados), dicionários id do campo -> motivo (vazios se o
+                   índice não estiver disponível). Veja _classificar_indisponiveis
+        """
+        if not self._atualizar_indice_campos():
+            return {}, {}
+        return self._classificar_indisponiveis(plano, self._indice_campos,
+                                               self._indice_checkboxes, self._indice_bloqueados)
+    
+    def _classificar_indisponiveis(self, plano, campos, checkboxes, bloqueados):
+        """
+        Separa os itens do plano cujo elemento falta ou está desabilitado na página.
+        Se o item não muda o que está no site (coluna bloqueada com o mesmo valor,
+        célula vazia em coluna sem checkbox N/C) ele é apenas ignorado; senão a nota
+        ou o N/C da planilha se perderia e o item conta como ausente
+        Args:
+            plano (list): Itens do plano de preenchimento
+            campos (set): IDs dos inputs de nota presentes
+            checkboxes (set): IDs dos checkboxes chk-nc-* presentes
+            bloqueados (set): IDs dos inputs e checkboxes desabilitados
+        Returns:
+            tuple: (ausentes, bloqueados), dicionários id do campo -> motivo
+        """
+        ausentes, ignorados = {}, {}
+        for item in plano:
+            if item['acao'] not in ('nota', 'nc'):
+                continue
+            id_campo = item['id_campo']
+            id_checkbox = f"chk-nc-{str(id_campo).lower()}"
+            if id_campo not in campos:
+                ausentes[id_campo] = "campo ausente na página"
+                continue
+            if item['acao'] == 'nc' and id_checkbox not in checkboxes:
+                motivo = "coluna sem checkbox N/C"
+            elif (id_campo if item['acao'] == 'nota' else id_checkbox) in bloqueados:
+                motivo = "coluna bloqueada no site"
+            else:
+                continue
+            (ignorados if self._item_sem_alteracao(item) else ausentes)[id_campo] = motivo
+        return ausentes, ignorados
+    
+    def _item_sem_alteracao(self, item):
+        """
+        Indica se o item mantém o que foi extraído do site (df_usuario e estado_nc)
+        Args:
+            item (dict): Item do plano de preenchimento
+        Returns:
+            bool: True se aplicar o item não mudaria o campo
+        """
+        marcado = self.estado_nc.get(item['id_campo'])
+        try:
+            original = self.df_usuario.iloc[item['linha'], item['coluna']]
+        except (AttributeError, IndexError):
             return False
+        if item['acao'] == 'nota':
+            return marcado is not True and normalizar_nota(item['valor']) == normalizar_nota(original)
+        return marcado is True or (item['origem'] == 'vazio' and normalizar_nota(original) == '')
     
+    @medir_campo("nota")
     def _preencher_campo_nota(self, id_campo, nota):
         """
         Preenche um campo específico com uma nota
@@ -670,6 +2344,8 @@ class AutomacaoNotasGalileu:
         Returns:
             bool: True se preenchido com sucesso
         """
+        if self._indice_campos is not None and id_campo not in self._indice_campos:
+            return False  # Ausente da tabela: não espera pelo elemento
         try:
             wait = WebDriverWait(self.driver, 5)
             campo = wait.until(EC.presence_of_element_located((By.ID, id_campo)))
@@ -692,214 +2368,7 @@ class AutomacaoNotasGalileu:
         except Exception:
             return False
     
-    # def _marcar_checkbox_nc(self, id_campo):
-    #     """
-    #     Marca checkbox de 'Não Compareceu' para um campo
-    #     Args:
-    #         id_campo (str): ID do campo base
-    #     Returns:
-    #         bool: True se marcado com sucesso
-    #     """
-    #     try:
-    #         id_checkbox = f"chk-nc-{id_campo.lower()}"
-    #         wait = WebDriverWait(self.driver, 5)
-    #         checkbox = wait.until(EC.presence_of_element_located((By.ID, id_checkbox)))
-            
-    #         # Verificar se está habilitado e se já está marcado
-    #         if not checkbox.is_enabled():
-    #             return False
-    #         if checkbox.is_selected():
-    #             return True
-            
-    #         # PASSO 1: Aguardar que modals de loading desapareçam
-    #         self._aguardar_loading_desaparecer()
-            
-    #         # PASSO 2: Estratégia rápida - JavaScript direto (mais eficiente)
-    #         try:
-    #             success = self.driver.execute_script("""
-    #                 var checkbox = arguments[0];
-    #                 var btnSalvar = document.getElementById('btnSalvar');
-    #                 var modals = document.querySelectorAll('.modal.show, .dialog-loading.show');
-                    
-    #                 // Se há modals visíveis, aguardar um pouco
-    #                 if (modals.length > 0) {
-    #                     return false;
-    #                 }
-                    
-    #                 // Verificar se botão salvar está na frente
-    #                 var checkboxRect = checkbox.getBoundingClientRect();
-    #                 var elementAtPoint = document.elementFromPoint(
-    #                     checkboxRect.left + checkboxRect.width/2, 
-    #                     checkboxRect.top + checkboxRect.height/2
-    #                 );
-                    
-    #                 // Se o checkbox não está acessível, tentar rolar
-    #                 if (elementAtPoint !== checkbox) {
-    #                     checkbox.scrollIntoView({block: 'center', behavior: 'instant'});
-    #                     // Aguardar um frame
-    #                     return false;
-    #                 }
-                    
-    #                 // Marcar o checkbox e disparar eventos
-    #                 checkbox.checked = true;
-    #                 checkbox.dispatchEvent(new Event('change', { bubbles: true }));
-    #                 checkbox.dispatchEvent(new Event('click', { bubbles: true }));
-                    
-    #                 // Executar função onclick se existir
-    #                 if (checkbox.onclick) {
-    #                     checkbox.onclick.call(checkbox);
-    #                 }
-                    
-    #                 return true;
-    #             """, checkbox)
-                
-    #             if success:
-    #                 return True
-    #             else:
-    #                 time.sleep(0.3)  # Aguardar um pouco se não conseguiu na primeira
-                    
-    #         except Exception as e1:
-    #             print(f"   [DEBUG] JavaScript direto falhou: {e1}")
-            
-    #         # PASSO 3: Aguardar que elementos interferentes saiam do caminho
-    #         try:
-    #             # Aguardar especificamente que não há sobreposição
-    #             wait.until(lambda driver: self._elemento_esta_livre_para_clique(checkbox))
-                
-    #             # Tentar clique normal
-    #             checkbox.click()
-    #             return True
-                
-    #         except Exception as e2:
-    #             print(f"   [DEBUG] Clique direto falhou: {e2}")
-            
-    #         # PASSO 4: ActionChains otimizado (estratégia que funcionou para você)
-    #         try:
-    #             from selenium.webdriver.common.action_chains import ActionChains
-                
-    #             # Garantir que o elemento está no viewport
-    #             self.driver.execute_script("""
-    #                 arguments[0].scrollIntoView({
-    #                     block: 'center', 
-    #                     inline: 'center',
-    #                     behavior: 'instant'
-    #                 });
-    #             """, checkbox)
-                
-    #             time.sleep(0.2)  # Aguardar rolagem
-                
-    #             # Usar ActionChains com offset para evitar elementos sobrepostos
-    #             actions = ActionChains(self.driver)
-    #             actions.move_to_element_with_offset(checkbox, -3, -3).click().perform()
-                
-    #             # Verificar se foi marcado
-    #             time.sleep(0.1)
-    #             if checkbox.is_selected():
-    #                 return True
-                    
-    #         except Exception as e3:
-    #             print(f"   [DEBUG] ActionChains falhou: {e3}")
-            
-    #         # PASSO 5: Última tentativa - força via JavaScript
-    #         try:
-    #             self.driver.execute_script("""
-    #                 var checkbox = arguments[0];
-                    
-    #                 // Forçar marcação
-    #                 checkbox.checked = true;
-                    
-    #                 // Disparar todos os eventos possíveis
-    #                 ['change', 'click', 'input'].forEach(function(eventType) {
-    #                     var event = new Event(eventType, { bubbles: true, cancelable: true });
-    #                     checkbox.dispatchEvent(event);
-    #                 });
-                    
-    #                 // Se há função ativaNC (baseado no onclick), tentar executar
-    #                 if (window.ativaNC && typeof window.ativaNC === 'function') {
-    #                     var fieldId = checkbox.id.replace('chk-nc-', '');
-    #                     window.ativaNC(checkbox, fieldId);
-    #                 }
-    #             """, checkbox)
-                
-    #             return checkbox.is_selected()
-                
-    #         except Exception as e4:
-    #             print(f"   [DEBUG] JavaScript força falhou: {e4}")
-            
-    #         return False
-            
-    #     except (NoSuchElementException, TimeoutException) as e:
-    #         print(f"   [DEBUG] Elemento não encontrado {id_campo}: {e}")
-    #         return False
-    #     except Exception as e:
-    #         print(f"   [DEBUG] Erro geral ao marcar checkbox {id_campo}: {e}")
-    #         return False
-
-    # def _aguardar_loading_desaparecer(self, timeout=10):
-    #     """
-    #     Aguarda que modals de loading desapareçam
-    #     """
-    #     try:
-    #         # Aguardar que modals de loading não estejam mais visíveis
-    #         wait = WebDriverWait(self.driver, timeout)
-    #         wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".modal.dialog-loading.show")))
-            
-    #         # Aguardar também outros possíveis loaders
-    #         try:
-    #             wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".bootbox.modal.show")))
-    #         except:
-    #             pass  # Se não existe, tudo bem
-                
-    #     except TimeoutException:
-    #         print("   [DEBUG] Timeout aguardando loading desaparecer")
-    #     except Exception as e:
-    #         print(f"   [DEBUG] Erro aguardando loading: {e}")
-
-    # def _elemento_esta_livre_para_clique(self, elemento):
-    #     """
-    #     Verifica se um elemento está livre para receber clique
-    #     """
-    #     try:
-    #         # Verificar se há modals na frente
-    #         modals_visiveis = self.driver.execute_script("""
-    #             var modals = document.querySelectorAll('.modal.show, .dialog-loading.show, .bootbox.show');
-    #             return Array.from(modals).some(modal => 
-    #                 window.getComputedStyle(modal).display !== 'none' &&
-    #                 window.getComputedStyle(modal).visibility !== 'hidden'
-    #             );
-    #         """)
-            
-    #         if modals_visiveis:
-    #             return False
-            
-    #         # Verificar se o elemento está realmente clicável
-    #         rect = elemento.rect
-    #         element_at_point = self.driver.execute_script("""
-    #             var rect = arguments[0];
-    #             var centerX = rect.x + rect.width / 2;
-    #             var centerY = rect.y + rect.height / 2;
-    #             var elementAtPoint = document.elementFromPoint(centerX, centerY);
-    #             return elementAtPoint === arguments[1] || arguments[1].contains(elementAtPoint);
-    #         """, rect, elemento)
-            
-    #         return element_at_point
-            
-    #     except Exception:
-    #         return False
-
-    # def _aguardar_elemento_clicavel_rapido(self, elemento, timeout=3):
-    #     """
-    #     Versão rápida para aguardar elemento ficar clicável
-    #     """
-    #     try:
-    #         end_time = time.time() + timeout
-    #         while time.time() < end_time:
-    #             if self._elemento_esta_livre_para_clique(elemento):
-    #                 return True
-    #             time.sleep(0.1)  # Check a cada 100ms
-    #         return False
-    #     except Exception:
-    #         return False
+    @medir_campo("nc")
     def _marcar_checkbox_nc(self, id_campo):
         """
         Marca checkbox de 'Não Compareceu' para um campo
@@ -908,8 +2377,10 @@ class AutomacaoNotasGalileu:
         Returns:
             bool: True se marcado com sucesso
         """
+        id_checkbox = f"chk-nc-{id_campo.lower()}"
+        if self._indice_campos is not None and id_checkbox not in self._indice_checkboxes:
+            return False  # Campo sem checkbox N/C (ex.: atividade bloqueada)
         try:
-            id_checkbox = f"chk-nc-{id_campo.lower()}"
             wait = WebDriverWait(self.driver, 5)
             checkbox = wait.until(EC.presence_of_element_located((By.ID, id_checkbox)))
             
@@ -925,6 +2396,72 @@ class AutomacaoNotasGalileu:
         except Exception:
             return False
 
+    @medir_fase("preenchimento_nc_lote")
+    def _marcar_checkboxes_nc_em_lote(self, ids_campos):
+        """
+        Marca vários checkboxes de N/C em uma única passada no navegador
+        Args:
+            ids_campos (list): IDs dos campos base (sem o prefixo chk-nc-)
+        Returns:
+            dict: Mapa id do campo -> True se o checkbox ficou marcado
+        """
+        resultados = {}
+        
+        # Modals de loading atrapalham os cliques: aguarda uma vez por lote
+        self._aguardar_loading_desaparecer()
+        
+        for inicio in range(0, len(ids_campos), self.tamanho_lote_preenchimento):
+            lote = list(ids_campos[inicio:inicio + self.tamanho_lote_preenchimento])
+            try:
+                with self.instrumentacao.medir_campos("nc_lote", len(lote)):
+                    resultados.update(self.driver.execute_script(JS_MARCAR_NC, lote) or {})
+            except Exception as e:
+                print(f"   [AVISO] Falha ao marcar N/C em lote: {e}")
+            
+            for id_campo in lote:
+                resultados.setdefault(id_campo, False)
+        
+        return resultados
+
+    @medir_fase("desmarcar_nc")
+    def _desmarcar_checkboxes_nc(self, ids_campos):
+        """
+        Desmarca os checkboxes N/C dos campos que vão receber nota. Com o N/C
+        marcado o site deixa o campo vazio e somente leitura, e a nota não é salva
+        Args:
+            ids_campos (list): IDs dos campos base (sem o prefixo chk-nc-)
+        Returns:
+            dict: Mapa id do campo -> True se o campo ficou sem N/C marcado
+        """
+        resultados = {}
+        self._aguardar_loading_desaparecer()
+        
+        for inicio in range(0, len(ids_campos), self.tamanho_lote_preenchimento):
+            lote = list(ids_campos[inicio:inicio + self.tamanho_lote_preenchimento])
+            try:
+                resultados.update(self.driver.execute_script(JS_DESMARCAR_NC, lote) or {})
+            except Exception as e:
+                print(f"   [AVISO] Falha ao desmarcar N/C em lote: {e}")
+            
+            for id_campo in lote:
+                resultados.setdefault(id_campo, False)
+        
+        return resultados
+
+    def _aguardar_loading_desaparecer(self, timeout=10):
+        """
+        Aguarda que modals de loading desapareçam
+        """
+        try:
+            # Aguardar que modals de loading não estejam mais visíveis
+            wait = WebDriverWait(self.driver, timeout)
+            wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".modal.dialog-loading.show")))
+            
+            # Aguardar também outros possíveis loaders
+            wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".bootbox.modal.show")))
+        except TimeoutException:
+            print(f"   [AVISO] Tempo esgotado ({timeout}s) aguardando o loading desaparecer")
+
     def selecionar_modo_operacao(self):
         """
         Interface para selecionar o modo de operação
@@ -942,17 +2479,45 @@ class AutomacaoNotasGalileu:
         print("    • Extrai dados para Excel com nomes dos alunos")
         print("    • Ideal para preparar planilhas offline")
         print("    • Não preenche notas no sistema")
+        print("\n[3] EXPORTAR ESCOLA INTEIRA")
+        print("    • Gera as planilhas de todas as turmas e períodos dos cursos escolhidos")
+        print("    • Sem perguntas por turma; resumo no final")
         
         while True:
-            escolha = input("\n[INPUT] Digite 1 ou 2: ").strip()
+            escolha = input("\n[INPUT] Digite 1, 2 ou 3: ").strip()
             if escolha == "1":
                 print("[OK] Selecionado: PROCESSO COMPLETO")
                 return "completo"
             elif escolha == "2":
                 print("[OK] Selecionado: GERAR APENAS EXCEL")
                 return "apenas_excel"
+            elif escolha == "3":
+                print("[OK] Selecionado: EXPORTAR ESCOLA INTEIRA")
+                if self.cursos_exportacao is None:
+                    self.cursos_exportacao = self._perguntar_cursos_exportacao()
+                return "exportar_escola"
             else:
-                print("[ERRO] Opção inválida. Digite 1 ou 2.")
+                print("[ERRO] Opção inválida. Digite 1, 2 ou 3.")
+    
+    def _perguntar_cursos_exportacao(self):
+        """
+        Pergunta quais cursos entram na exportação completa
+        Returns:
+            list: Cursos ('FUND2', 'MEDIO') ou None para todos
+        """
+        print("\nCursos a exportar:")
+        print("1. Ensino Fundamental II")
+        print("2. Ensino Médio")
+        print("3. Todos")
+        while True:
+            escolha = input("\nDigite 1, 2 ou 3: ").strip()
+            if escolha == "1":
+                return ['FUND2']
+            elif escolha == "2":
+                return ['MEDIO']
+            elif escolha == "3":
+                return None
+            print("[ERRO] Opção inválida. Digite 1, 2 ou 3.")
     
     def processo_gerar_apenas_excel(self):
         """
@@ -961,50 +2526,198 @@ class AutomacaoNotasGalileu:
             bool: True se Excel gerado com sucesso
         """
         try:
-            print("\n" + "="*60)
-            print("MODO: GERAR APENAS EXCEL")
-            print("="*60)
-            
-            # Acessar registro de notas
-            if not self.acessar_registro_notas():
-                return False
-            
-            # Configurar filtros
-            if not self.configurar_filtros_interface_amigavel():
-                return False
-            
-            # Extrair dados e gerar Excel (sem forçar sobrescrita)
-            if not self.extrair_dados_tabela(forcar_sobrescrita=False):
-                return False
-            
-            print("\n" + "="*60)
-            print("ARQUIVO EXCEL GERADO COM SUCESSO!")
-            print("="*60)
-            print(f"[OK] Arquivo: {self.nome_arquivo_excel}")
-            print(f"[OK] Localização: {os.path.join(os.getcwd(), self.nome_arquivo_excel)}")
-            print(f"[OK] Total de alunos: {len(self.df_usuario)}")
-            print("\n[INFO] Você pode agora:")
-            print("   • Editar as notas no arquivo Excel")
-            print("   • Usar o arquivo para controle offline")
-            print("   • Executar o processo completo posteriormente")
-            
-            # Perguntar se quer gerar mais planilhas
             while True:
-                escolha = input("\n[INPUT] Deseja gerar Excel para outra turma? (s/n): ").strip().lower()
-                if escolha in ['s', 'sim', 'y', 'yes']:
-                    # Recursão para gerar outra planilha
-                    return self.processo_gerar_apenas_excel()
-                elif escolha in ['n', 'não', 'nao', 'no']:
-                    break
-                else:
+                print("\n" + "="*60)
+                print("MODO: GERAR APENAS EXCEL")
+                print("="*60)
+                
+                # Acessar registro de notas
+                if not self.acessar_registro_notas():
+                    return False
+                
+                # Configurar filtros
+                if not self.configurar_filtros_interface_amigavel():
+                    return False
+                
+                # Extrair dados e gerar Excel (sem forçar sobrescrita)
+                if not self.extrair_dados_tabela(forcar_sobrescrita=False):
+                    return False
+                
+                print("\n" + "="*60)
+                print("ARQUIVO EXCEL GERADO COM SUCESSO!")
+                print("="*60)
+                print(f"[OK] Arquivo: {self.nome_arquivo_excel}")
+                print(f"[OK] Localização: {os.path.join(os.getcwd(), self.nome_arquivo_excel)}")
+                print(f"[OK] Total de alunos: {len(self.df_usuario)}")
+                print("\n[INFO] Você pode agora:")
+                print("   • Editar as notas no arquivo Excel")
+                print("   • Usar o arquivo para controle offline")
+                print("   • Executar o processo completo posteriormente")
+                
+                # Perguntar se quer gerar mais planilhas
+                while True:
+                    escolha = input("\n[INPUT] Deseja gerar Excel para outra turma? (s/n): ").strip().lower()
+                    if escolha in ['s', 'sim', 'y', 'yes', 'n', 'não', 'nao', 'no']:
+                        break
                     print("[ERRO] Resposta inválida. Digite 's' para sim ou 'n' para não.")
-            
-            return True
+                if escolha not in ['s', 'sim', 'y', 'yes']:
+                    return True
             
         except Exception as e:
             print(f"[ERRO] Erro ao gerar arquivo Excel: {e}")
             return False
     
+    def processo_exportar_escola(self):
+        """
+        Exporta a planilha de cada turma dos cursos escolhidos (e de cada disciplina,
+        se exportar_disciplinas) em cada período, sem perguntas. Cada tabela é lida
+        uma vez; falhas são registradas e a exportação continua
+        Returns:
+            bool: True se todas as planilhas foram geradas
+        """
+        inicio = time.time()
+        print("\n" + "="*60)
+        print("MODO: EXPORTAR ESCOLA INTEIRA")
+        print("="*60)
+        
+        if not self.acessar_registro_notas():
+            return False
+        
+        catalogo = self.carregar_catalogo(self.atualizar_catalogo)
+        self.atualizar_catalogo = False
+        if not catalogo:
+            print("[ERRO] Catálogo de turmas indisponível; não é possível listar as turmas")
+            return False
+        
+        valores_cursos = None
+        if self.cursos_exportacao:
+            valores_cursos = {self._resolver_curso(curso) for curso in self.cursos_exportacao}
+        turmas = [(curso['valor'], valor, rotulo) for curso in catalogo['cursos']
+                  if valores_cursos is None or curso['valor'] in valores_cursos
+                  for valor, rotulo in curso['turmas']]
+        periodos = [str(p) for p in self.periodos_exportacao] if self.periodos_exportacao else \
+            [valor for valor, _ in self.driver.execute_script(JS_LER_OPCOES, "nr_periodo") or []] or ['1', '2', '3']
+        if not turmas:
+            print("[ERRO] Nenhuma turma encontrada para os cursos escolhidos")
+            return False
+        
+        diretorio = self.diretorio_exportacao or f"exportacao_{time.strftime('%Y%m%d')}"
+        os.makedirs(diretorio, exist_ok=True)
+        consolidada = self.exportacao_consolidada
+        if consolidada and self.formato_planilha != "xlsx":
+            print("[AVISO] A pasta consolidada só existe em xlsx; gerando um arquivo por tabela")
+            consolidada = False
+        abas, indice, usados = [], [], set()
+        print(f"[INFO] {len(turmas)} turmas x {len(periodos)} períodos"
+              + (" x disciplinas" if self.exportar_disciplinas else "") + f" -> {diretorio}")
+        
+        resultados = []
+        for numero, (curso_id, turma_valor, rotulo) in enumerate(turmas, 1):
+            print(f"\n[PROG] Turma {numero}/{len(turmas)}: {rotulo}")
+            try:
+                self._selecionar_curso_e_turma(curso_id, turma_valor, rotulo)
+                disciplinas = [(None, None)]
+                if self.exportar_disciplinas:
+                    disciplinas = [tuple(opcao) for opcao in self.driver.execute_script(JS_LER_OPCOES, "id_disciplina") or []] \
+                        or [(None, None)]
+            except Exception as e:
+                print(f"[ERRO] Não foi possível selecionar a turma {rotulo}: {e}")
+                resultados.extend({'curso': curso_id, 'turma': turma_valor, 'rotulo': rotulo, 'disciplina': None,
+                                   'periodo': periodo, 'status': 'erro', 'mensagem': str(e)} for periodo in periodos)
+                continue
+            
+            for disciplina, nome_disciplina in disciplinas:
+                for periodo in periodos:
+                    resultado = {'curso': curso_id, 'turma': turma_valor, 'rotulo': rotulo,
+                                 'disciplina': nome_disciplina, 'periodo': periodo, 'status': 'erro'}
+                    try:
+                        if disciplina is not None:
+                            self._selecionar_disciplina(disciplina)
+                        self._selecionar_periodo(periodo)
+                        partes = [limpar_nome_turma(rotulo)] + ([nome_disciplina] if nome_disciplina else []) + [f"T{periodo}"]
+                        nome = re.sub(r'[^A-Za-z0-9_-]+', '_', "_".join(partes))
+                        if consolidada:
+                            if not self._ler_tabela_alunos():
+                                raise RuntimeError("tabela sem alunos ou não lida")
+                            aba = nome_aba(nome, usados)
+                            abas.append((aba, self.df_usuario))
+                            indice.append({'Aba': aba, 'Curso': curso_id, 'Turma': turma_valor, 'Rotulo': rotulo,
+                                           'Disciplina': disciplina, 'Nome Disciplina': nome_disciplina,
+                                           'Periodo': periodo, 'Alunos': len(self.df_usuario)})
+                            resultado.update(status='ok', aba=aba, alunos=len(self.df_usuario))
+                        else:
+                            arquivo = os.path.join(diretorio, f"{nome}_Notas_Para_Edicao{extensao_formato(self.formato_planilha)}")
+                            if not self.extrair_dados_tabela(forcar_sobrescrita=True, nome_arquivo=arquivo):
+                                raise RuntimeError("tabela sem alunos ou não lida")
+                            resultado.update(status='ok', planilha=self.nome_arquivo_excel, alunos=len(self.df_usuario))
+                    except Exception as e:
+                        resultado['mensagem'] = str(e)
+                    resultados.append(resultado)
+                    concluidas = sum(1 for r in resultados if r['status'] == 'ok')
+                    print(f"[PROG] {rotulo}" + (f" / {nome_disciplina}" if nome_disciplina else "")
+                          + f" / período {periodo}: {resultado['status']} ({concluidas} planilhas geradas)")
+        
+        if consolidada and abas:
+            arquivo = os.path.join(diretorio, "Notas_Escola_Para_Edicao.xlsx")
+            with self.instrumentacao.fase("excel_gravacao", abas=len(abas)):
+                gravar_pasta_consolidada(arquivo, abas, pd.DataFrame(indice))
+            for resultado in resultados:
+                if resultado.get('aba'):
+                    resultado['planilha'] = arquivo
+            print(f"\n[OK] Pasta consolidada gravada: {arquivo} ({len(abas)} abas + Indice)")
+            print(f"[INFO] Depois de editar, preencha tudo com: --lote {arquivo}")
+        
+        return self._gravar_resumo_exportacao(resultados, time.time() - inicio, diretorio)
+    
+    @medir_fase("filtro_disciplina")
+    def _selecionar_disciplina(self, disciplina):
+        """
+        Seleciona a disciplina (id_disciplina) e aguarda a página estabilizar
+        Args:
+            disciplina (str): Valor da opção em id_disciplina
+        """
+        select_disciplina = Select(self.driver.find_element(By.ID, "id_disciplina"))
+        try:
+            if select_disciplina.first_selected_option.get_attribute('value') == disciplina:
+                return
+        except NoSuchElementException:
+            pass
+        self._preparar_observador_pagina()
+        select_disciplina.select_by_value(disciplina)
+        self._aguardar_requisicoes_concluidas()
+    
+    def _gravar_resumo_exportacao(self, resultados, duracao_total, diretorio):
+        """
+        Mostra e grava em JSON (resumo_exportacao.json no diretório) o resumo da exportação
+        Returns:
+            bool: True se todas as planilhas foram geradas
+        """
+        falhas = [r for r in resultados if r['status'] != 'ok']
+        resumo = {
+            'inicio': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(time.time() - duracao_total)),
+            'duracao_s': round(duracao_total, 2),
+            'total': len(resultados),
+            'sucessos': len(resultados) - len(falhas),
+            'falhas': len(falhas),
+            'alunos': sum(r.get('alunos', 0) for r in resultados),
+            'planilhas': resultados,
+        }
+        arquivo_resumo = os.path.join(diretorio, "resumo_exportacao.json")
+        with open(arquivo_resumo, "w", encoding="utf-8") as arquivo:
+            json.dump(resumo, arquivo, ensure_ascii=False, indent=2, default=str)
+        
+        print("\n" + "="*60)
+        print("RESUMO DA EXPORTACAO")
+        print("="*60)
+        print(f"[OK] Planilhas geradas: {resumo['sucessos']}/{resumo['total']} ({resumo['alunos']} linhas de alunos)")
+        for r in falhas:
+            print(f"[ERRO] {r['rotulo']}" + (f" / {r['disciplina']}" if r['disciplina'] else "")
+                  + f" / período {r['periodo']}: {r.get('mensagem')}")
+        print(f"[INFO] Tempo total: {duracao_total:.1f}s")
+        print(f"[INFO] Planilhas em: {os.path.abspath(diretorio)}")
+        print(f"[INFO] Resumo gravado em: {arquivo_resumo}")
+        return not falhas
+    
     def executar_processo_completo(self):
         """
         Executa o processo completo de automação
@@ -1020,21 +2733,24 @@ class AutomacaoNotasGalileu:
         print("• [MODO EXCEL] Apenas gerar planilha Excel com nomes dos alunos")
         print("\n" + "="*60)
         
-        # Etapa 1: Inicializar navegador
-        if not self.inicializar_navegador():
-            return False
+        # Etapa 1: Inicializar navegador (em segundo plano, durante as perguntas)
+        self.iniciar_navegador_em_segundo_plano()
+        
+        # Etapa 2: Selecionar modo de operação (ou o modo informado na linha de comando)
+        modo_operacao = self.modo_operacao or self.selecionar_modo_operacao()
         
-        # Etapa 2: Fazer login
+        # Etapa 3: Fazer login
         if not self.fazer_login():
             return False
         
-        # Etapa 3: Selecionar modo de operação
-        modo_operacao = self.selecionar_modo_operacao()
-        
         if modo_operacao == "apenas_excel":
             # Modo: Gerar apenas Excel
             return self.processo_gerar_apenas_excel()
         
+        if modo_operacao == "exportar_escola":
+            # Modo: Todas as turmas x períodos
+            return self.processo_exportar_escola()
+        
         else:
             # Modo: Processo completo
             while True:
@@ -1062,10 +2778,14 @@ class AutomacaoNotasGalileu:
                 if not self.preencher_notas_automaticamente():
                     return False
                 
+                if self.modo_observacao == 'continuo':
+                    self.observar_alteracoes_planilha()
+                
                 print("\n[SUCESSO] PROCESSO CONCLUIDO PARA A TURMA ATUAL!")
                 print("\nDicas:")
                 print("   • Revise as notas inseridas antes de finalizar")
-                print("   • Salve/submeta as alteracoes no sistema")
+                if not self.salvamento_automatico:
+                    print("   • Salve/submeta as alteracoes no sistema")
                 print("   • Mantenha backup da planilha Excel gerada")
                 
                 # Perguntar se quer continuar para outra turma
@@ -1073,13 +2793,453 @@ class AutomacaoNotasGalileu:
                 if escolha not in ['s', 'sim', 'y', 'yes']:
                     break
             
+            self.imprimir_resumo_salvamentos()
             print("\n[SUCESSO] TODOS OS PROCESSOS FORAM CONCLUIDOS!")
             return True
 
     
-    def finalizar(self):
-        """Finaliza o programa e fecha o navegador"""
-        if self.driver:
+    def executar_lote(self, caminho_tarefas, arquivo_resumo=None, trabalhadores=1):
+        """
+        Executa, sem perguntas no terminal, todas as tarefas de um arquivo de lote
+        As credenciais vêm de GALILEU_USUARIO e GALILEU_SENHA (ou da sessão salva)
+        Args:
+            caminho_tarefas (str): Arquivo YAML, JSON ou CSV com as tarefas
+            arquivo_resumo (str): Arquivo JSON do resumo (padrão: resumo_lote_<data>.json)
+            trabalhadores (int): Máximo de navegadores processando tarefas em paralelo
+        Returns:
+            bool: True se todas as tarefas terminaram sem erro
+        """
+        print("\n" + "="*60)
+        print("   MODO LOTE - SISTEMA DE AUTOMACAO DE NOTAS GALILEU EC2")
+        print("="*60)
+        
+        try:
+            tarefas = carregar_tarefas_lote(caminho_tarefas)
+        except Exception as e:
+            print(f"[ERRO] Arquivo de lote inválido: {e}")
+            return False
+        print(f"[INFO] {len(tarefas)} tarefas carregadas de {caminho_tarefas}")
+        
+        # No backend HTTP preencher é o próprio envio do formulário (salva no servidor)
+        if (self.backend == 'http' and not self.salvamento_automatico
+                and any(tarefa['modo'] == 'preencher' for tarefa in tarefas)):
+            print("[ERRO] Com --backend http o modo preencher salva as notas no servidor: "
+                  "use --salvar para confirmar (ou o backend navegador para revisar antes)")
+            return False
+        
+        # Sem terminal para perguntar: exige credenciais ou uma sessão salva antes de abrir o navegador
+        usuario = os.environ.get("GALILEU_USUARIO")
+        senha = os.environ.get("GALILEU_SENHA")
+        if not (usuario and senha) and not self._tem_sessao_salva():
+            print("[ERRO] Modo lote sem credenciais: defina GALILEU_USUARIO e GALILEU_SENHA "
+                  "ou informe uma sessão salva (--sessao/--perfil-dir)")
+            return False
+        
+        if self.backend == 'http':
+            if not self._login_http(perguntar=False):
+                return False
+            cookies = self.cliente_http.exportar_cookies()
+        else:
+            if not self.inicializar_navegador():
+                return False
+            if not self.fazer_login(usuario, senha, perguntar=False):
+                return False
+            cookies = self.driver.get_cookies()
+        
+        # Catálogo compartilhado pelos trabalhadores para resolver turmas sem esperar AJAX
+        self.carregar_catalogo(self.atualizar_catalogo)
+        
+        # Fila de tarefas compartilhada pelos navegadores de trabalho
+        fila = queue.Queue()
+        for indice, tarefa in enumerate(tarefas, 1):
+            fila.put((indice, tarefa))
+        
+        total_trabalhadores = max(1, min(trabalhadores, len(tarefas)))
+        resultados = []
+        estatisticas = []
+        trava = threading.Lock()
+        
+        inicio_lote = time.time()
+        if total_trabalhadores == 1:
+            self._executar_trabalhador(1, fila, len(tarefas), cookies, resultados, estatisticas, trava)
+        else:
+            print(f"[INFO] Processando com {total_trabalhadores} navegadores em paralelo...")
+            threads = [
+                threading.Thread(
+                    target=self._executar_trabalhador,
+                    args=(numero, fila, len(tarefas), cookies, resultados, estatisticas, trava),
+                    name=f"trabalhador-{numero}",
+                )
+                for numero in range(1, total_trabalhadores + 1)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        # Tarefas que sobraram na fila (todos os navegadores falharam ao abrir)
+        while not fila.empty():
+            indice, tarefa = fila.get_nowait()
+            resultados.append(dict(tarefa, indice=indice, status='erro', duracao_s=0,
+                                   mensagem='nenhum navegador disponível para a tarefa'))
+        
+        resultados.sort(key=lambda r: r['indice'])
+        estatisticas.sort(key=lambda e: e['trabalhador'])
+        return self._gravar_resumo_lote(resultados, time.time() - inicio_lote, arquivo_resumo, estatisticas)
+    
+    def _executar_trabalhador(self, numero, fila, total_tarefas, cookies, resultados, estatisticas, trava):
+        """
+        Consome tarefas da fila com um navegador próprio. O trabalhador 1 usa o
+        navegador já autenticado; os demais abrem outro navegador e recebem os
+        cookies da mesma sessão, sem novo login
+        Args:
+            numero (int): Número do trabalhador
+            fila (queue.Queue): Fila de pares (índice, tarefa)
+            total_tarefas (int): Total de tarefas do lote (para as mensagens)
+            cookies (list): Cookies da sessão autenticada
+            resultados (list): Lista compartilhada onde os resultados são acumulados
+            estatisticas (list): Lista compartilhada com o resumo de cada trabalhador
+            trava (threading.Lock): Protege as listas compartilhadas
+        """
+        inicio = time.time()
+        resumo = {'trabalhador': numero, 'tarefas': 0, 'sucessos': 0, 'duracao_s': 0.0}
+        trabalhador = self if numero == 1 else self._criar_trabalhador()
+        
+        try:
+            if trabalhador is not self and trabalhador.backend == 'http':
+                trabalhador.cliente_http = ClienteGalileuHTTP(trabalhador.url_base)
+                trabalhador.cliente_http.importar_cookies(cookies)
+            elif trabalhador is not self:
+                if not trabalhador.inicializar_navegador():
+                    resumo['mensagem'] = 'navegador não iniciou'
+                    return
+                trabalhador._aplicar_cookies(cookies)
+            
+            while True:
+                try:
+                    indice, tarefa = fila.get_nowait()
+                except queue.Empty:
+                    break
+                
+                print(f"\n[LOTE] Trabalhador {numero} - tarefa {indice}/{total_tarefas}: {tarefa['modo']} - "
+                      f"curso {tarefa['curso']}, turma {tarefa['turma']}, {tarefa['periodo']}º trimestre")
+                resultado = trabalhador._processar_tarefa(tarefa)
+                resultado.update(indice=indice, trabalhador=numero)
+                print(f"[LOTE] Tarefa {indice}: {resultado['status'].upper()} em {resultado['duracao_s']:.1f}s")
+                
+                with trava:
+                    resultados.append(resultado)
+                resumo['tarefas'] += 1
+                resumo['sucessos'] += resultado['status'] == 'ok'
+        finally:
+            if trabalhador is not self and trabalhador.driver:
+                trabalhador.driver.quit()
+            resumo['duracao_s'] = round(time.time() - inicio, 2)
+            with trava:
+                estatisticas.append(resumo)
+    
+    def _criar_trabalhador(self):
+        """
+        Cria outra instância com a mesma configuração, sem navegador e sem dados de
+        turma. Perfil dedicado e arquivo de sessão não são compartilhados: o Chrome
+        não permite dois navegadores no mesmo diretório de perfil
+        Returns:
+            AutomacaoNotasGalileu: Nova instância pronta para inicializar_navegador()
+        """
+        trabalhador = copy.copy(self)
+        trabalhador.driver = None
+        trabalhador.cliente_http = None
+        trabalhador.df_usuario = None
+        trabalhador.df_interno = None
+        trabalhador.estado_nc = {}
+        trabalhador.diario = None
+        trabalhador.notas = None
+        trabalhador.nome_arquivo_excel = None
+        trabalhador.ultimo_relatorio = None
+        trabalhador.curso_atual = None
+        trabalhador.turma_atual = None
+        trabalhador.periodo_atual = None
+        trabalhador.diretorio_perfil = None
+        trabalhador.arquivo_sessao = None
+        trabalhador.salvamentos = []
+        trabalhador._preparacao_navegador = None
+        trabalhador._indice_campos = None
+        trabalhador._recarregar_registro = True
+        return trabalhador
+    
+    @medir_fase("tarefa_lote")
+    def _processar_tarefa(self, tarefa):
+        """
+        Executa uma tarefa do lote (extração ou preenchimento de uma turma/período)
+        Args:
+            tarefa (dict): Tarefa normalizada por carregar_tarefas_lote
+        Returns:
+            dict: Resultado da tarefa (status, mensagem, duração, planilha e relatório)
+        """
+        inicio = time.time()
+        resultado = dict(tarefa, status='erro', mensagem='', alunos=0, relatorio=None)
+        try:
+            if self.backend == 'http':
+                self._processar_tarefa_http(tarefa, resultado)
+            else:
+                self._processar_tarefa_navegador(tarefa, resultado)
+            
+            resultado['alunos'] = len(self.df_usuario)
+            resultado['status'] = 'ok'
+        except Exception as e:
+            resultado['mensagem'] = str(e)
+            print(f"[ERRO] Tarefa falhou: {e}")
+        # Depois de uma falha a página pode estar em estado desconhecido
+        self._recarregar_registro = resultado['status'] != 'ok'
+        
+        resultado['duracao_s'] = round(time.time() - inicio, 2)
+        return resultado
+    
+    def _processar_tarefa_navegador(self, tarefa, resultado):
+        """
+        Executa uma tarefa do lote pelo navegador (filtros, extração ou preenchimento)
+        Args:
+            tarefa (dict): Tarefa normalizada por carregar_tarefas_lote
+            resultado (dict): Resultado da tarefa, atualizado com planilha e relatório
+        """
+        # A página da tarefa anterior é reaproveitada: com o curso já selecionado, a
+        # turma é escolhida direto, sem esperar o recarregamento das turmas
+        if self._recarregar_registro or not self.driver.find_elements(By.ID, "id_curso"):
+            if not self.acessar_registro_notas():
+                raise RuntimeError("página de registro de notas indisponível")
+        
+        self._selecionar_curso_e_turma(*self._localizar_turma(tarefa['curso'], tarefa['turma']))
+        if tarefa.get('disciplina'):
+            self._selecionar_disciplina(tarefa['disciplina'])
+        self._selecionar_periodo(tarefa['periodo'])
+        
+        if tarefa['modo'] == 'extrair':
+            if not self.extrair_dados_tabela(forcar_sobrescrita=True, nome_arquivo=tarefa['planilha']):
+                raise RuntimeError("falha na extração da tabela")
+            resultado['planilha'] = self.nome_arquivo_excel
+            return
+        
+        if not tarefa['planilha'] or not os.path.exists(tarefa['planilha']):
+            raise FileNotFoundError(f"planilha não encontrada: {tarefa['planilha']}")
+        if not self._ler_tabela_alunos():
+            raise RuntimeError("falha na leitura da tabela")
+        self.nome_arquivo_excel = tarefa['planilha']
+        self.aba_planilha = tarefa.get('aba')
+        if not self.carregar_notas_editadas():
+            raise RuntimeError("falha ao carregar a planilha")
+        if not self.preencher_notas_automaticamente():
+            raise RuntimeError("falha no preenchimento")
+        resultado['relatorio'] = self.ultimo_relatorio
+    
+    @medir_fase("login")
+    def _login_http(self, perguntar=True):
+        """
+        Autentica o backend HTTP: reaproveita os cookies do arquivo de sessão se
+        ainda forem válidos; senão usa GALILEU_USUARIO/GALILEU_SENHA ou pergunta
+        Args:
+            perguntar (bool): Se False, credenciais ausentes são um erro (modo lote)
+        Returns:
+            bool: True se autenticado
+        """
+        if ClienteGalileuHTTP is None:
+            print("[ERRO] Backend HTTP indisponível: instale o pacote 'requests'")
+            return False
+        
+        self.cliente_http = ClienteGalileuHTTP(self.url_base)
+        try:
+            if self.arquivo_sessao and os.path.exists(self.arquivo_sessao):
+                with open(self.arquivo_sessao, encoding="utf-8") as arquivo:
+                    self.cliente_http.importar_cookies(json.load(arquivo))
+                if self.cliente_http.sessao_valida():
+                    print("[OK] Sessão anterior reaproveitada - login não necessário!")
+                    return True
+            
+            usuario = os.environ.get("GALILEU_USUARIO")
+            senha = os.environ.get("GALILEU_SENHA")
+            if not perguntar and not (usuario and senha):
+                print("[ERRO] Sessão salva inválida e GALILEU_USUARIO/GALILEU_SENHA não definidos")
+                return False
+            if not usuario:
+                usuario = input("[INPUT] Digite seu usuário: ")
+            if not senha:
+                import getpass
+                senha = getpass.getpass("[INPUT] Digite sua senha: ")
+            
+            print("[INFO] Fazendo login via HTTP...")
+            if not self.cliente_http.login(usuario, senha):
+                print("[ERRO] Falha no login - verifique suas credenciais")
+                return False
+            print("[OK] Login realizado com sucesso!")
+            return True
+        except Exception as e:
+            print(f"[ERRO] Erro durante login HTTP: {e}")
+            return False
+    
+    def _processar_tarefa_http(self, tarefa, resultado):
+        """
+        Executa uma tarefa do lote pelo backend HTTP, sem navegador. No modo
+        preencher as notas são enviadas diretamente ao servidor (equivale a
+        preencher e clicar em Salvar, exige --salvar). Como no navegador, a turma
+        não é enviada se houver erros no plano ou campos ausentes na página
+        Args:
+            tarefa (dict): Tarefa normalizada por carregar_tarefas_lote
+            resultado (dict): Resultado da tarefa, atualizado com planilha e relatório
+        """
+        if tarefa.get('disciplina'):
+            raise ValueError("a escolha de disciplina só é suportada pelo backend navegador")
+        curso_id, turma_valor, rotulo = self._localizar_turma(tarefa['curso'], tarefa['turma'])
+        with self.instrumentacao.fase("extracao"):
+            dados_tabela, dados_tabela_interna = self.cliente_http.carregar_grid(curso_id, turma_valor, tarefa['periodo'])
+        if not self._montar_dataframes(dados_tabela, dados_tabela_interna):
+            raise RuntimeError("tabela de alunos vazia")
+        self.estado_nc = self.cliente_http.ultima_pagina.marcacoes_nc()
+        self.curso_atual, self.turma_atual, self.periodo_atual = curso_id, turma_valor, tarefa['periodo']
+        
+        if tarefa['modo'] == 'extrair':
+            nome_arquivo = tarefa['planilha']
+            if not nome_arquivo:
+                if rotulo is None:
+                    rotulo = dict(self.cliente_http.listar_turmas(curso_id)).get(turma_valor, turma_valor)
+                nome_arquivo = f"{limpar_nome_turma(rotulo)}_Notas_Para_Edicao{extensao_formato(self.formato_planilha)}"
+            self.nome_arquivo_excel = nome_arquivo
+            self._gravar_planilha_usuario()
+            resultado['planilha'] = self.nome_arquivo_excel
+            return
+        
+        if not tarefa['planilha'] or not os.path.exists(tarefa['planilha']):
+            raise FileNotFoundError(f"planilha não encontrada: {tarefa['planilha']}")
+        self.nome_arquivo_excel = tarefa['planilha']
+        self.aba_planilha = tarefa.get('aba')
+        if not self.carregar_notas_editadas():
+            raise RuntimeError("falha ao carregar a planilha")
+        
+        plano, campos_ignorados, campos_retomados = self._preparar_plano()
+        ausentes, bloqueados = self._classificar_indisponiveis(plano, *self.cliente_http.ultima_pagina.indice_campos())
+        erros_plano = [item for item in plano if item['acao'] == 'erro']
+        
+        # Mesmo critério do salvamento automático no navegador
+        pendencias = []
+        if erros_plano:
+            pendencias.append(f"{len(erros_plano)} campos com erro na planilha")
+        if ausentes:
+            pendencias.append(f"{len(ausentes)} campos ausentes ou bloqueados na página")
+        bloqueio = " e ".join(pendencias) if pendencias and not self.salvar_com_erros else None
+        
+        indisponiveis = set(ausentes) | set(bloqueados)
+        notas = {item['id_campo']: item['valor'] for item in plano
+                 if item['acao'] == 'nota' and item['id_campo'] not in indisponiveis}
+        ids_nc = [item['id_campo'] for item in plano if item['acao'] == 'nc' and item['id_campo'] not in indisponiveis]
+        envio = {'sucesso': False, 'mensagem': None, 'resultados': {}}
+        if bloqueio:
+            registro = self.salvar_notas_no_site(bloqueio)
+        else:
+            print(f"[INFO] Enviando {len(notas)} notas e {len(ids_nc)} N/C via HTTP...")
+            try:
+                with self.instrumentacao.fase("envio_http"):
+                    with self.instrumentacao.medir_campos("campo_http", len(notas) + len(ids_nc)):
+                        envio = self.cliente_http.enviar_notas(notas, ids_nc)
+            except Exception:
+                self._fechar_diario()
+                raise
+            registro = self._novo_registro_salvamento()
+            registro['sucesso'], registro['mensagem'] = envio['sucesso'], envio['mensagem']
+            self.salvamentos.append(registro)
+        
+        falhas = 0
+        for item in plano:
+            id_campo = item['id_campo']
+            aluno, coluna = self.df_interno.iloc[item['linha'], 0], self.df_interno.columns[item['coluna']]
+            if item['acao'] == 'erro':
+                self.diario.registrar(item, 'falha', aluno, coluna, item['mensagem'])
+            elif id_campo in ausentes:
+                self.diario.registrar(item, 'falha', aluno, coluna, ausentes[id_campo])
+            elif id_campo in bloqueados:
+                self.diario.registrar(item, 'ignorado', aluno, coluna, bloqueados[id_campo])
+            elif bloqueio:
+                continue  # Nada foi enviado: o campo fica pendente para a próxima execução
+            elif envio['resultados'].get(id_campo):
+                self.diario.registrar(item, 'preenchido' if item['acao'] == 'nota' else 'nc', aluno, coluna)
+            else:
+                falhas += 1
+                motivo = "campo inexistente ou desabilitado" if envio['sucesso'] else envio['mensagem']
+                self.diario.registrar(item, 'falha', aluno, coluna, motivo or "campo não aceito")
+        
+        self.ultimo_relatorio = {
+            'campos_preenchidos': sum(1 for id_campo in notas if envio['resultados'].get(id_campo)),
+            'campos_nc': sum(1 for id_campo in ids_nc if envio['resultados'].get(id_campo)),
+            'campos_ignorados': campos_ignorados,
+            'campos_retomados': campos_retomados,
+            'erros': falhas + len(erros_plano),
+            'campos_ausentes': len(ausentes),
+            'campos_bloqueados': len(bloqueados),
+            'salvamento': registro,
+            'relatorio_erros': self._fechar_diario(),
+        }
+        resultado['relatorio'] = self.ultimo_relatorio
+        if bloqueio:
+            raise RuntimeError(f"turma não enviada: {bloqueio}")
+        if not envio['sucesso']:
+            raise RuntimeError(f"servidor recusou o salvamento: {envio['mensagem']}")
+        print(f"[OK] Notas salvas: {self.ultimo_relatorio['campos_preenchidos']} notas, "
+              f"{self.ultimo_relatorio['campos_nc']} N/C, {self.ultimo_relatorio['erros']} erros"
+              + (f", {len(ausentes)} ausentes ou bloqueados na página (não enviados)" if ausentes else ""))
+    
+    def _resolver_curso(self, curso):
+        """
+        Converte o curso informado no lote para o valor da opção em id_curso
+        Args:
+            curso (str): 'FUND2', 'MEDIO' ou o próprio valor numérico
+        Returns:
+            str: Valor da opção do curso
+        """
+        return self.configuracao_curso.get(str(curso).strip().upper(), str(curso).strip())
+    
+    def _gravar_resumo_lote(self, resultados, duracao_total, arquivo_resumo=None, estatisticas=None):
+        """
+        Mostra e grava em JSON o resumo das tarefas do lote
+        Returns:
+            bool: True se todas as tarefas terminaram com sucesso
+        """
+        falhas = [r for r in resultados if r['status'] != 'ok']
+        resumo = {
+            'inicio': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(time.time() - duracao_total)),
+            'duracao_s': round(duracao_total, 2),
+            'total': len(resultados),
+            'sucessos': len(resultados) - len(falhas),
+            'falhas': len(falhas),
+            'trabalhadores': estatisticas or [],
+            'tarefas': resultados,
+        }
+        
+        arquivo_resumo = arquivo_resumo or f"resumo_lote_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        with open(arquivo_resumo, "w", encoding="utf-8") as arquivo:
+            json.dump(resumo, arquivo, ensure_ascii=False, indent=2, default=str)
+        
+        print("\n" + "="*60)
+        print("RESUMO DO LOTE")
+        print("="*60)
+        print(f"[OK] Tarefas concluídas: {resumo['sucessos']}/{resumo['total']}")
+        for r in falhas:
+            print(f"[ERRO] Tarefa {r.get('indice')} (turma {r['turma']}, período {r['periodo']}): {r['mensagem']}")
+        for e in resumo['trabalhadores']:
+            print(f"[INFO] Trabalhador {e['trabalhador']}: {e['sucessos']}/{e['tarefas']} tarefas em {e['duracao_s']:.1f}s")
+        print(f"[INFO] Tempo total: {duracao_total:.1f}s")
+        print(f"[INFO] Resumo gravado em: {arquivo_resumo}")
+        
+        return not falhas
+    
+    def finalizar(self, perguntar=True):
+        """
+        Finaliza o programa e fecha o navegador
+        Args:
+            perguntar (bool): Se False, fecha o navegador sem perguntar (modo lote)
+        """
+        # Navegador ainda abrindo (ex.: Ctrl+C durante as perguntas)
+        self.aguardar_navegador()
+        if self.driver and not perguntar:
+            self.driver.quit()
+            print("[OK] Navegador fechado.")
+        elif self.driver:
             try:
                 escolha = input("\n[INPUT] Deseja fechar o navegador automaticamente? (s/n): ").strip().lower()
                 if escolha in ['s', 'sim', 'y', 'yes']:
@@ -1094,15 +3254,113 @@ class AutomacaoNotasGalileu:
                 print("[OK] Navegador fechado automaticamente.")
 
 
-def main():
-    """Função principal do programa"""
+def criar_parser_argumentos():
+    """Cria o parser dos argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description="Automação de preenchimento de notas - Galileu EC2")
+    parser.add_argument("--headless", action="store_true", default=None,
+                        help="abre o navegador sem janela (também via NAVEGADOR_HEADLESS=1)")
+    parser.add_argument("--navegador", metavar="CAMINHO",
+                        help="executável do Chrome/Chromium (também via NAVEGADOR_BINARIO)")
+    parser.add_argument("--janela", metavar="LARGURA,ALTURA",
+                        help="tamanho da janela, ex.: 1366,768 (também via NAVEGADOR_JANELA)")
+    parser.add_argument("--perfil-leve", action="store_true", default=None,
+                        help="não carrega imagens, fontes e animações (padrão no modo headless)")
+    parser.add_argument("--sessao", metavar="ARQUIVO",
+                        help="guarda os cookies da sessão e os reaproveita nas próximas execuções (também via GALILEU_SESSAO)")
+    parser.add_argument("--perfil-dir", metavar="DIRETORIO",
+                        help="diretório de perfil do Chrome mantido entre execuções (também via GALILEU_PERFIL_DIR)")
+    parser.add_argument("--lote", metavar="ARQUIVO",
+                        help="executa sem perguntas as tarefas de um arquivo YAML/JSON/CSV "
+                             "(credenciais em GALILEU_USUARIO e GALILEU_SENHA)")
+    parser.add_argument("--resumo", metavar="ARQUIVO",
+                        help="arquivo JSON com o resumo do modo lote")
+    parser.add_argument("--backend", choices=["navegador", "http"], default="navegador",
+                        help="no modo lote, 'http' acessa o site sem abrir o Chrome (requer requests)")
+    parser.add_argument("--trabalhadores", type=int, default=1, metavar="N",
+                        help="número máximo de navegadores em paralelo no modo lote (padrão: 1)")
+    parser.add_argument("--catalogo", metavar="ARQUIVO",
+                        help="arquivo do catálogo de cursos e turmas (padrão: catalogo_galileu.json ou GALILEU_CATALOGO)")
+    parser.add_argument("--atualizar-catalogo", action="store_true",
+                        help="consulta novamente os cursos e turmas no site em vez de usar o catálogo salvo")
+    parser.add_argument("--formato", choices=FORMATOS, default="xlsx",
+                        help="formato das planilhas geradas: xlsx (padrão), csv ou parquet; "
+                             "arquivos informados no lote usam o formato da extensão")
+    parser.add_argument("--trace", metavar="ARQUIVO",
+                        help="mede o tempo de cada fase e campo e grava o trace em .json ou .csv (também via GALILEU_TRACE)")
+    parser.add_argument("--retomar", action="store_true",
+                        help="continua um preenchimento interrompido: pula os campos já concluídos segundo o diário")
+    parser.add_argument("--diferencial", action="store_true",
+                        help="preenche apenas os campos cuja nota ou N/C mudou desde a extração")
+    parser.add_argument("--salvar", action="store_true",
+                        help="clica em Salvar após o preenchimento de cada turma e aguarda a confirmação do site")
+    parser.add_argument("--salvar-com-erros", action="store_true",
+                        help="com --salvar, salva também as turmas com erros ou campos divergentes")
+    parser.add_argument("--exportar-escola", action="store_true",
+                        help="gera, sem perguntas, as planilhas de todas as turmas e períodos (modo 3 do menu)")
+    parser.add_argument("--cursos", metavar="LISTA",
+                        help="cursos da exportação completa separados por vírgula, ex.: FUND2,MEDIO (padrão: todos)")
+    parser.add_argument("--periodos", metavar="LISTA",
+                        help="períodos da exportação completa separados por vírgula, ex.: 1,2 (padrão: todos)")
+    parser.add_argument("--consolidado", action="store_true",
+                        help="na exportação completa, grava um único xlsx com uma aba por turma/período e uma aba Indice")
+    parser.add_argument("--todas-disciplinas", action="store_true",
+                        help="na exportação completa, percorre também todas as disciplinas de cada turma")
+    parser.add_argument("--sem-verificacao", action="store_true",
+                        help="não relê os campos no site para conferir e corrigir o preenchimento")
+    parser.add_argument("--observar", dest="observar", action="store_const", const="unico",
+                        help="inicia o preenchimento assim que a planilha for salva e fechada, sem perguntar")
+    parser.add_argument("--observar-continuo", dest="observar", action="store_const", const="continuo",
+                        help="como --observar e, depois do preenchimento, envia ao site as alterações "
+                             "de cada novo salvamento até Ctrl+C")
+    return parser
+
+
+def main(argumentos=None):
+    """
+    Função principal do programa
+    Returns:
+        int: Código de saída (0 em caso de sucesso)
+    """
+    args = criar_parser_argumentos().parse_args(argumentos)
+    
     # Suprimir outputs desnecessários do sistema
     sys.stderr = open(os.devnull, 'w') if os.name == 'nt' else sys.stderr
     
-    sistema = AutomacaoNotasGalileu()
+    sistema = AutomacaoNotasGalileu(
+        headless=args.headless,
+        binario_navegador=args.navegador,
+        tamanho_janela=args.janela,
+        perfil_leve=args.perfil_leve,
+        arquivo_sessao=args.sessao,
+        diretorio_perfil=args.perfil_dir,
+        backend=args.backend,
+        arquivo_catalogo=args.catalogo,
+        arquivo_trace=args.trace,
+    )
+    sistema.preenchimento_diferencial = args.diferencial
+    sistema.retomar_preenchimento = args.retomar
+    sistema.formato_planilha = args.formato
+    sistema.modo_observacao = args.observar
+    sistema.verificacao_pos_preenchimento = not args.sem_verificacao
+    sistema.salvamento_automatico = args.salvar
+    sistema.salvar_com_erros = args.salvar_com_erros
+    if args.exportar_escola:
+        sistema.modo_operacao = "exportar_escola"
+    sistema.cursos_exportacao = [c.strip() for c in args.cursos.split(",") if c.strip()] if args.cursos else None
+    sistema.periodos_exportacao = [p.strip() for p in args.periodos.split(",") if p.strip()] if args.periodos else None
+    sistema.exportar_disciplinas = args.todas_disciplinas
+    sistema.exportacao_consolidada = args.consolidado
+    sistema.atualizar_catalogo = args.atualizar_catalogo
+    
+    if args.backend == 'http' and not args.lote:
+        print("[AVISO] O backend HTTP só é usado no modo lote (--lote); usando o navegador.")
     
+    sucesso = False
     try:
-        sucesso = sistema.executar_processo_completo()
+        if args.lote:
+            sucesso = sistema.executar_lote(args.lote, args.resumo, args.trabalhadores)
+        else:
+            sucesso = sistema.executar_processo_completo()
         
         if sucesso:
             print("\n[OK] Todos os processos foram executados com sucesso!")
@@ -1114,13 +3372,16 @@ def main():
     except Exception as e:
         print(f"\n\n[ERRO] Erro inesperado: {e}")
     finally:
-        sistema.finalizar()
+        sistema.instrumentacao.finalizar()
+        sistema.finalizar(perguntar=not args.lote)
         
         # Restaurar stderr se foi redirecionado
         if os.name == 'nt' and hasattr(sys.stderr, 'close'):
             sys.stderr.close()
             sys.stderr = sys.__stderr__
+    
+    return 0 if sucesso else 1
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
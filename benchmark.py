@@ -0,0 +1,318 @@
+"""
+Benchmark da Automação - Galileu EC2 e Q-Acadêmico
+==================================================
+
+Mede, contra o servidor simulado (servidor_simulado.py), o tempo de cada fase da
+automação para turmas de vários tamanhos:
+
+- Galileu via navegador: abertura do Chrome, login, seleção de filtros,
+  extração da tabela e preenchimento (notas + N/C)
+- Galileu via HTTP (galileu_http): login, download da tabela e envio das notas,
+  conferindo no servidor uma segunda rodada que troca notas por N/C e vice-versa
+- Q-Acadêmico via navegador: extração e importação da planilha
+
+Para cada fase informa o tempo, os comandos WebDriver enviados (total e por
+aluno) e, no preenchimento, os campos por segundo.
+
+Uso:
+    python benchmark.py --tamanhos 30 100 500 --atraso 0.3 --saida benchmark.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from servidor_simulado import EstadoSimulado, iniciar_servidor
+
+# Nome de cada cenário nos resultados
+CENARIOS = {
+    "navegador": "galileu-navegador",
+    "http": "galileu-http",
+    "qacademico": "qacademico-navegador",
+}
+
+CURSO = "3533"
+TURMA = "30054424"
+PERIODO = "1"
+
+
+class MedidorFases:
+    """
+    Cronometra fases e conta os comandos WebDriver enviados em cada uma
+    """
+
+    def __init__(self, cenario, alunos):
+        self.cenario = cenario
+        self.alunos = alunos
+        self.resultados = []
+        self._comandos = 0
+        self._instrumentado = False
+
+    def instrumentar(self, driver):
+        """
+        Conta os comandos que passam por driver.execute (todo comando WebDriver passa por ele)
+        Args:
+            driver (WebDriver): Driver a instrumentar
+        """
+        executar_original = driver.execute
+        self._instrumentado = True
+
+        def executar_contando(comando, parametros=None):
+            self._comandos += 1
+            return executar_original(comando, parametros)
+
+        driver.execute = executar_contando
+
+    @contextlib.contextmanager
+    def fase(self, nome, campos=None):
+        """
+        Mede uma fase. Se campos for uma lista, seu primeiro elemento (preenchido
+        dentro do bloco) é usado para calcular campos por segundo
+        """
+        comandos_antes = self._comandos
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            comandos = self._comandos - comandos_antes if self._instrumentado else None
+            total_campos = campos[0] if campos else None
+            self.resultados.append({
+                'cenario': self.cenario,
+                'alunos': self.alunos,
+                'fase': nome,
+                'tempo_s': round(duracao, 3),
+                'comandos': comandos,
+                'comandos_por_aluno': round(comandos / self.alunos, 2) if comandos is not None and self.alunos else None,
+                'campos': total_campos,
+                'campos_por_s': round(total_campos / duracao, 1) if total_campos and duracao else None,
+            })
+
+
+def gerar_notas(df_usuario, semente=42):
+    """
+    Gera uma planilha editada com o mesmo formato de df_usuario: notas com
+    vírgula, células vazias (viram N/C) e alguns 'N/C' explícitos
+    Args:
+        df_usuario (DataFrame): Tabela extraída
+    Returns:
+        DataFrame: Planilha editada, como carregar_notas_editadas a deixaria
+    """
+    aleatorio = random.Random(semente)
+    notas = df_usuario.copy().astype(object)
+    for coluna in notas.columns[1:]:
+        valores = []
+        for _ in range(len(notas)):
+            sorteio = aleatorio.random()
+            if sorteio < 0.7:
+                valores.append(f"{aleatorio.randint(0, 100) / 10:.1f}".replace(".", ","))
+            elif sorteio < 0.9:
+                valores.append(float("nan"))
+            else:
+                valores.append("N/C")
+        notas[coluna] = valores
+    return notas
+
+
+def medir_galileu_navegador(url_base, alunos, headless=True):
+    """Mede as fases do Galileu via Selenium"""
+    from automatizacao_notas import AutomacaoNotasGalileu
+
+    medidor = MedidorFases(CENARIOS["navegador"], alunos)
+    sistema = AutomacaoNotasGalileu(headless=headless)
+    sistema.url_base = url_base
+    saida = io.StringIO()
+
+    try:
+        with contextlib.redirect_stdout(saida):
+            with medidor.fase("inicio_navegador"):
+                if not sistema.inicializar_navegador():
+                    raise RuntimeError("navegador não iniciou")
+            medidor.instrumentar(sistema.driver)
+
+            with medidor.fase("login"):
+                if not sistema.fazer_login("professor", "senha"):
+                    raise RuntimeError("login falhou")
+
+            with medidor.fase("filtros"):
+                sistema.acessar_registro_notas()
+                sistema._selecionar_curso(CURSO)
+                sistema._selecionar_turma(TURMA)
+                sistema._selecionar_periodo(PERIODO)
+
+            with medidor.fase("extracao"):
+                if not sistema._ler_tabela_alunos():
+                    raise RuntimeError("extração falhou")
+
+            sistema.notas = gerar_notas(sistema.df_usuario)
+            campos = [len([i for i in sistema._montar_plano_preenchimento() if i['acao'] != 'erro'])]
+            with medidor.fase("preenchimento", campos):
+                sistema.preencher_notas_automaticamente()
+    finally:
+        if sistema.driver:
+            sistema.driver.quit()
+
+    return medidor.resultados
+
+
+def medir_galileu_http(url_base, alunos):
+    """Mede as fases do Galileu via backend HTTP"""
+    from galileu_http import ClienteGalileuHTTP
+
+    medidor = MedidorFases(CENARIOS["http"], alunos)
+    cliente = ClienteGalileuHTTP(url_base)
+
+    with medidor.fase("login"):
+        if not cliente.login("professor", "senha"):
+            raise RuntimeError("login falhou")
+
+    with medidor.fase("extracao"):
+        dados_tabela, dados_tabela_interna = cliente.carregar_grid(CURSO, TURMA, PERIODO)
+
+    notas, ids_nc = {}, []
+    aleatorio = random.Random(42)
+    for linha in dados_tabela_interna:
+        for id_campo in linha[1:]:
+            if "media-manual" in str(id_campo):
+                continue
+            if aleatorio.random() < 0.7:
+                notas[id_campo] = f"{aleatorio.randint(0, 100) / 10:.1f}".replace(".", ",")
+            else:
+                ids_nc.append(id_campo)
+
+    with medidor.fase("preenchimento", [len(notas) + len(ids_nc)]):
+        if not cliente.enviar_notas(notas, ids_nc)['sucesso']:
+            raise RuntimeError("salvamento falhou")
+
+    # Segunda rodada invertendo notas e N/C: o servidor deve ficar exatamente com o enviado
+    cliente.carregar_grid(CURSO, TURMA, PERIODO)
+    novas_notas = {id_campo: "5,0" for id_campo in ids_nc}
+    if not cliente.enviar_notas(novas_notas, list(notas))['sucesso']:
+        raise RuntimeError("salvamento falhou")
+    conferir_galileu_http(cliente, novas_notas, notas)
+
+    return medidor.resultados
+
+
+def conferir_galileu_http(cliente, notas, ids_nc):
+    """
+    Recarrega a tabela e confere se o servidor guardou as notas e os N/C enviados
+    Args:
+        cliente (ClienteGalileuHTTP): Cliente autenticado
+        notas (dict): Mapa id do campo -> nota enviada
+        ids_nc (iterable): IDs enviados como N/C
+    """
+    dados_tabela, dados_tabela_interna = cliente.carregar_grid(CURSO, TURMA, PERIODO)
+    valores = {id_campo: valor for linha, ids in zip(dados_tabela, dados_tabela_interna)
+               for id_campo, valor in zip(ids[1:], linha[1:])}
+    marcados = cliente.ultima_pagina.marcacoes_nc()
+    erradas = [id_campo for id_campo, nota in notas.items()
+               if valores.get(id_campo) != nota or marcados.get(id_campo)]
+    erradas += [id_campo for id_campo in ids_nc if valores.get(id_campo) or not marcados.get(id_campo)]
+    if erradas:
+        raise RuntimeError(f"{len(erradas)} campos diferentes do enviado no servidor, ex.: {erradas[:3]}")
+
+
+def medir_qacademico(url_base, alunos, headless=True):
+    """Mede extração e importação do Q-Acadêmico via Selenium"""
+    caminho = Path(__file__).with_name("Q-academico.py")
+    especificacao = importlib.util.spec_from_file_location("q_academico", caminho)
+    modulo = importlib.util.module_from_spec(especificacao)
+    especificacao.loader.exec_module(modulo)
+
+    medidor = MedidorFases(CENARIOS["qacademico"], alunos)
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        with medidor.fase("inicio_navegador"):
+            bot = modulo.ExtratorQAcademico(headless=headless)
+    try:
+        medidor.instrumentar(bot.driver)
+        bot.driver.get(f"{url_base}/qacademico/index.asp?t=1000")
+
+        with contextlib.redirect_stdout(saida):
+            with medidor.fase("extracao"):
+                arquivo = bot.extrair_com_observacao()
+            if not arquivo:
+                raise RuntimeError("extração falhou")
+
+            df = pd.read_excel(arquivo)
+            df["Nota"] = [f"{(i % 100) / 10:.1f}".replace(".", ",") for i in range(len(df))]
+            df.to_excel(arquivo, index=False)
+
+            with medidor.fase("importacao", [len(df)]):
+                bot.importar_notas_do_excel(arquivo)
+    finally:
+        bot.driver.quit()
+
+    return medidor.resultados
+
+
+def imprimir_tabela(resultados):
+    """Mostra os resultados em forma de tabela"""
+    print("\n" + "="*96)
+    print(f"{'CENARIO':<22}{'ALUNOS':>7}  {'FASE':<18}{'TEMPO (s)':>10}{'COMANDOS':>10}{'CMD/ALUNO':>11}{'CAMPOS/s':>11}")
+    print("="*96)
+    for r in resultados:
+        if 'erro' in r:
+            print(f"{r['cenario']:<22}{r['alunos']:>7}  [ERRO] {r['erro']}")
+            continue
+        print(f"{r['cenario']:<22}{r['alunos']:>7}  {r['fase']:<18}{r['tempo_s']:>10.3f}"
+              f"{r['comandos'] if r['comandos'] is not None else '-':>10}"
+              f"{r['comandos_por_aluno'] if r['comandos_por_aluno'] is not None else '-':>11}"
+              f"{r['campos_por_s'] if r['campos_por_s'] is not None else '-':>11}")
+
+
+def main():
+    """Executa o benchmark para cada tamanho de turma"""
+    parser = argparse.ArgumentParser(description="Benchmark da automação contra o servidor simulado")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[30, 100, 500], help="alunos por turma")
+    parser.add_argument("--atraso", type=float, default=0.3, help="atraso das respostas AJAX em segundos")
+    parser.add_argument("--cenarios", nargs="+", default=list(CENARIOS), choices=list(CENARIOS))
+    parser.add_argument("--com-janela", action="store_true", help="abre o Chrome com janela (padrão: headless)")
+    parser.add_argument("--saida", metavar="ARQUIVO", help="grava os resultados em JSON")
+    args = parser.parse_args()
+
+    medicoes = {
+        "navegador": lambda url, n: medir_galileu_navegador(url, n, headless=not args.com_janela),
+        "http": medir_galileu_http,
+        "qacademico": lambda url, n: medir_qacademico(url, n, headless=not args.com_janela),
+    }
+
+    resultados = []
+    diretorio_original = os.getcwd()
+    with tempfile.TemporaryDirectory() as diretorio_temporario:
+        os.chdir(diretorio_temporario)  # Planilhas geradas ficam fora do repositório
+        try:
+            for alunos in args.tamanhos:
+                for cenario in args.cenarios:
+                    servidor, url_base = iniciar_servidor(0, EstadoSimulado(alunos=alunos, atraso=args.atraso))
+                    print(f"[INFO] {cenario}: {alunos} alunos...")
+                    try:
+                        resultados.extend(medicoes[cenario](url_base, alunos))
+                    except Exception as e:
+                        resultados.append({'cenario': CENARIOS[cenario], 'alunos': alunos,
+                                           'erro': (str(e).splitlines() or [repr(e)])[0]})
+                    finally:
+                        servidor.shutdown()
+                        servidor.server_close()
+        finally:
+            os.chdir(diretorio_original)
+
+    imprimir_tabela(resultados)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+        print(f"\n[INFO] Resultados gravados em: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
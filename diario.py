@@ -0,0 +1,154 @@
+"""
+Diário de Preenchimento - Galileu EC2
+=====================================
+
+Registro em disco, somente por acréscimo (JSON Lines), do resultado de cada campo
+durante o preenchimento de uma turma/período: 'preenchido', 'nc', 'falha' ou
+'ignorado'. Cada linha é gravada assim que o resultado é conhecido, então o
+diário sobrevive a uma queda do navegador ou do programa e permite retomar o
+preenchimento refazendo apenas os campos que não foram concluídos.
+
+Ao final de cada execução, os campos cuja última situação é 'falha' são
+gravados em um relatório CSV ao lado do diário.
+"""
+
+import csv
+import json
+import os
+import time
+
+
+class DiarioPreenchimento:
+    """
+    Diário de uma turma/período (um arquivo .jsonl)
+    """
+
+    STATUS_CONCLUIDOS = ('preenchido', 'nc')
+
+    def __init__(self, caminho):
+        """
+        Args:
+            caminho (str): Arquivo .jsonl do diário (o diretório é criado se preciso)
+        """
+        self.caminho = caminho
+        self.execucao = time.strftime('%Y%m%d_%H%M%S')
+        self._arquivo = None
+
+    @property
+    def caminho_erros(self):
+        """Relatório CSV das falhas da última execução"""
+        return os.path.splitext(self.caminho)[0] + "_erros.csv"
+
+    def ler(self):
+        """
+        Lê o diário e devolve a última situação registrada de cada campo.
+        Linhas incompletas (gravação interrompida) são ignoradas
+        Returns:
+            dict: id do campo -> último registro
+        """
+        situacao = {}
+        if not os.path.exists(self.caminho):
+            return situacao
+        with open(self.caminho, encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    continue
+                if 'id' in registro:
+                    situacao[registro['id']] = registro
+        return situacao
+
+    def concluidos(self, plano):
+        """
+        IDs do plano já concluídos em execuções anteriores com a mesma ação e valor
+        Args:
+            plano (list): Itens de _montar_plano_preenchimento
+        Returns:
+            set: IDs dos campos que não precisam ser refeitos
+        """
+        situacao = self.ler()
+        feitos = set()
+        for item in plano:
+            registro = situacao.get(item['id_campo'])
+            if (registro and registro.get('status') in self.STATUS_CONCLUIDOS
+                    and registro.get('acao') == item['acao'] and registro.get('valor') == item['valor']):
+                feitos.add(item['id_campo'])
+        return feitos
+
+    def abrir(self, **contexto):
+        """
+        Abre o diário para acréscimo e registra o início da execução
+        Args:
+            **contexto: Informações da execução (planilha, modo, etc.)
+        """
+        diretorio = os.path.dirname(self.caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self._arquivo = open(self.caminho, "a", encoding="utf-8")
+        self._gravar(dict(contexto, evento='inicio'))
+
+    def registrar(self, item, status, aluno=None, coluna=None, mensagem=None):
+        """
+        Registra o resultado de um campo
+        Args:
+            item (dict): Item do plano de preenchimento
+            status (str): 'preenchido', 'nc', 'falha' ou 'ignorado'
+            aluno (str): Nome do aluno
+            coluna (str): Nome da coluna da planilha
+            mensagem (str): Motivo da falha
+        """
+        registro = {
+            'id': item['id_campo'],
+            'status': status,
+            'acao': item['acao'],
+            'valor': item.get('valor'),
+            'aluno': aluno,
+            'coluna': coluna,
+        }
+        if mensagem:
+            registro['mensagem'] = str(mensagem)
+        self._gravar(registro)
+
+    def _gravar(self, registro):
+        if self._arquivo is None:
+            return
+        registro['execucao'] = self.execucao
+        registro['t'] = round(time.time(), 3)
+        self._arquivo.write(json.dumps(registro, ensure_ascii=False, default=str) + "\n")
+        self._arquivo.flush()
+
+    def fechar(self):
+        """
+        Registra o fim da execução, força a gravação em disco e atualiza o
+        relatório de falhas
+        Returns:
+            str: Caminho do relatório de falhas, ou None se não houver falhas
+        """
+        if self._arquivo is None:
+            return None
+        self._gravar({'evento': 'fim'})
+        os.fsync(self._arquivo.fileno())
+        self._arquivo.close()
+        self._arquivo = None
+        return self.gravar_relatorio_erros()
+
+    def gravar_relatorio_erros(self):
+        """
+        Grava em CSV os campos cuja última situação no diário é 'falha'
+        Returns:
+            str: Caminho do relatório, ou None se não houver falhas
+        """
+        falhas = [r for r in self.ler().values() if r.get('status') == 'falha']
+        if not falhas:
+            if os.path.exists(self.caminho_erros):
+                os.remove(self.caminho_erros)
+            return None
+
+        with open(self.caminho_erros, "w", newline="", encoding="utf-8-sig") as arquivo:
+            escritor = csv.writer(arquivo, delimiter=";")
+            escritor.writerow(["aluno", "coluna", "id_campo", "acao", "valor", "mensagem", "execucao"])
+            for r in falhas:
+                escritor.writerow([r.get('aluno'), r.get('coluna'), r['id'], r.get('acao'),
+                                   r.get('valor'), r.get('mensagem', ''), r.get('execucao')])
+        return self.caminho_erros
@@ -0,0 +1,452 @@
+"""
+Backend HTTP do Registro de Notas - Galileu EC2
+===============================================
+
+Acessa o registro de notas sem navegador: faz login em /professor, baixa a tabela
+gridAlunos de um curso/turma/período, lê os nomes e valores dos inputs e envia
+as notas e marcações N/C de volta da mesma forma que o formulário do site
+(todos os campos do formulário, serializados e enviados por POST).
+
+Usa uma única sessão HTTP com conexões persistentes (keep-alive) e cookies.
+As rotas da tabela e do salvamento são atributos da classe e podem ser ajustadas;
+o servidor simulado (servidor_simulado.py) atende as mesmas rotas.
+"""
+
+import os
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class LeitorPaginaGalileu(HTMLParser):
+    """
+    Leitor de HTML em uma única passada que guarda o que o backend precisa:
+    formulários e seus campos, opções dos selects e as linhas da tabela gridAlunos
+    """
+
+    # Elementos que quebram linha no texto exibido de uma célula
+    QUEBRAS_LINHA = {'br', 'div', 'p', 'li', 'tr'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.formularios = []      # [{'action', 'method', 'id', 'campos': [atributos]}]
+        self.campos = []           # Todos os inputs/selects da página, em ordem
+        self.selects = {}          # id ou name -> [(valor, rótulo, selecionado)]
+        self.linhas_grid = []      # [[{'texto', 'inputs'}]] por linha da gridAlunos
+        self._formulario_atual = None
+        self._select_atual = None
+        self._opcao_atual = None
+        self._profundidade_grid = 0
+        self._profundidade_tabela = 0
+        self._linha_atual = None
+        self._celula_atual = None
+
+    def handle_starttag(self, tag, attrs):
+        atributos = {chave: (valor if valor is not None else '') for chave, valor in attrs}
+
+        if tag == 'form':
+            self._formulario_atual = {
+                'action': atributos.get('action', ''),
+                'method': atributos.get('method', 'get').lower(),
+                'id': atributos.get('id', ''),
+                'campos': [],
+            }
+            self.formularios.append(self._formulario_atual)
+        elif tag == 'table':
+            self._profundidade_tabela += 1
+            if atributos.get('id') == 'gridAlunos':
+                self._profundidade_grid = self._profundidade_tabela
+        elif self._profundidade_grid and tag == 'tr':
+            self._linha_atual = []
+            self.linhas_grid.append(self._linha_atual)
+        elif self._profundidade_grid and tag == 'td' and self._linha_atual is not None:
+            self._celula_atual = {'texto': [], 'inputs': []}
+            self._linha_atual.append(self._celula_atual)
+        elif tag in ('input', 'select', 'textarea'):
+            campo = dict(atributos, tag=tag)
+            campo['no_grid'] = bool(self._profundidade_grid)
+            self.campos.append(campo)
+            if self._formulario_atual is not None:
+                self._formulario_atual['campos'].append(campo)
+            if self._celula_atual is not None and tag == 'input':
+                self._celula_atual['inputs'].append(campo)
+            if tag == 'select':
+                self._select_atual = []
+                self.selects[atributos.get('id') or atributos.get('name', '')] = self._select_atual
+                campo['opcoes'] = self._select_atual
+        elif tag == 'option' and self._select_atual is not None:
+            self._opcao_atual = [atributos.get('value'), [], 'selected' in atributos]
+            self._select_atual.append(self._opcao_atual)
+
+        if tag in self.QUEBRAS_LINHA and self._celula_atual is not None:
+            self._celula_atual['texto'].append('\n')
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'form':
+            self._formulario_atual = None
+        elif tag == 'table':
+            if self._profundidade_tabela == self._profundidade_grid:
+                self._profundidade_grid = 0
+                self._linha_atual = None
+                self._celula_atual = None
+            self._profundidade_tabela = max(0, self._profundidade_tabela - 1)
+        elif tag == 'td':
+            self._celula_atual = None
+        elif tag == 'select':
+            self._select_atual = None
+        elif tag == 'option' and self._opcao_atual is not None:
+            valor, texto, selecionado = self._opcao_atual
+            texto = ' '.join(''.join(texto).split())
+            self._opcao_atual[:] = [texto if valor is None else valor, texto, selecionado]
+            self._opcao_atual = None
+
+    def handle_data(self, dados):
+        if self._celula_atual is not None:
+            self._celula_atual['texto'].append(dados)
+        if self._opcao_atual is not None:
+            self._opcao_atual[1].append(dados)
+
+    def linhas_tabela(self):
+        """
+        Converte a gridAlunos no mesmo formato da leitura via navegador
+        Returns:
+            tuple: (dados_tabela, dados_tabela_interna)
+        """
+        dados_tabela = []
+        dados_tabela_interna = []
+
+        for linha in self.linhas_grid:
+            if not linha:
+                continue  # Linha de cabeçalho (somente th)
+
+            # Nome do aluno: primeira linha não vazia do texto da primeira célula
+            texto = ''.join(linha[0]['texto'])
+            linhas_texto = [' '.join(parte.split()) for parte in texto.split('\n')]
+            nome_aluno = next((parte for parte in linhas_texto if parte), '')
+            dados_linha = [nome_aluno]
+            dados_linha_interna = [nome_aluno]
+
+            for celula in linha[1:]:
+                if celula['inputs']:
+                    campo = celula['inputs'][0]
+                    dados_linha.append(campo.get('value', ''))
+                    dados_linha_interna.append(campo.get('name'))
+
+            dados_tabela.append(dados_linha)
+            dados_tabela_interna.append(dados_linha_interna)
+
+        return dados_tabela, dados_tabela_interna
+
+    def marcacoes_nc(self):
+        """
+        Estado dos checkboxes N/C (chk-nc-<name>) dos campos da gridAlunos
+        Returns:
+            dict: Mapa id do campo -> True se o checkbox está marcado
+        """
+        checkboxes = {campo.get('id'): 'checked' in campo for campo in self.campos if campo.get('id')}
+        marcacoes = {}
+        for linha in self.linhas_grid:
+            for celula in linha[1:]:
+                if celula['inputs']:
+                    nome = celula['inputs'][0].get('name')
+                    marcado = checkboxes.get(f"chk-nc-{str(nome).lower()}")
+                    if marcado is not None:
+                        marcacoes[nome] = marcado
+        return marcacoes
+
+    def indice_campos(self):
+        """
+        IDs dos inputs da gridAlunos, como o índice de presença da automação no navegador
+        Returns:
+            tuple: (inputs de nota, checkboxes chk-nc-*, elementos desabilitados), como sets
+        """
+        campos, checkboxes, bloqueados = set(), set(), set()
+        for campo in self.campos:
+            identificador = campo.get('id') or campo.get('name')
+            if not campo['no_grid'] or campo['tag'] != 'input' or not identificador:
+                continue
+            if campo.get('type', 'text').lower() == 'checkbox':
+                if identificador.startswith('chk-nc-'):
+                    checkboxes.add(identificador)
+            else:
+                campos.add(identificador)
+            if 'disabled' in campo:
+                bloqueados.add(identificador)
+        return campos, checkboxes, bloqueados
+
+
+def ler_pagina(html):
+    """
+    Lê um documento HTML com o LeitorPaginaGalileu
+    Args:
+        html (str): Conteúdo da página
+    Returns:
+        LeitorPaginaGalileu: Leitor com formulários, selects e tabela já extraídos
+    """
+    leitor = LeitorPaginaGalileu()
+    leitor.feed(html)
+    leitor.close()
+    return leitor
+
+
+class ClienteGalileuHTTP:
+    """
+    Cliente HTTP do registro de notas do Galileu EC2 (sem navegador)
+    """
+
+    ROTA_LOGIN = "/professor"
+    ROTA_REGISTRO = "/professor/registro-nota"
+    ROTA_TURMAS = "/professor/registro-nota/turmas"   # ?id_curso=
+    ROTA_GRID = "/professor/registro-nota/grid"       # ?id_curso=&id_turma=&nr_periodo=
+    ROTA_SALVAR = "/professor/registro-nota/salvar"   # Usada se o formulário não tiver action
+
+    def __init__(self, url_base=None, timeout=30, conexoes=4):
+        """
+        Inicializa a sessão HTTP
+        Args:
+            url_base (str): Endereço do sistema (padrão: GALILEU_URL ou o site oficial)
+            timeout (float): Limite em segundos de cada requisição
+            conexoes (int): Conexões persistentes mantidas no pool
+        """
+        self.url_base = (url_base or os.environ.get("GALILEU_URL") or "https://ec2galileu.com.br").rstrip("/")
+        self.timeout = timeout
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+        self.sessao.headers.update({
+            "User-Agent": "Mozilla/5.0 (automatizacao-galileuec2)",
+            "Accept-Language": "pt-BR,pt;q=0.9",
+        })
+        self.ultima_pagina = None
+        self.ultimos_filtros = None
+
+    def _url(self, rota):
+        return urljoin(self.url_base + "/", rota.lstrip("/"))
+
+    def _get(self, rota, **params):
+        resposta = self.sessao.get(self._url(rota), params=params or None, timeout=self.timeout)
+        resposta.raise_for_status()
+        return resposta
+
+    def login(self, usuario, senha):
+        """
+        Faz login enviando o formulário de /professor (inclusive campos ocultos)
+        Args:
+            usuario (str): Nome de usuário
+            senha (str): Senha
+        Returns:
+            bool: True se o login foi aceito
+        """
+        resposta = self._get(self.ROTA_LOGIN)
+        pagina = ler_pagina(resposta.text)
+
+        formulario = next(
+            (f for f in pagina.formularios if any(c.get('id') == 'identity' for c in f['campos'])),
+            None
+        )
+        if formulario is None:
+            # Sem formulário de login: a sessão (cookies) já está autenticada
+            return self.sessao_valida()
+
+        dados = self._serializar(formulario['campos'])
+        for campo in formulario['campos']:
+            if campo.get('id') == 'identity':
+                dados[campo.get('name') or 'identity'] = usuario
+            elif campo.get('id') == 'credential':
+                dados[campo.get('name') or 'credential'] = senha
+
+        destino = urljoin(resposta.url, formulario['action'] or resposta.url)
+        resposta = self.sessao.post(destino, data=dados, timeout=self.timeout)
+        return resposta.ok and self._autenticado(resposta)
+
+    def sessao_valida(self):
+        """
+        Verifica se a sessão atual acessa o registro de notas sem cair no login
+        Returns:
+            bool: True se autenticado
+        """
+        try:
+            return self._autenticado(self._get(self.ROTA_REGISTRO))
+        except requests.RequestException:
+            return False
+
+    @staticmethod
+    def _autenticado(resposta):
+        return 'login' not in resposta.url.lower() and 'id="identity"' not in resposta.text
+
+    def exportar_cookies(self):
+        """Retorna os cookies da sessão no formato do Selenium (lista de dicts)"""
+        return [
+            {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path}
+            for c in self.sessao.cookies
+        ]
+
+    def importar_cookies(self, cookies):
+        """
+        Carrega cookies de outra sessão (Selenium ou outro cliente HTTP)
+        Args:
+            cookies (list): Lista de dicts com name, value e opcionalmente domain/path
+        """
+        for cookie in cookies:
+            self.sessao.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
+
+    def listar_cursos(self):
+        """
+        Lista os cursos do select id_curso da página de registro de notas
+        Returns:
+            list: Pares (valor, rótulo) sem a opção vazia
+        """
+        pagina = ler_pagina(self._get(self.ROTA_REGISTRO).text)
+        return [(valor, rotulo) for valor, rotulo, _ in pagina.selects.get('id_curso', []) if valor]
+
+    def listar_turmas(self, curso_id):
+        """
+        Lista as turmas de um curso
+        Args:
+            curso_id (str): Valor de id_curso
+        Returns:
+            list: Pares (valor, rótulo) sem a opção vazia
+        """
+        pagina = ler_pagina(self._get(self.ROTA_TURMAS, id_curso=curso_id).text)
+        opcoes = pagina.selects.get('id_turma') or next(iter(pagina.selects.values()), [])
+        return [(valor, rotulo) for valor, rotulo, _ in opcoes if valor]
+
+    def carregar_grid(self, curso_id, turma_valor, periodo):
+        """
+        Baixa a tabela gridAlunos de um curso/turma/período
+        Args:
+            curso_id (str): Valor de id_curso
+            turma_valor (str): Valor de id_turma
+            periodo (str): Valor de nr_periodo
+        Returns:
+            tuple: (dados_tabela, dados_tabela_interna), no mesmo formato da leitura via navegador
+        """
+        self.ultimos_filtros = {'id_curso': curso_id, 'id_turma': turma_valor, 'nr_periodo': periodo}
+        resposta = self._get(self.ROTA_GRID, **self.ultimos_filtros)
+        self.ultima_pagina = ler_pagina(resposta.text)
+        self.ultima_pagina.url = resposta.url
+        return self.ultima_pagina.linhas_tabela()
+
+    def enviar_notas(self, notas, ids_nc):
+        """
+        Envia notas e marcações N/C da última tabela carregada, serializando o
+        formulário da tabela como o botão Salvar do site
+        Args:
+            notas (dict): Mapa id do campo -> nota
+            ids_nc (list): IDs dos campos a marcar como N/C (checkbox chk-nc-<id>)
+        Returns:
+            dict: {'sucesso', 'status', 'mensagem', 'resultados': {id: bool}}
+        """
+        if self.ultima_pagina is None:
+            raise RuntimeError("carregue a tabela com carregar_grid() antes de enviar notas")
+
+        pagina = self.ultima_pagina
+        formulario = next(
+            (f for f in pagina.formularios if any(c['no_grid'] for c in f['campos'])),
+            None
+        )
+        campos = formulario['campos'] if formulario else [c for c in pagina.campos if c['no_grid']]
+        campos = [dict(campo) for campo in campos]  # Não altera a página lida
+        por_id = {campo.get('id') or campo.get('name'): campo for campo in campos}
+
+        # Como ativaNC no navegador: nota desmarca o N/C do campo e N/C esvazia a nota
+        resultados = {}
+        for id_campo, nota in notas.items():
+            campo = por_id.get(id_campo)
+            checkbox = por_id.get(f"chk-nc-{str(id_campo).lower()}")
+            resultados[id_campo] = campo is not None and 'disabled' not in campo
+            if resultados[id_campo]:
+                campo['value'] = nota
+                if checkbox is not None:
+                    checkbox.pop('checked', None)
+        for id_campo in ids_nc:
+            checkbox = por_id.get(f"chk-nc-{str(id_campo).lower()}")
+            resultados[id_campo] = checkbox is not None and 'disabled' not in checkbox
+            if resultados[id_campo]:
+                checkbox['checked'] = ''
+                campo = por_id.get(id_campo)
+                if campo is not None and 'disabled' not in campo:
+                    campo['value'] = ''
+
+        dados = self._serializar(campos)
+        if not formulario:
+            dados.update(self.ultimos_filtros or {})
+
+        acao = formulario['action'] if formulario and formulario['action'] else self.ROTA_SALVAR
+        resposta = self.sessao.post(urljoin(getattr(pagina, 'url', self._url(self.ROTA_GRID)), acao),
+                                    data=dados, timeout=self.timeout)
+        sucesso, mensagem = self._interpretar_resposta(resposta)
+        if not sucesso:
+            resultados = {id_campo: False for id_campo in resultados}
+        return {'sucesso': sucesso, 'status': resposta.status_code, 'mensagem': mensagem,
+                'resultados': resultados}
+
+    @staticmethod
+    def _serializar(campos):
+        """
+        Serializa campos de formulário como o navegador: checkboxes/radios só
+        quando marcados, selects pela opção selecionada e campos desabilitados
+        ou sem name são ignorados
+        Returns:
+            list: Pares (name, valor) na ordem do formulário
+        """
+        dados = []
+        for campo in campos:
+            nome = campo.get('name')
+            if not nome or 'disabled' in campo:
+                continue
+            tipo = campo.get('type', 'text').lower()
+            if campo['tag'] == 'select':
+                opcoes = campo.get('opcoes') or []
+                selecionada = next((o for o in opcoes if o[2]), opcoes[0] if opcoes else None)
+                if selecionada:
+                    dados.append((nome, selecionada[0]))
+            elif tipo in ('checkbox', 'radio'):
+                if 'checked' in campo:
+                    dados.append((nome, campo.get('value', 'on')))
+            elif tipo not in ('submit', 'button', 'image', 'reset', 'file'):
+                dados.append((nome, campo.get('value', '')))
+        return _ListaFormulario(dados)
+
+    @staticmethod
+    def _interpretar_resposta(resposta):
+        """
+        Interpreta a resposta do salvamento (JSON com 'sucesso'/'success' ou HTML)
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        if not resposta.ok:
+            return False, f"HTTP {resposta.status_code}"
+        try:
+            corpo = resposta.json()
+        except ValueError:
+            erro = 'alert-danger' in resposta.text or 'alert-error' in resposta.text
+            return not erro, "erro informado pelo site" if erro else "ok"
+        sucesso = corpo.get('sucesso', corpo.get('success', True))
+        return bool(sucesso), str(corpo.get('mensagem', corpo.get('message', '')))
+
+
+class _ListaFormulario(list):
+    """Lista de pares (name, valor) que aceita atribuição por name, como um dict"""
+
+    def __setitem__(self, chave, valor):
+        if isinstance(chave, (int, slice)):
+            return super().__setitem__(chave, valor)
+        for indice, (nome, _) in enumerate(self):
+            if nome == chave:
+                super().__setitem__(indice, (nome, valor))
+                return
+        self.append((chave, valor))
+
+    def update(self, outros):
+        for chave, valor in dict(outros).items():
+            self[chave] = valor
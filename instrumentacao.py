@@ -0,0 +1,257 @@
+"""
+Instrumentação da Automação - Galileu EC2 e Q-Acadêmico
+=======================================================
+
+Mede, quando ativada, o tempo de cada fase da execução (abertura do navegador,
+login, filtros, extração, leitura/gravação do Excel, preenchimento, N/C) e a
+latência de cada campo preenchido. No fim da execução grava um trace em JSON
+ou CSV (conforme a extensão do arquivo) e mostra um resumo com p50/p95/máximo.
+
+Desativada, cada medição custa apenas uma verificação de atributo; ativada,
+duas leituras de time.perf_counter() e um append em lista.
+
+Uso:
+    instrumentacao = Instrumentacao("trace.json")
+
+    with instrumentacao.fase("login"):
+        ...
+    instrumentacao.registrar_campo("nota", duracao_s)
+    instrumentacao.finalizar()
+"""
+
+import contextlib
+import csv
+import functools
+import json
+import threading
+import time
+
+
+def _percentil(valores_ordenados, percentual):
+    """
+    Percentil pelo método do posto mais próximo
+    Args:
+        valores_ordenados (list): Amostras em ordem crescente (não vazia)
+        percentual (float): 0 a 100
+    """
+    posicao = max(0, min(len(valores_ordenados) - 1, round(percentual / 100 * len(valores_ordenados) + 0.5) - 1))
+    return valores_ordenados[posicao]
+
+
+def _estatisticas(amostras):
+    """Quantidade, total, p50, p95 e máximo (em segundos) de uma lista de durações"""
+    ordenadas = sorted(amostras)
+    return {
+        'n': len(ordenadas),
+        'total_s': round(sum(ordenadas), 4),
+        'p50_s': round(_percentil(ordenadas, 50), 4),
+        'p95_s': round(_percentil(ordenadas, 95), 4),
+        'max_s': round(ordenadas[-1], 4),
+    }
+
+
+class Instrumentacao:
+    """
+    Coleta de tempos por fase e por campo, compartilhável entre threads
+    """
+
+    def __init__(self, arquivo=None, ativo=None):
+        """
+        Args:
+            arquivo (str): Arquivo do trace (.json ou .csv); None = não grava
+            ativo (bool): Liga a coleta (padrão: ligado se houver arquivo)
+        """
+        self.arquivo = arquivo
+        self.ativo = bool(arquivo) if ativo is None else ativo
+        self.inicio = time.time()
+        self._origem = time.perf_counter()
+        self._fases = []     # {'fase', 'inicio_s', 'duracao_s', 'ok', 'thread', ...detalhes}
+        self._campos = {}    # tipo -> [duração por campo]
+        self._trava = threading.Lock()
+
+    @contextlib.contextmanager
+    def fase(self, nome, **detalhes):
+        """
+        Mede o bloco como uma fase. Exceções marcam a fase com ok=False e são repassadas
+        Args:
+            nome (str): Nome da fase (ex.: 'login', 'extracao')
+            **detalhes: Informações extras gravadas no trace
+        """
+        if not self.ativo:
+            yield detalhes
+            return
+
+        inicio = time.perf_counter()
+        ok = True
+        try:
+            yield detalhes
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self._registrar_fase(nome, inicio, time.perf_counter(), ok and detalhes.pop('ok', True), detalhes)
+
+    def _registrar_fase(self, nome, inicio, fim, ok, detalhes):
+        registro = {
+            'fase': nome,
+            'inicio_s': round(inicio - self._origem, 4),
+            'duracao_s': round(fim - inicio, 4),
+            'ok': bool(ok),
+            'thread': threading.current_thread().name,
+        }
+        registro.update(detalhes)
+        with self._trava:
+            self._fases.append(registro)
+
+    def registrar_campo(self, tipo, duracao, quantidade=1):
+        """
+        Registra a latência de campos preenchidos. Em operações em lote, a duração
+        é dividida igualmente entre os campos do lote
+        Args:
+            tipo (str): Tipo da operação (ex.: 'nota', 'nota_lote', 'nc')
+            duracao (float): Duração da operação em segundos
+            quantidade (int): Campos tratados pela operação
+        """
+        if not self.ativo or quantidade <= 0:
+            return
+        with self._trava:
+            self._campos.setdefault(tipo, []).extend([duracao / quantidade] * quantidade)
+
+    @contextlib.contextmanager
+    def medir_campos(self, tipo, quantidade=1):
+        """Mede o bloco e o registra com registrar_campo"""
+        if not self.ativo:
+            yield
+            return
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar_campo(tipo, time.perf_counter() - inicio, quantidade)
+
+    def resumo(self):
+        """
+        Returns:
+            dict: Estatísticas por fase e por tipo de campo
+        """
+        with self._trava:
+            fases = list(self._fases)
+            campos = {tipo: list(amostras) for tipo, amostras in self._campos.items()}
+
+        duracoes = {}
+        falhas = {}
+        for registro in fases:
+            duracoes.setdefault(registro['fase'], []).append(registro['duracao_s'])
+            falhas[registro['fase']] = falhas.get(registro['fase'], 0) + (not registro['ok'])
+
+        resumo_fases = {}
+        for nome, amostras in duracoes.items():
+            resumo_fases[nome] = dict(_estatisticas(amostras), falhas=falhas[nome])
+        return {
+            'fases': resumo_fases,
+            'campos': {tipo: _estatisticas(amostras) for tipo, amostras in campos.items() if amostras},
+        }
+
+    def gravar(self, arquivo=None):
+        """
+        Grava o trace: JSON com eventos e resumo, ou CSV com uma linha por fase
+        e uma linha de estatísticas por tipo de campo
+        Args:
+            arquivo (str): Destino (padrão: o informado na criação)
+        Returns:
+            str: Arquivo gravado ou None
+        """
+        arquivo = arquivo or self.arquivo
+        if not self.ativo or not arquivo:
+            return None
+
+        resumo = self.resumo()
+        with self._trava:
+            fases = list(self._fases)
+
+        if str(arquivo).lower().endswith(".csv"):
+            with open(arquivo, "w", newline="", encoding="utf-8-sig") as saida:
+                escritor = csv.writer(saida, delimiter=";")
+                escritor.writerow(["tipo", "nome", "inicio_s", "duracao_s", "ok", "thread",
+                                   "n", "p50_s", "p95_s", "max_s"])
+                for registro in fases:
+                    escritor.writerow(["fase", registro['fase'], registro['inicio_s'], registro['duracao_s'],
+                                       registro['ok'], registro['thread'], "", "", "", ""])
+                for tipo, estatisticas in resumo['campos'].items():
+                    escritor.writerow(["campo", tipo, "", estatisticas['total_s'], "", "",
+                                       estatisticas['n'], estatisticas['p50_s'],
+                                       estatisticas['p95_s'], estatisticas['max_s']])
+        else:
+            with open(arquivo, "w", encoding="utf-8") as saida:
+                json.dump({
+                    'inicio': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.inicio)),
+                    'duracao_total_s': round(time.perf_counter() - self._origem, 3),
+                    'resumo': resumo,
+                    'eventos': fases,
+                }, saida, ensure_ascii=False, indent=2, default=str)
+        return arquivo
+
+    def imprimir_resumo(self):
+        """Mostra as fases e as latências por campo em forma de tabela"""
+        resumo = self.resumo()
+        if not resumo['fases'] and not resumo['campos']:
+            return
+
+        print("\n" + "="*60)
+        print("TEMPOS DA EXECUCAO")
+        print("="*60)
+        print(f"{'FASE':<24}{'N':>5}{'TOTAL (s)':>11}{'P50 (s)':>9}{'P95 (s)':>9}{'MAX (s)':>9}")
+        for nome, e in resumo['fases'].items():
+            print(f"{nome:<24}{e['n']:>5}{e['total_s']:>11.2f}{e['p50_s']:>9.2f}{e['p95_s']:>9.2f}{e['max_s']:>9.2f}"
+                  + (f"  ({e['falhas']} falhas)" if e['falhas'] else ""))
+        for tipo, e in resumo['campos'].items():
+            print(f"[CAMPO] {tipo:<16}{e['n']:>5}  p50 {e['p50_s'] * 1000:.1f} ms  "
+                  f"p95 {e['p95_s'] * 1000:.1f} ms  max {e['max_s'] * 1000:.1f} ms")
+
+    def finalizar(self):
+        """Grava o trace e mostra o resumo (sem efeito se desativada)"""
+        if not self.ativo:
+            return
+        try:
+            arquivo = self.gravar()
+            self.imprimir_resumo()
+            if arquivo:
+                print(f"[INFO] Trace gravado em: {arquivo}")
+        except Exception as e:
+            print(f"[AVISO] Não foi possível gravar o trace: {e}")
+
+
+def medir_fase(nome):
+    """
+    Decorador de métodos: mede a chamada como a fase 'nome' usando o atributo
+    instrumentacao da instância. Retorno False marca a fase como falha
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def medido(self, *args, **kwargs):
+            instrumentacao = getattr(self, 'instrumentacao', None)
+            if instrumentacao is None or not instrumentacao.ativo:
+                return metodo(self, *args, **kwargs)
+            with instrumentacao.fase(nome) as detalhes:
+                resultado = metodo(self, *args, **kwargs)
+                detalhes['ok'] = resultado is not False
+                return resultado
+        return medido
+    return decorador
+
+
+def medir_campo(tipo):
+    """
+    Decorador de métodos: registra a duração de cada chamada como a latência
+    de um campo do tipo 'tipo' no atributo instrumentacao da instância
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def medido(self, *args, **kwargs):
+            instrumentacao = getattr(self, 'instrumentacao', None)
+            if instrumentacao is None or not instrumentacao.ativo:
+                return metodo(self, *args, **kwargs)
+            with instrumentacao.medir_campos(tipo):
+                return metodo(self, *args, **kwargs)
+        return medido
+    return decorador
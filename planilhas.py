@@ -0,0 +1,352 @@
+"""
+Leitura e Gravação de Planilhas - Galileu EC2 e Q-Acadêmico
+===========================================================
+
+Camada única de entrada/saída das planilhas de notas, com o formato escolhido
+pela extensão do arquivo (ou por um formato padrão):
+
+- xlsx: gravação em modo write-only do openpyxl (linhas enviadas direto ao
+  arquivo, sem montar a planilha em memória) e leitura em modo read-only.
+  As colunas recebem largura conforme o conteúdo e as células de dados são
+  formatadas como texto ('@'), para o Excel não transformar 7,5 em data ou
+  apagar zeros à esquerda de matrículas.
+- csv: separador ';' e codificação utf-8-sig (abre direto no Excel em português).
+- parquet: requer o pacote pyarrow.
+
+aguardar_planilha_salva observa o arquivo e retorna assim que um salvamento
+completo é detectado (usado pelo modo de observação dos dois programas).
+
+Pastas consolidadas (apenas xlsx) reúnem várias turmas/períodos em um único
+arquivo: uma aba por tabela e uma aba "Indice" que liga cada aba à sua turma.
+PastaConsolidada abre o arquivo uma vez e lê cada aba só quando ela é pedida.
+"""
+
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+
+FORMATOS = ("xlsx", "csv", "parquet")
+
+# Extensão -> formato
+EXTENSOES = {
+    ".xlsx": "xlsx",
+    ".xlsm": "xlsx",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+LARGURA_MINIMA = 8
+LARGURA_MAXIMA = 60
+
+ABA_INDICE = "Indice"
+LIMITE_NOME_ABA = 31  # Limite do Excel
+
+
+def formato_planilha(caminho, padrao="xlsx"):
+    """
+    Formato de um arquivo pela extensão
+    Args:
+        caminho (str): Caminho do arquivo
+        padrao (str): Formato usado se a extensão não for reconhecida
+    Returns:
+        str: 'xlsx', 'csv' ou 'parquet'
+    """
+    return EXTENSOES.get(os.path.splitext(str(caminho))[1].lower(), padrao)
+
+
+def extensao_formato(formato):
+    """Extensão padrão de um formato (ex.: 'csv' -> '.csv')"""
+    return "." + (formato if formato in FORMATOS else "xlsx")
+
+
+def _larguras_colunas(df):
+    """Largura de cada coluna pelo maior texto entre título e valores"""
+    larguras = []
+    for posicao, titulo in enumerate(df.columns):
+        coluna = df.iloc[:, posicao]
+        maior_valor = coluna.dropna().astype(str).str.len().max() if len(coluna) else 0
+        maior = max(len(str(titulo)), 0 if pd.isna(maior_valor) else int(maior_valor))
+        larguras.append(min(LARGURA_MAXIMA, max(LARGURA_MINIMA, maior + 2)))
+    return larguras
+
+
+def gravar_planilha(df, caminho, formato=None, nome_aba="Notas"):
+    """
+    Grava um DataFrame (sem índice) no formato do arquivo
+    Args:
+        df (DataFrame): Dados com os títulos nas colunas
+        caminho (str): Arquivo de destino
+        formato (str): 'xlsx', 'csv' ou 'parquet' (padrão: pela extensão)
+        nome_aba (str): Nome da aba no xlsx
+    """
+    formato = formato or formato_planilha(caminho)
+
+    if formato == "csv":
+        df.to_csv(caminho, sep=";", index=False, encoding="utf-8-sig")
+        return
+    if formato == "parquet":
+        try:
+            df.astype(object).where(df.notna(), None).to_parquet(caminho, index=False)
+        except ImportError as e:
+            raise RuntimeError("o formato Parquet requer o pacote pyarrow (pip install pyarrow)") from e
+        return
+
+    livro = Workbook(write_only=True)
+    _gravar_aba(livro, df, nome_aba)
+    livro.save(caminho)
+
+
+def _gravar_aba(livro, df, nome_aba):
+    """Acrescenta uma aba com df a um Workbook em modo write-only"""
+    aba = livro.create_sheet(nome_aba[:LIMITE_NOME_ABA])
+    for posicao, largura in enumerate(_larguras_colunas(df), 1):
+        dimensao = aba.column_dimensions[get_column_letter(posicao)]
+        dimensao.width = largura
+        dimensao.number_format = "@"  # Células vazias digitadas depois também ficam como texto
+
+    negrito = Font(bold=True)
+    titulos = []
+    for titulo in df.columns:
+        celula = WriteOnlyCell(aba, value=str(titulo))
+        celula.font = negrito
+        titulos.append(celula)
+    aba.append(titulos)
+
+    # Valores de texto são gravados como texto; o formato '@' das colunas vale
+    # para o que o professor digitar nas células vazias
+    for linha in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+        aba.append(linha)
+
+
+def ler_planilha(caminho, formato=None, cabecalho=False, aba=0):
+    """
+    Lê a primeira aba (ou a aba indicada) de uma planilha
+    Args:
+        caminho (str): Arquivo de origem
+        formato (str): 'xlsx', 'csv' ou 'parquet' (padrão: pela extensão)
+        cabecalho (bool): True = primeira linha vira títulos das colunas;
+                          False = devolve como pd.read_excel(header=None)
+        aba (int ou str): Índice ou nome da aba no xlsx
+    Returns:
+        DataFrame: Dados lidos (células vazias como nulos)
+    """
+    formato = formato or formato_planilha(caminho)
+
+    if formato == "csv":
+        return pd.read_csv(caminho, sep=";", header=0 if cabecalho else None, dtype=str, encoding="utf-8-sig")
+
+    if formato == "parquet":
+        try:
+            df = pd.read_parquet(caminho)
+        except ImportError as e:
+            raise RuntimeError("o formato Parquet requer o pacote pyarrow (pip install pyarrow)") from e
+        if cabecalho:
+            return df
+        return pd.DataFrame([list(df.columns)] + df.astype(object).values.tolist())
+
+    livro = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        return _ler_aba_xlsx(livro[aba] if isinstance(aba, str) else livro.worksheets[aba], cabecalho)
+    finally:
+        livro.close()
+
+
+def _ler_aba_xlsx(planilha, cabecalho):
+    """Converte uma aba aberta em modo read-only em DataFrame (ver ler_planilha)"""
+    planilha.reset_dimensions()  # Alguns geradores gravam dimensões erradas
+    df = pd.DataFrame(planilha.iter_rows(values_only=True), dtype=object)
+
+    # Linhas e colunas vazias no fim (células só formatadas) são descartadas
+    preenchidas = df.notna() & df.ne("")
+    if not preenchidas.to_numpy().any():
+        return pd.DataFrame()
+    ultima_linha = preenchidas.any(axis=1).to_numpy().nonzero()[0][-1]
+    ultima_coluna = preenchidas.any(axis=0).to_numpy().nonzero()[0][-1]
+    df = df.iloc[:ultima_linha + 1, :ultima_coluna + 1]
+    if cabecalho and len(df):
+        df.columns = [str(titulo) for titulo in df.iloc[0]]
+        df = df.iloc[1:].reset_index(drop=True)
+    return df
+
+
+def nome_aba(texto, usados):
+    """
+    Nome de aba válido e único: sem os caracteres proibidos pelo Excel, até 31
+    caracteres e, se repetido, com sufixo ~2, ~3... O mesmo texto gera sempre o
+    mesmo nome quando as abas são criadas na mesma ordem
+    Args:
+        texto (str): Nome desejado (ex.: '6_ANO_A_T1')
+        usados (set): Nomes já usados, em minúsculas (atualizado)
+    Returns:
+        str: Nome da aba
+    """
+    base = re.sub(r"[\[\]:*?/\\']+", "_", str(texto)).strip() or "Aba"
+    nome = base[:LIMITE_NOME_ABA]
+    repeticao = 2
+    while nome.lower() in usados or nome.lower() == ABA_INDICE.lower():
+        sufixo = f"~{repeticao}"
+        nome = base[:LIMITE_NOME_ABA - len(sufixo)] + sufixo
+        repeticao += 1
+    usados.add(nome.lower())
+    return nome
+
+
+def gravar_pasta_consolidada(caminho, abas, indice):
+    """
+    Grava várias tabelas em um único xlsx: a aba Indice primeiro e depois uma aba
+    por tabela, em modo write-only
+    Args:
+        caminho (str): Arquivo .xlsx de destino
+        abas (list): Pares (nome da aba, DataFrame)
+        indice (DataFrame): Uma linha por aba, com a coluna 'Aba' e a identificação da turma
+    """
+    livro = Workbook(write_only=True)
+    _gravar_aba(livro, indice, ABA_INDICE)
+    for nome, df in abas:
+        _gravar_aba(livro, df, nome)
+    livro.save(caminho)
+
+
+class PastaConsolidada:
+    """
+    Leitura sob demanda de uma pasta consolidada: o arquivo é aberto uma vez
+    (read-only) e cada aba só é convertida quando pedida. Se o arquivo for
+    salvo de novo, ele é reaberto na próxima leitura. Pode ser compartilhada
+    entre threads
+    """
+
+    def __init__(self, caminho):
+        """
+        Args:
+            caminho (str): Arquivo .xlsx com a aba Indice
+        """
+        self.caminho = caminho
+        self._livro = None
+        self._assinatura = None
+        self._trava = threading.Lock()
+
+    def _abrir(self):
+        assinatura = _assinatura(self.caminho)
+        if self._livro is None or assinatura != self._assinatura:
+            if self._livro is not None:
+                self._livro.close()
+            self._livro = load_workbook(self.caminho, read_only=True, data_only=True)
+            self._assinatura = assinatura
+        return self._livro
+
+    def abas(self):
+        """Nomes das abas de dados (sem a Indice)"""
+        with self._trava:
+            return [nome for nome in self._abrir().sheetnames if nome != ABA_INDICE]
+
+    def indice(self):
+        """
+        Returns:
+            DataFrame: Aba Indice com os títulos nas colunas (vazio se não existir)
+        """
+        with self._trava:
+            livro = self._abrir()
+            if ABA_INDICE not in livro.sheetnames:
+                return pd.DataFrame()
+            return _ler_aba_xlsx(livro[ABA_INDICE], cabecalho=True)
+
+    def ler_aba(self, nome, cabecalho=False):
+        """
+        Lê uma aba (mesmo formato de ler_planilha)
+        Args:
+            nome (str): Nome da aba
+            cabecalho (bool): True = primeira linha vira títulos das colunas
+        Returns:
+            DataFrame: Dados da aba
+        """
+        with self._trava:
+            livro = self._abrir()
+            if nome not in livro.sheetnames:
+                raise KeyError(f"aba '{nome}' não encontrada em {self.caminho}")
+            return _ler_aba_xlsx(livro[nome], cabecalho)
+
+    def fechar(self):
+        """Fecha o arquivo"""
+        with self._trava:
+            if self._livro is not None:
+                self._livro.close()
+                self._livro = None
+
+
+def _assinatura(caminho):
+    """(data de modificação em ns, tamanho) do arquivo, ou None se não existir"""
+    try:
+        estado = os.stat(caminho)
+    except OSError:
+        return None
+    return estado.st_mtime_ns, estado.st_size
+
+
+def planilha_em_edicao(caminho):
+    """
+    Indica se a planilha ainda está aberta em um editor: arquivo de trava do
+    Excel (~$nome) ou do LibreOffice (.~lock.nome#), ou arquivo bloqueado para
+    escrita (Windows)
+    Args:
+        caminho (str): Caminho da planilha
+    Returns:
+        bool: True se a planilha parece aberta
+    """
+    pasta, nome = os.path.split(os.path.abspath(caminho))
+    travas = {"~$" + nome, "~$" + nome[1:], "~$" + nome[2:], f".~lock.{nome}#"}
+    if any(os.path.exists(os.path.join(pasta, trava)) for trava in travas):
+        return True
+    try:
+        with open(caminho, "r+b"):
+            pass
+    except OSError:
+        return True
+    return False
+
+
+def aguardar_planilha_salva(caminho, referencia=None, intervalo=0.5, estabilidade=1.5,
+                            timeout=None, exigir_fechada=True, formato=None):
+    """
+    Aguarda um salvamento completo da planilha: data de modificação ou tamanho
+    diferentes da referência, estáveis por 'estabilidade' segundos (debounce),
+    arquivo sem trava de edição (se exigir_fechada) e leitura sem erro
+    Args:
+        caminho (str): Planilha observada
+        referencia (tuple): Assinatura (mtime_ns, tamanho) já conhecida (padrão: a atual)
+        intervalo (float): Intervalo entre verificações, em segundos
+        estabilidade (float): Tempo sem novas alterações antes de aceitar o salvamento
+        timeout (float): Limite de espera em segundos (None = sem limite)
+        exigir_fechada (bool): Só aceita o salvamento depois que o editor fechar o arquivo
+        formato (str): Formato usado na verificação de leitura (padrão: pela extensão)
+    Returns:
+        tuple: Assinatura do salvamento aceito, ou None se o tempo esgotar
+    """
+    referencia = _assinatura(caminho) if referencia is None else referencia
+    limite = time.monotonic() + timeout if timeout else None
+    candidata, desde = None, None
+
+    while limite is None or time.monotonic() < limite:
+        assinatura = _assinatura(caminho)
+        if assinatura is not None and assinatura != referencia:
+            if assinatura != candidata:
+                candidata, desde = assinatura, time.monotonic()
+            elif (time.monotonic() - desde >= estabilidade
+                  and not (exigir_fechada and planilha_em_edicao(caminho))):
+                try:
+                    ler_planilha(caminho, formato)
+                    return assinatura
+                except Exception as e:
+                    # Arquivo salvo mas ilegível: espera o próximo salvamento
+                    print(f"[AVISO] A planilha salva não pôde ser lida ({e}); aguardando novo salvamento...")
+                    referencia, candidata = assinatura, None
+        time.sleep(intervalo)
+
+    return None
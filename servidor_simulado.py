@@ -0,0 +1,439 @@
+"""
+Servidor Simulado - Galileu EC2 e Q-Acadêmico
+=============================================
+
+Servidor HTTP local que imita as telas usadas pela automação, para medir e testar
+sem acessar ec2galileu.com.br nem academico.ifes.edu.br:
+
+- Galileu: login em /professor (campos identity/credential e botão Entrar),
+  /professor/registro-nota com id_curso, id_turma e nr_periodo carregados por
+  AJAX, tabela gridAlunos com inputs de nota e checkboxes chk-nc-*, modal de
+  loading (.dialog-loading), função ativaNC e botão btnSalvar
+- Q-Acadêmico: /qacademico/index.asp com a tabela conteudoTexto de lançamento
+
+As rotas AJAX são as mesmas de galileu_http.ClienteGalileuHTTP. O atraso das
+respostas AJAX, o tamanho das turmas e as colunas bloqueadas são configuráveis.
+
+Uso:
+    python servidor_simulado.py --porta 8765 --alunos 40 --atraso 0.3
+    GALILEU_URL=http://127.0.0.1:8765 python automatizacao_notas.py
+"""
+
+import argparse
+import html
+import json
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+COLUNAS_NOTAS = [
+    "VERIFICACAO PARCIAL", "VERIFICACAO GLOBAL",
+    "ATIVIDADE 1", "ATIVIDADE 2", "ATIVIDADE 3", "ATIVIDADE 4",
+    "PONTO OLIMPIADA",
+]
+
+CURSOS = {
+    "3533": ("ENSINO FUNDAMENTAL II", [
+        ("30054424", "2025 / 6º ANO A-6º ANO-03/02/2025 a 19/12/2025"),
+        ("30054425", "2025 / 6º ANO B-6º ANO-03/02/2025 a 19/12/2025"),
+        ("30054426", "2025 / 7º ANO A-7º ANO-03/02/2025 a 19/12/2025"),
+        ("30054427", "2025 / 7º ANO B-7º ANO-03/02/2025 a 19/12/2025"),
+    ]),
+    "3532": ("ENSINO MÉDIO", [
+        ("30054434", "2025 / 2ª SERIE A -2ª SÉRIE-03/02/2025 a 19/12/2025"),
+        ("30054435", "2025 / 3ª SERIE -3ª SÉRIE-03/02/2025 a 19/12/2025"),
+        ("30054436", "2025 / 2ª SERIE B-2ª SÉRIE-03/02/2025 a 19/12/2025"),
+    ]),
+}
+
+NOMES = ["ANA", "BRUNO", "CARLA", "DANIEL", "EDUARDA", "FELIPE", "GABRIELA", "HEITOR",
+         "ISABELA", "JOAO", "LARISSA", "MATEUS", "NATALIA", "OTAVIO", "PAULA", "RAFAEL"]
+SOBRENOMES = ["ALMEIDA", "BARBOSA", "CARVALHO", "DIAS", "FERREIRA", "GOMES", "LIMA",
+              "MARTINS", "OLIVEIRA", "PEREIRA", "RIBEIRO", "SANTOS", "SILVA", "SOUZA"]
+
+
+class EstadoSimulado:
+    """
+    Dados mantidos pelo servidor: configuração, sessões e notas gravadas
+    """
+
+    def __init__(self, alunos=40, atraso=0.3, usuario="professor", senha="senha",
+                 colunas_bloqueadas=(), colunas_sem_nc=()):
+        """
+        Args:
+            alunos (int): Alunos por turma
+            atraso (float): Atraso em segundos das respostas AJAX
+            usuario (str): Usuário aceito no login
+            senha (str): Senha aceita no login
+            colunas_bloqueadas (iterable): Colunas com input desabilitado
+            colunas_sem_nc (iterable): Colunas sem checkbox chk-nc-*
+        """
+        self.alunos = alunos
+        self.atraso = atraso
+        self.usuario = usuario
+        self.senha = senha
+        self.colunas_bloqueadas = set(colunas_bloqueadas)
+        self.colunas_sem_nc = set(colunas_sem_nc)
+        self.sessoes = set()
+        self.notas = {}         # (turma, periodo) -> {id_campo: valor}
+        self.nc = {}            # (turma, periodo) -> {id_campo}
+        self.notas_qacademico = {}
+        self.salvamentos = 0
+        self.trava = threading.Lock()
+
+    def nome_aluno(self, indice):
+        return f"{NOMES[indice % len(NOMES)]} {SOBRENOMES[(indice * 7) % len(SOBRENOMES)]} {indice + 1:03d}"
+
+    def id_campo(self, turma, periodo, indice, coluna):
+        return f"nota-{turma}-{periodo}-{indice + 1:04d}-{coluna + 1}"
+
+
+def _opcoes(opcoes, selecionado=None):
+    return "".join(
+        f'<option value="{html.escape(valor)}"{" selected" if valor == selecionado else ""}>{html.escape(rotulo)}</option>'
+        for valor, rotulo in opcoes
+    )
+
+
+PAGINA_BASE = """<!DOCTYPE html>
+<html lang="pt-br"><head><meta charset="utf-8"><title>{titulo}</title>
+<style>
+  .modal {{ display: none; position: fixed; inset: 0; background: rgba(0,0,0,.3); }}
+  .modal.show {{ display: block; }}
+  .alert-success {{ color: #155724; }} .alert-danger {{ color: #721c24; }}
+</style></head>
+<body>{corpo}</body></html>"""
+
+PAGINA_LOGIN = """
+<h1>Galileu EC2 - Professor</h1>
+{erro}
+<form method="post" action="/professor">
+  <input type="hidden" name="csrf" value="{csrf}">
+  <input type="text" id="identity" name="identity">
+  <input type="password" id="credential" name="credential">
+  <button type="submit" class="btn btn-primary"><i></i> Entrar</button>
+</form>
+"""
+
+PAGINA_REGISTRO = """
+<h1>Registro de Nota</h1>
+<div id="loading" class="modal dialog-loading"><div class="modal-body">Carregando...</div></div>
+<div id="mensagens"></div>
+<select id="id_curso" name="id_curso"><option value="">Selecione</option>{cursos}</select>
+<select id="id_turma" name="id_turma"><option value="">Selecione</option></select>
+<select id="id_disciplina" name="id_disciplina"><option value="14926">MATEMÁTICA</option></select>
+<select id="nr_periodo" name="nr_periodo">
+  <option value="">Selecione</option><option value="1">1º Trimestre</option>
+  <option value="2">2º Trimestre</option><option value="3">3º Trimestre</option>
+</select>
+<div id="grid-container"></div>
+<button id="btnSalvar" type="button" onclick="salvarNotas()">Salvar</button>
+<script>
+  var carregando = 0;
+  function loading(ativo) {
+    carregando += ativo ? 1 : -1;
+    document.getElementById('loading').classList.toggle('show', carregando > 0);
+  }
+  function requisitar(metodo, url, corpo, pronto) {
+    loading(true);
+    var xhr = new XMLHttpRequest();
+    xhr.open(metodo, url);
+    xhr.onloadend = function() { loading(false); pronto(xhr); };
+    xhr.send(corpo);
+  }
+  function valor(id) { return document.getElementById(id).value; }
+  function carregarGrid() {
+    var container = document.getElementById('grid-container');
+    container.innerHTML = '';
+    if (!valor('id_turma') || !valor('nr_periodo')) { return; }
+    var params = 'id_curso=' + valor('id_curso') + '&id_turma=' + valor('id_turma') + '&nr_periodo=' + valor('nr_periodo');
+    requisitar('GET', '/professor/registro-nota/grid?' + params, null, function(xhr) {
+      container.innerHTML = xhr.responseText;
+    });
+  }
+  document.getElementById('id_curso').addEventListener('change', function() {
+    var turma = document.getElementById('id_turma');
+    turma.innerHTML = '<option value="">Selecione</option>';
+    requisitar('GET', '/professor/registro-nota/turmas?id_curso=' + this.value, null, function(xhr) {
+      var doc = new DOMParser().parseFromString(xhr.responseText, 'text/html');
+      turma.innerHTML = doc.getElementById('id_turma').innerHTML;
+    });
+  });
+  document.getElementById('id_turma').addEventListener('change', carregarGrid);
+  document.getElementById('nr_periodo').addEventListener('change', carregarGrid);
+  function ativaNC(checkbox, idCampo) {
+    var campo = document.getElementById(idCampo) ||
+                document.querySelector('[id="' + checkbox.id.replace('chk-nc-', '') + '" i]');
+    if (campo) {
+      if (checkbox.checked) { campo.value = ''; }
+      campo.readOnly = checkbox.checked;
+    }
+    loading(true);
+    setTimeout(function() { loading(false); }, 30);
+  }
+  function salvarNotas() {
+    var formulario = document.getElementById('formNotas');
+    var mensagens = document.getElementById('mensagens');
+    mensagens.innerHTML = '';
+    if (!formulario) { return; }
+    requisitar('POST', formulario.action, new FormData(formulario), function(xhr) {
+      var resposta = {};
+      try { resposta = JSON.parse(xhr.responseText); } catch (e) {}
+      var classe = resposta.sucesso ? 'alert alert-success' : 'alert alert-danger';
+      mensagens.innerHTML = '<div class="' + classe + '">' + (resposta.mensagem || 'Erro ao salvar') + '</div>';
+    });
+  }
+</script>
+"""
+
+PAGINA_QACADEMICO = """
+<h1>Q-Acadêmico - Lançamento de Notas</h1>
+{mensagem}
+<table><tr><td>Avaliação:</td><td>{avaliacao}</td></tr></table>
+<form method="post" action="/qacademico/salvar">
+<table class="conteudoTexto">
+  <tr><td>#</td><td>Matrícula</td><td>Aluno</td><td>Situação</td><td>Faltas</td><td>Nota</td><td>Observação</td></tr>
+  {linhas}
+</table>
+<input type="submit" name="salvar" value="Salvar">
+</form>
+"""
+
+
+def criar_manipulador(estado):
+    """
+    Cria a classe de tratamento de requisições ligada a um EstadoSimulado
+    Args:
+        estado (EstadoSimulado): Estado compartilhado pelo servidor
+    Returns:
+        type: Subclasse de BaseHTTPRequestHandler
+    """
+
+    class ManipuladorSimulado(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Mantém conexões abertas (keep-alive)
+
+        def log_message(self, formato, *args):
+            pass  # Silencioso: o benchmark mede o tempo, não o log
+
+        # --------------------------------------------------------- utilitários
+        def _responder(self, corpo, status=200, tipo="text/html; charset=utf-8", cabecalhos=None):
+            dados = corpo.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(dados)))
+            for chave, valor in (cabecalhos or {}).items():
+                self.send_header(chave, valor)
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def _pagina(self, titulo, corpo, status=200, cabecalhos=None):
+            self._responder(PAGINA_BASE.format(titulo=titulo, corpo=corpo), status, cabecalhos=cabecalhos)
+
+        def _redirecionar(self, destino, cabecalhos=None):
+            self._responder("", 302, cabecalhos=dict(cabecalhos or {}, Location=destino))
+
+        def _autenticado(self):
+            for parte in self.headers.get("Cookie", "").split(";"):
+                nome, _, valor = parte.strip().partition("=")
+                if nome == "GALILEUSESSID" and valor in estado.sessoes:
+                    return True
+            return False
+
+        def _corpo_formulario(self):
+            tamanho = int(self.headers.get("Content-Length") or 0)
+            bruto = self.rfile.read(tamanho).decode("utf-8")
+            tipo = self.headers.get("Content-Type", "")
+            if tipo.startswith("multipart/form-data"):
+                return _ler_multipart(bruto, tipo)
+            return {chave: valores[-1] for chave, valores in parse_qs(bruto, keep_blank_values=True).items()}
+
+        def _ajax(self):
+            if estado.atraso:
+                time.sleep(estado.atraso)
+
+        # ------------------------------------------------------------- rotas
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+            rota = url.path.rstrip("/") or "/"
+
+            if rota.startswith("/qacademico"):
+                return self._qacademico()
+            if rota in ("/professor", "/professor/login"):
+                if self._autenticado() and rota == "/professor":
+                    return self._pagina("Painel", "<h1>Painel do Professor</h1>")
+                return self._pagina("Login", PAGINA_LOGIN.format(erro="", csrf=secrets.token_hex(8)))
+            if not self._autenticado():
+                return self._redirecionar("/professor/login")
+            if rota == "/professor/painel":
+                return self._pagina("Painel", "<h1>Painel do Professor</h1>")
+            if rota == "/professor/registro-nota":
+                cursos = _opcoes((valor, nome) for valor, (nome, _) in CURSOS.items())
+                return self._pagina("Registro de Nota", PAGINA_REGISTRO.replace("{cursos}", cursos))
+            if rota == "/professor/registro-nota/turmas":
+                self._ajax()
+                turmas = CURSOS.get(params.get("id_curso", ""), ("", []))[1]
+                return self._responder(
+                    f'<select id="id_turma" name="id_turma"><option value="">Selecione</option>{_opcoes(turmas)}</select>'
+                )
+            if rota == "/professor/registro-nota/grid":
+                self._ajax()
+                return self._responder(self._grid(params))
+            self._responder("Não encontrado", 404)
+
+        def do_POST(self):
+            rota = urlparse(self.path).path.rstrip("/")
+            dados = self._corpo_formulario()
+
+            if rota == "/professor":
+                if dados.get("identity") == estado.usuario and dados.get("credential") == estado.senha:
+                    sessao = secrets.token_hex(16)
+                    estado.sessoes.add(sessao)
+                    return self._redirecionar("/professor/painel", {
+                        "Set-Cookie": f"GALILEUSESSID={sessao}; Path=/; HttpOnly"
+                    })
+                erro = '<div class="alert alert-danger">Usuário ou senha inválidos</div>'
+                return self._pagina("Login", PAGINA_LOGIN.format(erro=erro, csrf=secrets.token_hex(8)))
+            if rota == "/qacademico/salvar":
+                with estado.trava:
+                    estado.notas_qacademico.update(dados)
+                    estado.salvamentos += 1
+                return self._qacademico('<div class="alert-success">Dados gravados com sucesso</div>')
+            if not self._autenticado():
+                return self._responder(json.dumps({"sucesso": False, "mensagem": "Sessão expirada"}),
+                                       401, "application/json")
+            if rota == "/professor/registro-nota/salvar":
+                self._ajax()
+                return self._salvar(dados)
+            self._responder("Não encontrado", 404)
+
+        # ----------------------------------------------------------- galileu
+        def _grid(self, params):
+            turma, periodo = params.get("id_turma", ""), params.get("nr_periodo", "")
+            chave = (turma, periodo)
+            notas = estado.notas.get(chave, {})
+            marcados = estado.nc.get(chave, set())
+
+            cabecalho = "".join(f"<th>{coluna}</th>" for coluna in COLUNAS_NOTAS + ["MÉDIA MANUAL"])
+            linhas = [f"<tr><th>Aluno</th>{cabecalho}</tr>"]
+            for indice in range(estado.alunos):
+                celulas = [f"<td>{estado.nome_aluno(indice)}<br><small>Matrícula {20250000 + indice}</small></td>"]
+                for coluna, nome_coluna in enumerate(COLUNAS_NOTAS):
+                    id_campo = estado.id_campo(turma, periodo, indice, coluna)
+                    bloqueado = " disabled" if nome_coluna in estado.colunas_bloqueadas else ""
+                    celula = (f'<input type="text" id="{id_campo}" name="{id_campo}" size="4" '
+                              f'value="{html.escape(notas.get(id_campo, ""))}"{bloqueado}>')
+                    if nome_coluna not in estado.colunas_sem_nc:
+                        marcado = " checked" if id_campo in marcados else ""
+                        celula += (f'<input type="checkbox" id="chk-nc-{id_campo.lower()}" name="nc[{id_campo}]" '
+                                   f'value="1" onclick="ativaNC(this, \'{id_campo}\')"{marcado}{bloqueado}>')
+                    celulas.append(f"<td>{celula}</td>")
+                id_media = f"media-manual-{turma}-{periodo}-{indice + 1:04d}"
+                celulas.append(f'<td><input type="text" id="{id_media}" name="{id_media}" size="4" value=""></td>')
+                linhas.append(f"<tr>{''.join(celulas)}</tr>")
+
+            return (
+                '<form id="formNotas" method="post" action="/professor/registro-nota/salvar">'
+                f'<input type="hidden" name="id_curso" value="{html.escape(params.get("id_curso", ""))}">'
+                f'<input type="hidden" name="id_turma" value="{html.escape(turma)}">'
+                f'<input type="hidden" name="nr_periodo" value="{html.escape(periodo)}">'
+                f'<table id="gridAlunos">{"".join(linhas)}</table></form>'
+            )
+
+        def _salvar(self, dados):
+            chave = (dados.get("id_turma", ""), dados.get("nr_periodo", ""))
+            if not all(chave):
+                return self._responder(json.dumps({"sucesso": False, "mensagem": "Filtros não informados"}),
+                                       400, "application/json")
+            notas = {nome: valor for nome, valor in dados.items() if nome.startswith("nota-")}
+            nc = {nome[3:-1] for nome in dados if nome.startswith("nc[")}
+            with estado.trava:
+                estado.notas[chave] = notas
+                estado.nc[chave] = nc
+                estado.salvamentos += 1
+            corpo = {"sucesso": True, "mensagem": "Notas salvas com sucesso", "campos": len(notas), "nc": len(nc)}
+            self._responder(json.dumps(corpo), tipo="application/json")
+
+        # ------------------------------------------------------- q-acadêmico
+        def _qacademico(self, mensagem=""):
+            linhas = []
+            for indice in range(estado.alunos):
+                matricula = str(20250000 + indice)
+                nota = estado.notas_qacademico.get(f"N_{matricula}", "")
+                obs = estado.notas_qacademico.get(f"OBS_{matricula}", "")
+                linhas.append(
+                    f"<tr><td>{indice + 1}</td><td>{matricula}</td><td>{estado.nome_aluno(indice)}</td>"
+                    f"<td>Matriculado</td><td>0</td>"
+                    f'<td><input type="text" name="N_{matricula}" value="{html.escape(nota)}" size="4"></td>'
+                    f'<td><input type="text" name="OBS_{matricula}" value="{html.escape(obs)}" size="30"></td></tr>'
+                )
+            corpo = PAGINA_QACADEMICO.format(mensagem=mensagem, avaliacao="Prova 1 - 1ª Etapa",
+                                             linhas="".join(linhas))
+            self._pagina("Q-Acadêmico", corpo)
+
+    return ManipuladorSimulado
+
+
+def _ler_multipart(bruto, tipo):
+    """Lê um corpo multipart/form-data simples (apenas campos de texto)"""
+    fronteira = "--" + tipo.split("boundary=", 1)[1].strip().strip('"')
+    dados = {}
+    for parte in bruto.split(fronteira):
+        cabecalho, _, valor = parte.partition("\r\n\r\n")
+        if 'name="' not in cabecalho:
+            continue
+        nome = cabecalho.split('name="', 1)[1].split('"', 1)[0]
+        dados[nome] = valor[:-2] if valor.endswith("\r\n") else valor
+    return dados
+
+
+def iniciar_servidor(porta=0, estado=None, host="127.0.0.1"):
+    """
+    Inicia o servidor simulado em uma thread em segundo plano
+    Args:
+        porta (int): Porta TCP (0 escolhe uma porta livre)
+        estado (EstadoSimulado): Configuração e dados (padrão: EstadoSimulado())
+        host (str): Endereço de escuta
+    Returns:
+        tuple: (servidor, url_base). Use servidor.shutdown() para encerrar
+    """
+    estado = estado or EstadoSimulado()
+    servidor = ThreadingHTTPServer((host, porta), criar_manipulador(estado))
+    servidor.daemon_threads = True
+    servidor.estado = estado
+    threading.Thread(target=servidor.serve_forever, daemon=True, name="servidor-simulado").start()
+    return servidor, f"http://{host}:{servidor.server_address[1]}"
+
+
+def main():
+    """Executa o servidor simulado em primeiro plano"""
+    parser = argparse.ArgumentParser(description="Servidor simulado do Galileu EC2 e do Q-Acadêmico")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--alunos", type=int, default=40, help="alunos por turma")
+    parser.add_argument("--atraso", type=float, default=0.3, help="atraso das respostas AJAX em segundos")
+    parser.add_argument("--usuario", default="professor")
+    parser.add_argument("--senha", default="senha")
+    parser.add_argument("--bloqueadas", nargs="*", default=[], metavar="COLUNA",
+                        help="colunas com inputs desabilitados, ex.: 'PONTO OLIMPIADA'")
+    parser.add_argument("--sem-nc", nargs="*", default=[], metavar="COLUNA",
+                        help="colunas sem checkbox N/C")
+    args = parser.parse_args()
+
+    estado = EstadoSimulado(args.alunos, args.atraso, args.usuario, args.senha, args.bloqueadas, args.sem_nc)
+    servidor, url = iniciar_servidor(args.porta, estado)
+    print(f"[OK] Servidor simulado em {url}")
+    print(f"[INFO] Galileu: {url}/professor (usuário '{args.usuario}', senha '{args.senha}')")
+    print(f"[INFO] Q-Acadêmico: {url}/qacademico/index.asp?t=1000")
+    print("[INFO] Ctrl+C para encerrar")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
+        print("\n[INFO] Servidor encerrado.")
+
+
+if __name__ == "__main__":
+    main()